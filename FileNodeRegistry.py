@@ -0,0 +1,309 @@
+import os
+
+import maya.cmds as cmds
+
+from .core.Profiler import PROFILER
+
+########################################################################################################################
+
+# place2dTexture shared by the file nodes created with the registry
+SHARED_PLACE_TEXTURE_NAME = "shaderMaker_place2dTexture"
+
+# Placement of a place2dTexture created
+DEFAULT_PLACEMENT = {
+    "coverage": (1.0, 1.0),
+    "translateFrame": (0.0, 0.0),
+    "rotateFrame": (0.0,),
+    "mirrorU": (0.0,),
+    "mirrorV": (0.0,),
+    "stagger": (0.0,),
+    "wrapU": (1.0,),
+    "wrapV": (1.0,),
+    "repeatUV": (1.0, 1.0),
+    "offset": (0.0, 0.0),
+    "rotateUV": (0.0,),
+    "noiseUV": (0.0, 0.0)
+}
+
+# Attributes that must be equal to merge place2dTextures
+PLACE_TEXTURE_ATTRIBUTES = list(DEFAULT_PLACEMENT.keys())
+
+# Attributes that must be equal to merge file nodes (with the texture and the placement)
+FILE_NODE_ATTRIBUTES = ["uvTilingMode", "colorSpace", "alphaIsLuminance", "filterType", "colorGain", "colorOffset",
+                        "alphaGain", "alphaOffset", "invert"]
+
+
+########################################################################################################################
+
+
+class FileNodeRegistry:
+    """
+    File nodes of the scene by texture path so the creation of shaders reuses the file nodes of a texture instead of
+    creating new ones. A file node of the scene is reused only if it has the settings of a file node created (the
+    settings of the builder, the color space of the file rules and the default placement). The file nodes created
+    share one place2dTexture
+    """
+    def __init__(self, excluded_nodes=None):
+        """
+        Constructor
+        :param excluded_nodes: nodes of the scene that are not reused (deleted once the shaders are created)
+        """
+        self.__excluded_nodes = set(excluded_nodes) if excluded_nodes is not None else set()
+        # Texture path to the file nodes of the scene
+        self.__scene_file_nodes = None
+        # Texture path and settings to the name of a file node of the scene or the handle of a file node to create
+        # (None if no file node of the scene can be reused)
+        self.__file_nodes = {}
+        self.__place_texture = None
+
+    @staticmethod
+    def get_key(file_name):
+        """
+        Get the key of a texture path
+        :param file_name
+        :return: key
+        """
+        return os.path.normcase(os.path.normpath(file_name)).replace("\\", "/")
+
+    @staticmethod
+    def __get_settings_key(file_name, settings):
+        """
+        Get the key of a texture path and settings
+        :param file_name
+        :param settings: dict of attribute to value
+        :return: key
+        """
+        return FileNodeRegistry.get_key(file_name), tuple(sorted(settings.items()))
+
+    def __build(self):
+        """
+        Index the file nodes of the scene by texture path
+        :return:
+        """
+        self.__scene_file_nodes = {}
+        for file_node in sorted(cmds.ls(type="file") or []):
+            if file_node in self.__excluded_nodes:
+                continue
+            file_name = cmds.getAttr(file_node + ".fileTextureName")
+            if file_name:
+                self.__scene_file_nodes.setdefault(FileNodeRegistry.get_key(file_name), []).append(file_node)
+
+    @staticmethod
+    def __flatten(value):
+        """
+        Flatten the value of an attribute (compound values are lists of tuples) into floats
+        :param value
+        :return: tuple of floats
+        """
+        if isinstance(value, (list, tuple)):
+            return tuple(number for item in value for number in FileNodeRegistry.__flatten(item))
+        return float(value),
+
+    @staticmethod
+    def __has_default_placement(file_node):
+        """
+        Whether the placement of a file node is the one of a file node created : no place2dTexture or an undriven
+        place2dTexture with the default values
+        :param file_node
+        :return: boolean
+        """
+        place_textures = cmds.listConnections(file_node + ".uvCoord", source=True, destination=False) or []
+        if len(place_textures) == 0:
+            return True
+        place_texture = place_textures[0]
+        if cmds.nodeType(place_texture) != "place2dTexture" or \
+                len(cmds.listConnections(place_texture, source=True, destination=False) or []) > 0:
+            return False
+        return all(FileNodeRegistry.__flatten(cmds.getAttr(place_texture + "." + attribute)) == default
+                   for attribute, default in DEFAULT_PLACEMENT.items())
+
+    def __find_scene_file_node(self, file_name, settings):
+        """
+        Find a file node of the scene loading a texture with the settings of a file node created
+        :param file_name
+        :param settings: dict of attribute to value set on the file nodes created
+        :return: name of the file node or None
+        """
+        if self.__scene_file_nodes is None:
+            self.__build()
+        file_nodes = self.__scene_file_nodes.get(FileNodeRegistry.get_key(file_name), [])
+        if len(file_nodes) == 0:
+            return None
+        # Color space given to the file nodes created
+        color_space = cmds.colorManagementFileRules(evaluate=file_name)
+        for file_node in file_nodes:
+            if all(cmds.getAttr(file_node + "." + attribute) == value for attribute, value in settings.items()) and \
+                    cmds.getAttr(file_node + ".colorSpace") == color_space and \
+                    FileNodeRegistry.__has_default_placement(file_node):
+                return file_node
+        return None
+
+    def get_file_node(self, file_name, settings):
+        """
+        Get the file node of a texture with settings
+        :param file_name
+        :param settings: dict of attribute to value set on the file nodes created
+        :return: name or handle of the file node or None
+        """
+        key = FileNodeRegistry.__get_settings_key(file_name, settings)
+        if key not in self.__file_nodes:
+            self.__file_nodes[key] = self.__find_scene_file_node(file_name, settings)
+        return self.__file_nodes[key]
+
+    def add_file_node(self, file_name, settings, file_node):
+        """
+        Register a file node to create
+        :param file_name
+        :param settings: dict of attribute to value set on the file node
+        :param file_node: handle of the file node
+        :return:
+        """
+        self.__file_nodes[FileNodeRegistry.__get_settings_key(file_name, settings)] = file_node
+
+    def get_place_texture(self, builder):
+        """
+        Get the place2dTexture shared by the file nodes created, it is created once
+        :param builder: ShadingNetworkBuilder
+        :return: name or handle of the place2dTexture
+        """
+        if self.__place_texture is None:
+            if cmds.objExists(SHARED_PLACE_TEXTURE_NAME) and SHARED_PLACE_TEXTURE_NAME not in self.__excluded_nodes:
+                self.__place_texture = SHARED_PLACE_TEXTURE_NAME
+            else:
+                self.__place_texture = builder.create_node("place2dTexture", SHARED_PLACE_TEXTURE_NAME, "asUtility")
+        return self.__place_texture
+
+    @staticmethod
+    def __get_attribute_values(nodes, attributes):
+        """
+        Get the values of attributes of nodes
+        :param nodes
+        :param attributes
+        :return: dict of node to tuple of values
+        """
+        values = {}
+        for node in nodes:
+            node_values = []
+            for attribute in attributes:
+                plug = node + "." + attribute
+                node_values.append(repr(cmds.getAttr(plug)) if cmds.objExists(plug) else None)
+            values[node] = tuple(node_values)
+        return values
+
+    @staticmethod
+    def __get_incoming_connections(nodes):
+        """
+        Get the incoming connections of nodes in a single query
+        :param nodes
+        :return: dict of node to sorted list of attribute and source plug
+        """
+        incoming = {node: [] for node in nodes}
+        if len(nodes) == 0:
+            return incoming
+        connections = cmds.listConnections(nodes, source=True, destination=False, connections=True,
+                                           plugs=True) or []
+        # Connections are pairs of plug of the node and source plug
+        for i in range(0, len(connections) - 1, 2):
+            node, attribute = connections[i].split(".", 1)
+            if node in incoming:
+                incoming[node].append((attribute, connections[i + 1]))
+        for node_connections in incoming.values():
+            node_connections.sort()
+        return incoming
+
+    @staticmethod
+    def __merge(duplicates):
+        """
+        Move the outgoing connections of duplicate nodes to the node kept and delete them
+        :param duplicates: dict of duplicate node to node kept
+        :return:
+        """
+        if len(duplicates) == 0:
+            return
+        default_nodes = set(cmds.ls(defaultNodes=True) or [])
+        connections = cmds.listConnections(list(duplicates.keys()), source=False, destination=True,
+                                           connections=True, plugs=True) or []
+        # Connections are pairs of plug of the duplicate and destination plug
+        for i in range(0, len(connections) - 1, 2):
+            node, attribute = connections[i].split(".", 1)
+            destination = connections[i + 1]
+            destination_node = destination.split(".", 1)[0]
+            # The node kept is already in the lists of the default nodes
+            if node not in duplicates or destination_node in duplicates or \
+                    (attribute == "message" and destination_node in default_nodes):
+                continue
+            cmds.connectAttr(duplicates[node] + "." + attribute, destination, force=True)
+        cmds.delete(list(duplicates.keys()))
+
+    @staticmethod
+    def __find_duplicates(nodes, signatures):
+        """
+        Group nodes of the same signature, the first node of each group in alphabetical order is kept
+        :param nodes
+        :param signatures: dict of node to signature (None to keep the node)
+        :return: dict of duplicate node to node kept
+        """
+        kept = {}
+        duplicates = {}
+        for node in sorted(nodes):
+            signature = signatures[node]
+            if signature is None:
+                continue
+            if signature in kept:
+                duplicates[node] = kept[signature]
+            else:
+                kept[signature] = node
+        return duplicates
+
+    @staticmethod
+    def __get_editable_nodes(node_type):
+        """
+        Get the nodes of a type that can be deleted (not referenced, not locked)
+        :param node_type
+        :return: node names
+        """
+        nodes = sorted(set(cmds.ls(type=node_type) or []) -
+                       set(cmds.ls(type=node_type, referencedNodes=True) or []))
+        if len(nodes) == 0:
+            return []
+        locked = cmds.lockNode(nodes, query=True, lock=True) or []
+        return [node for node, is_locked in zip(nodes, locked) if not is_locked]
+
+    @staticmethod
+    def merge_duplicates():
+        """
+        Merge the place2dTextures with the same placement and then the file nodes with the same texture, settings and
+        placement in a single undo chunk. The consumers of the duplicates are connected to the node kept
+        :return: number of place2dTextures and of file nodes deleted
+        """
+        cmds.undoInfo(openChunk=True)
+        try:
+            with PROFILER.phase("merge_duplicates"):
+                # Driven placements are kept
+                place_textures = FileNodeRegistry.__get_editable_nodes("place2dTexture")
+                incoming = FileNodeRegistry.__get_incoming_connections(place_textures)
+                values = FileNodeRegistry.__get_attribute_values(place_textures, PLACE_TEXTURE_ATTRIBUTES)
+                place_duplicates = FileNodeRegistry.__find_duplicates(place_textures, {
+                    place_texture: None if len(incoming[place_texture]) > 0 else values[place_texture]
+                    for place_texture in place_textures})
+                FileNodeRegistry.__merge(place_duplicates)
+
+                # The placement of the file nodes is compared with the place2dTextures merged
+                file_nodes = FileNodeRegistry.__get_editable_nodes("file")
+                incoming = FileNodeRegistry.__get_incoming_connections(file_nodes)
+                values = FileNodeRegistry.__get_attribute_values(file_nodes, FILE_NODE_ATTRIBUTES)
+                signatures = {}
+                for file_node in file_nodes:
+                    file_name = cmds.getAttr(file_node + ".fileTextureName")
+                    # File nodes with a driven texture are kept
+                    if not file_name or any(attribute == "fileTextureName" for attribute, _ in incoming[file_node]):
+                        signatures[file_node] = None
+                    else:
+                        signatures[file_node] = (FileNodeRegistry.get_key(file_name), values[file_node],
+                                                 tuple(incoming[file_node]))
+                file_duplicates = FileNodeRegistry.__find_duplicates(file_nodes, signatures)
+                FileNodeRegistry.__merge(file_duplicates)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        PROFILER.count("nodes_merged", len(place_duplicates) + len(file_duplicates))
+        return len(place_duplicates), len(file_duplicates)
@@ -0,0 +1,187 @@
+import os
+from functools import partial
+
+from PySide2.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from .core.DirectoryPoller import DirectoryPoller
+from .ScanWorker import ScanWorker
+
+########################################################################################################################
+
+# Environment variable forcing the polling (for the file servers that don't notify the changes)
+WATCH_POLLING_ENV_VAR = "SHADER_MAKER_WATCH_POLLING"
+
+# Delay to gather the changes of a delivery copying many files
+WATCH_DEBOUNCE_MS = 1000
+
+POLL_INTERVAL_MS = 5000
+
+
+########################################################################################################################
+
+
+class LibraryWatcher(QObject):
+    """
+    Watch the directories of a tree with QFileSystemWatcher or by polling their modification times when the file
+    system doesn't notify them. The directories are listed and polled in background
+    """
+    directories_changed = Signal(list)
+
+    def __init__(self, parent=None, polling=None):
+        """
+        Constructor
+        :param parent
+        :param polling: whether the directories are polled (environment variable if None)
+        """
+        super(LibraryWatcher, self).__init__(parent)
+        self.__polling = polling if polling is not None else len(os.environ.get(WATCH_POLLING_ENV_VAR, "")) > 0
+        self.__use_polling = self.__polling
+        self.__poller = None
+        self.__worker = None
+        self.__pending = set()
+        self.__fs_watcher = QFileSystemWatcher(self)
+        self.__fs_watcher.directoryChanged.connect(self.__on_directory_changed)
+        self.__debounce_timer = QTimer(self)
+        self.__debounce_timer.setSingleShot(True)
+        self.__debounce_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self.__debounce_timer.timeout.connect(self.__refresh)
+        self.__poll_timer = QTimer(self)
+        self.__poll_timer.setInterval(POLL_INTERVAL_MS)
+        self.__poll_timer.timeout.connect(self.__poll)
+
+    def is_watching(self):
+        """
+        Whether a tree is watched
+        :return: boolean
+        """
+        return self.__poller is not None
+
+    def watch(self, root, max_depth):
+        """
+        Watch the directories of a tree
+        :param root: base directory
+        :param max_depth: depth of the deepest directories watched
+        :return:
+        """
+        self.stop()
+        if not os.path.isdir(root):
+            return
+        self.__use_polling = self.__polling
+        self.__poller = DirectoryPoller(root, max_depth)
+        self.__start_worker(self.__poller.snapshot, self.__on_snapshot)
+
+    def stop(self):
+        """
+        Stop watching
+        :return:
+        """
+        self.__debounce_timer.stop()
+        self.__poll_timer.stop()
+        if self.__worker is not None:
+            self.__worker.cancel()
+            self.__worker = None
+        watched = self.__fs_watcher.directories()
+        if len(watched) > 0:
+            self.__fs_watcher.removePaths(watched)
+        self.__pending.clear()
+        self.__poller = None
+
+    def __start_worker(self, function, callback):
+        """
+        Run a function of the poller in background
+        :param function
+        :param callback: function called with the result in the main thread
+        :return:
+        """
+        def iter_result(is_cancelled):
+            yield function()
+
+        worker = ScanWorker(iter_result)
+        worker.item_found.connect(partial(self.__on_worker_result, worker, callback))
+        self.__worker = worker
+        worker.start()
+
+    def __on_worker_result(self, worker, callback, result):
+        """
+        Handle the result of the running worker
+        :param worker
+        :param callback
+        :param result
+        :return:
+        """
+        if worker is not self.__worker:
+            return
+        self.__worker = None
+        callback(result)
+        # Changes notified while the worker was running
+        if len(self.__pending) > 0 and not self.__debounce_timer.isActive():
+            self.__debounce_timer.start()
+
+    def __add_paths(self, directories):
+        """
+        Watch directories with QFileSystemWatcher, the polling is used if one can't be watched
+        :param directories
+        :return:
+        """
+        if self.__use_polling or len(directories) == 0:
+            return
+        failed = self.__fs_watcher.addPaths(directories)
+        if len(failed) > 0:
+            self.__use_polling = True
+            self.__fs_watcher.removePaths(self.__fs_watcher.directories())
+            self.__poll_timer.start()
+
+    def __on_snapshot(self, directories):
+        """
+        Start watching the directories listed
+        :param directories
+        :return:
+        """
+        if self.__use_polling:
+            self.__poll_timer.start()
+        else:
+            self.__add_paths(directories)
+
+    def __on_directory_changed(self, directory):
+        """
+        Gather the directories notified by QFileSystemWatcher
+        :param directory
+        :return:
+        """
+        self.__pending.add(directory)
+        self.__debounce_timer.start()
+
+    def __refresh(self):
+        """
+        Check the directories notified
+        :return:
+        """
+        if self.__poller is None or self.__worker is not None:
+            return
+        directories = list(self.__pending)
+        self.__pending.clear()
+        self.__start_worker(partial(self.__poller.refresh, directories), self.__on_changes)
+
+    def __poll(self):
+        """
+        Check all the directories
+        :return:
+        """
+        if self.__poller is None or self.__worker is not None:
+            return
+        self.__start_worker(self.__poller.poll, self.__on_changes)
+
+    def __on_changes(self, changes):
+        """
+        Watch the new directories and notify the changed ones
+        :param changes: changed, added and removed directories
+        :return:
+        """
+        changed, added, removed = changes
+        if not self.__use_polling:
+            if len(removed) > 0:
+                watched = set(self.__fs_watcher.directories())
+                self.__fs_watcher.removePaths([directory for directory in removed if directory in watched])
+            self.__add_paths(added)
+        if len(changed) > 0:
+            self.directories_changed.emit(sorted(changed))
@@ -0,0 +1,161 @@
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+
+from .core.Profiler import PROFILER
+
+
+class MaterialIndex:
+    """
+    Index of the materials of the scene by name with their shading groups. It is built once and kept up to date
+    by node added, removed, renamed and connection callbacks while it is started
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        # Material name to shading group names (None when they have to be queried again)
+        self.__shading_groups = {}
+        # Node type to whether it is a material
+        self.__material_types = {}
+        self.__callbacks = []
+        self.__built = False
+
+    def is_started(self):
+        """
+        Whether the index is built and maintained by the callbacks
+        :return: boolean
+        """
+        return self.__built
+
+    def start(self):
+        """
+        Build the index and create the callbacks that maintain it
+        :return:
+        """
+        if self.__built:
+            return
+        self.__build()
+        self.__callbacks = [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self.__on_node_added, "dependNode"),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self.__on_node_removed, "dependNode"),
+            OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject(), self.__on_name_changed),
+            OpenMaya.MDGMessage.addConnectionCallback(self.__on_connection),
+        ]
+        self.__built = True
+
+    def stop(self):
+        """
+        Remove the callbacks and forget the index
+        :return:
+        """
+        for callback in self.__callbacks:
+            OpenMaya.MMessage.removeCallback(callback)
+        self.__callbacks = []
+        self.__shading_groups.clear()
+        self.__built = False
+
+    def __build(self):
+        """
+        Index all the materials of the scene with their shading groups in a single query
+        :return:
+        """
+        self.__shading_groups.clear()
+        materials = cmds.ls(materials=True) or []
+        for material in materials:
+            self.__shading_groups[material] = []
+        if len(materials) == 0:
+            return
+        connections = cmds.listConnections(materials, source=False, destination=True, type="shadingEngine",
+                                           connections=True) or []
+        # Connections are pairs of material plug and shading group
+        for i in range(0, len(connections) - 1, 2):
+            material = connections[i].split(".")[0]
+            shading_group = connections[i + 1]
+            shading_groups = self.__shading_groups.get(material)
+            if shading_groups is not None and shading_group not in shading_groups:
+                shading_groups.append(shading_group)
+
+    def has_material(self, name):
+        """
+        Whether a material has the name
+        :param name
+        :return: boolean
+        """
+        return name in self.__shading_groups
+
+    def get_shading_groups(self, name):
+        """
+        Get the shading groups of a material
+        :param name: name of the material
+        :return: shading group names
+        """
+        if name not in self.__shading_groups:
+            return []
+        if self.__shading_groups[name] is None:
+            shading_groups = []
+            for shading_group in cmds.listConnections(name, source=False, destination=True,
+                                                      type="shadingEngine") or []:
+                if shading_group not in shading_groups:
+                    shading_groups.append(shading_group)
+            self.__shading_groups[name] = shading_groups
+        return self.__shading_groups[name]
+
+    def __is_material(self, node, name):
+        """
+        Whether a node is a material, the result is kept for each node type
+        :param node: MObject
+        :param name
+        :return: boolean
+        """
+        node_type = OpenMaya.MFnDependencyNode(node).typeName()
+        if node_type not in self.__material_types:
+            self.__material_types[node_type] = len(cmds.ls(name, materials=True) or []) > 0
+        return self.__material_types[node_type]
+
+    def __on_node_added(self, node, *args):
+        """
+        Index a new material
+        :param node: MObject
+        :return:
+        """
+        PROFILER.count("material_index_callbacks")
+        name = OpenMaya.MFnDependencyNode(node).name()
+        if self.__is_material(node, name):
+            self.__shading_groups[name] = []
+
+    def __on_node_removed(self, node, *args):
+        """
+        Forget a deleted material
+        :param node: MObject
+        :return:
+        """
+        PROFILER.count("material_index_callbacks")
+        self.__shading_groups.pop(OpenMaya.MFnDependencyNode(node).name(), None)
+
+    def __on_name_changed(self, node, previous_name, *args):
+        """
+        Index a renamed material under its new name
+        :param node: MObject
+        :param previous_name
+        :return:
+        """
+        PROFILER.count("material_index_callbacks")
+        if previous_name not in self.__shading_groups:
+            return
+        name = OpenMaya.MFnDependencyNode(node).name()
+        self.__shading_groups[name] = self.__shading_groups.pop(previous_name)
+
+    def __on_connection(self, source_plug, destination_plug, made, *args):
+        """
+        Query again the shading groups of a material connected to or disconnected from a shading group
+        :param source_plug: MPlug
+        :param destination_plug: MPlug
+        :param made: whether the connection is made or broken
+        :return:
+        """
+        PROFILER.count("material_index_callbacks")
+        if not destination_plug.node().hasFn(OpenMaya.MFn.kShadingEngine):
+            return
+        name = OpenMaya.MFnDependencyNode(source_plug.node()).name()
+        if name in self.__shading_groups:
+            self.__shading_groups[name] = None
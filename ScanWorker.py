@@ -0,0 +1,64 @@
+from PySide2.QtCore import QThread, Signal
+
+# Keep a reference on the running workers so that they are not destroyed with the window
+_RUNNING_WORKERS = set()
+
+
+class ScanWorker(QThread):
+    """
+    Thread that runs a scan and streams its results
+    """
+    item_found = Signal(object)
+    scan_finished = Signal()
+
+    def __init__(self, scan_function):
+        """
+        Constructor
+        :param scan_function: function taking a cancellation check and returning an iterable of results
+        """
+        super(ScanWorker, self).__init__()
+        self.__scan_function = scan_function
+        self.finished.connect(self.__on_finished)
+
+    def start(self):
+        """
+        Start the scan
+        :return:
+        """
+        _RUNNING_WORKERS.add(self)
+        super(ScanWorker, self).start()
+
+    def cancel(self):
+        """
+        Cancel the scan, no more result is sent
+        :return:
+        """
+        self.requestInterruption()
+
+    def is_cancelled(self):
+        """
+        Getter of whether the scan has been cancelled
+        :return: boolean
+        """
+        return self.isInterruptionRequested()
+
+    def run(self):
+        """
+        Run the scan in the thread
+        :return:
+        """
+        try:
+            for item in self.__scan_function(self.is_cancelled):
+                if self.is_cancelled():
+                    break
+                self.item_found.emit(item)
+        finally:
+            if not self.is_cancelled():
+                self.scan_finished.emit()
+
+    def __on_finished(self):
+        """
+        Release the worker when the thread is finished
+        :return:
+        """
+        _RUNNING_WORKERS.discard(self)
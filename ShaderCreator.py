@@ -0,0 +1,163 @@
+import logging
+from enum import Enum
+
+import maya.cmds as cmds
+
+from .ShadingGraph import ShadingGraph
+from .ShadingNetworkBuilder import ShadingNetworkBuilder
+from .FileNodeRegistry import FileNodeRegistry
+from .MaterialIndex import MaterialIndex
+
+########################################################################################################################
+
+_LOGGER = logging.getLogger(__name__)
+
+
+########################################################################################################################
+
+
+class Assignation(Enum):
+    NoAssign = 1
+    AutoAssign = 2
+    AssignToSelection = 3
+
+
+class ShaderCreator:
+    """
+    Create shaders in the scene and assign them, usable from the interface and in batch
+    """
+    def __init__(self, material_index=None):
+        """
+        Constructor
+        :param material_index: MaterialIndex used to find the shaders to replace by name
+        """
+        self.__material_index = material_index if material_index is not None else MaterialIndex()
+
+    def get_material_index(self):
+        """
+        Getter of the material index
+        :return: material index
+        """
+        return self.__material_index
+
+    @staticmethod
+    def get_existing_shaders(shading_groups):
+        """
+        Get the nodes of the existing shaders of shading groups, the nodes still used by other shading networks
+        are not included
+        :param shading_groups
+        :return: node names
+        """
+        return ShadingGraph().get_exclusive_nodes(shading_groups)
+
+    @staticmethod
+    def delete_existing_shaders(nodes):
+        """
+        Delete the nodes of existing shaders in one call
+        :param nodes: nodes of the existing shaders
+        :return:
+        """
+        if len(nodes) > 0:
+            _LOGGER.info("Existing shaders deleted : %s", ", ".join(nodes))
+            cmds.delete(nodes)
+
+    def __get_shading_groups_to_reassign(self, shaders):
+        """
+        Get the shading groups of the materials named as the shaders
+        :param shaders
+        :return: dict of shading group to shader title
+        """
+        to_reassign = {}
+        self.__material_index.start()
+        for shader in shaders:
+            for shading_group in self.__material_index.get_shading_groups(shader.get_title()):
+                if shading_group not in to_reassign:
+                    to_reassign[shading_group] = shader.get_title()
+                    break
+        return to_reassign
+
+    def create(self, shaders, assignation, shading_values, objects=None, tx_converter=None, deduplicator=None,
+               reuse_file_nodes=False):
+        """
+        Create the shaders according to the method of assignation in a single undo chunk
+        :param shaders
+        :param assignation: Assignation
+        :param shading_values: displacement_scale and displacement_mid
+        :param objects: transforms to assign with AssignToSelection
+        :param tx_converter: TxConverter to make the file nodes point at .tx or None to keep the textures (the shaders
+        are not modified, the paths are replaced for this creation only)
+        :param deduplicator: TextureDeduplicator to make the copies of a texture point at one file or None (the
+        shaders are not modified, the paths are replaced for this creation only)
+        :param reuse_file_nodes: whether the file nodes of the scene and of the shaders created are reused for the
+        textures already loaded
+        :return: names of the nodes created
+        """
+        # Paths of the file nodes replacing the paths of the fields
+        file_names = {}
+        if deduplicator is not None:
+            # The copies are shared before the conversion so they are converted once
+            file_names.update(deduplicator.deduplicate_shaders(shaders))
+        if tx_converter is not None:
+            # The textures are converted before any node is created
+            file_names.update(tx_converter.convert_shaders(shaders, file_names))
+        cmds.undoInfo(openChunk=True)
+        try:
+            no_items_to_assign = False
+            to_reassign = {}
+            existing_shaders = []
+            if assignation == Assignation.AutoAssign:
+                # Get all the shading groups to reassign
+                to_reassign = self.__get_shading_groups_to_reassign(shaders)
+                no_items_to_assign = len(to_reassign) == 0
+                # The existing shaders are deleted once the new ones are built so a failed build keeps them
+                existing_shaders = ShaderCreator.get_existing_shaders(list(to_reassign.keys()))
+            # All the networks are recorded and built at once
+            # The nodes of the existing shaders are not reused as they are deleted
+            builder = ShadingNetworkBuilder(FileNodeRegistry(existing_shaders) if reuse_file_nodes else None,
+                                            file_names)
+            if assignation == Assignation.AutoAssign:
+                if not no_items_to_assign:
+                    # Reassign the right to each shading group
+                    shading_nodes = {}
+                    for shader in shaders:
+                        shading_nodes[shader.get_title()] = shader.add_shading_nodes(builder, shading_values)
+
+                    for shading_group, shader_title in to_reassign.items():
+                        arnold_node, displacement_node = shading_nodes[shader_title]
+                        builder.connect(arnold_node, "outColor", shading_group, "surfaceShader")
+                        if displacement_node is not None:
+                            builder.connect(displacement_node, "displacement", shading_group, "displacementShader")
+
+            elif assignation == Assignation.AssignToSelection:
+                objects = objects if objects is not None else []
+                no_items_to_assign = len(objects) == 0
+                if not no_items_to_assign:
+                    # Create a new shading group
+                    shading_group = builder.create_shading_group("SG")
+                    # Generate new shader and assign to shading group
+                    for shader in shaders:
+                        arnold_node, displacement_node = shader.add_shading_nodes(builder, shading_values)
+                        builder.connect(arnold_node, "outColor", shading_group, "surfaceShader")
+                        if displacement_node is not None:
+                            builder.connect(displacement_node, "displacement", shading_group, "displacementShader")
+                    # Assign the object in the shading group
+                    builder.assign(shading_group, objects)
+            if assignation == Assignation.NoAssign or no_items_to_assign:
+                dtx = 1
+                i = 0
+                # Generate new shader and assign each to an object
+                for shader in shaders:
+                    obj = builder.create_sphere((dtx * i, 0, 0))
+
+                    shading_group = builder.create_shading_group(shader.get_title() + "_sg")
+                    arnold_node, displacement_node = shader.add_shading_nodes(builder, shading_values)
+                    builder.connect(arnold_node, "outColor", shading_group, "surfaceShader")
+                    if displacement_node is not None:
+                        builder.connect(displacement_node, "displacement", shading_group, "displacementShader")
+                    builder.assign(shading_group, [obj])
+                    i += 1
+            builder.do_it()
+            ShaderCreator.delete_existing_shaders(existing_shaders)
+            return builder.get_created_nodes()
+        finally:
+            cmds.undoInfo(closeChunk=True)
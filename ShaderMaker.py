@@ -5,22 +5,17 @@ from functools import partial
 
 import sys
 
-import pymel.core as pm
-import maya.OpenMayaUI as omui
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
 
 from PySide2 import QtCore
 from PySide2 import QtGui
 from PySide2 import QtWidgets
-from PySide2.QtWidgets import *
-from PySide2.QtGui import *
-from PySide2.QtCore import *
-
-from shiboken2 import wrapInstance
-
-from common.utils import *
-from common.Prefs import *
+from PySide2.QtWidgets import QAbstractItemView, QDesktopWidget, QHeaderView, QSizePolicy, QStyle, QTableView
+from PySide2.QtCore import QPoint, QTimer
 
-import maya.OpenMaya as OpenMaya
+from common.Prefs import Prefs
+from common.utils import print_warning
 
 ########################################################################################################################
 
@@ -28,14 +23,23 @@ _FILE_NAME_PREFS = "shader_maker"
 
 DEFAULT_DIR_BROWSE = "I:/"
 
-FILE_EXTENSION_SUPPORTED = ["exr", "jpg", "jpeg", "tif", "png", "tx"]
+# Delay before scanning a folder typed in a path field
+SCAN_DEBOUNCE_MS = 400
+
+# Delay to gather the selection events fired together
+SELECTION_COALESCE_MS = 50
 
-DEFAULT_DISPLACEMENT_SCALE = 0.02
-DEFAULT_DISPLACEMENT_MID = 0
+# Environment variables of the file of the timings (JSON lines) and of the file of the cProfile capture
+TIMINGS_ENV_VAR = "SHADER_MAKER_TIMINGS"
+PROFILE_ENV_VAR = "SHADER_MAKER_PROFILE"
 
 SHADER_FIELDS = \
     {1: "base_color", 2: "normal", 3: "displacement", 4: "roughness", 5: "metalness", 6: "emissive", 7: "sss"}
 
+# Column of the thumbnails after the fields, displayed after the shader name
+THUMBNAIL_COLUMN = len(SHADER_FIELDS) + 1
+THUMBNAIL_ROW_HEIGHT = 36
+
 ########################################################################################################################
 
 # CS mean create shaders part
@@ -43,15 +47,24 @@ SHADER_FIELDS = \
 
 ########################################################################################################################
 
-FILE_EXTENSION_SUPPORTED_REGEX = "|".join(FILE_EXTENSION_SUPPORTED)
-
-from .Shader import Shader
-
-
-class Assignation(Enum):
-    NoAssign = 1
-    AutoAssign = 2
-    AssignToSelection = 3
+from .core.Shader import Shader, SHADER_FIELDS_CLASSIFIER, FILE_EXTENSION_SUPPORTED, FILE_EXTENSION_SUPPORTED_REGEX, \
+    DEFAULT_DISPLACEMENT_SCALE, DEFAULT_DISPLACEMENT_MID
+from .core.TextureIndex import TextureIndex, DEFAULT_DEPTH as DEFAULT_INDEX_DEPTH
+from .core.UpdatePlan import UpdatePlan
+from .core.TextureAudit import TextureAudit
+from .core.TxConverter import TxConverter
+from .core.TextureDeduplicator import TextureDeduplicator
+from .core.ScanCache import ScanCache
+from .core.Profiler import PROFILER
+from .core.LibraryScanner import LibraryScanner, DEFAULT_MAX_DEPTH
+from .ScanWorker import ScanWorker
+from .LibraryWatcher import LibraryWatcher
+from .ShaderTableModel import ShaderTableModel, CheckBoxDelegate, ThumbnailDelegate
+from .ThumbnailProvider import ThumbnailProvider
+from .TextureTreeModel import TextureTreeModel
+from .ShadingGraph import ShadingGraph
+from .ShaderCreator import ShaderCreator, Assignation
+from .FileNodeRegistry import FileNodeRegistry
 
 
 class ShaderMaker(QtWidgets.QDialog):
@@ -62,14 +75,19 @@ class ShaderMaker(QtWidgets.QDialog):
         Get the current directory (scene sir or default if not found)
         :return:
         """
-        scene_name = pm.sceneName()
+        scene_name = cmds.file(query=True, sceneName=True)
         if len(scene_name) > 0:
             dirname = os.path.dirname(os.path.dirname(scene_name))
         else:
             dirname = DEFAULT_DIR_BROWSE
         return dirname
 
-    def __init__(self, prnt=wrapInstance(int(omui.MQtUtil.mainWindow()), QtWidgets.QWidget)):
+    def __init__(self, prnt=None):
+        # The main window is retrieved on construction so the module can be imported without the Maya interface
+        if prnt is None:
+            import maya.OpenMayaUI as omui
+            from shiboken2 import wrapInstance
+            prnt = wrapInstance(int(omui.MQtUtil.mainWindow()), QtWidgets.QWidget)
         super(ShaderMaker, self).__init__(prnt)
 
         # Common Preferences (common preferences on all tools)
@@ -80,12 +98,40 @@ class ShaderMaker(QtWidgets.QDialog):
         # Model attributes
         self.__cs_folder_path = ""
         self.__cs_shaders = []
+        self.__cs_scanner = LibraryScanner(
+            SHADER_FIELDS_CLASSIFIER, ScanCache(SHADER_FIELDS_CLASSIFIER.get_signature()))
+        self.__cs_max_depth = DEFAULT_MAX_DEPTH
+        self.__cs_scan_worker = None
+        # Shader folder to its shaders
+        self.__cs_folders = {}
+        self.__cs_watch = False
+        self.__cs_watch_pending = set()
+        self.__cs_update_worker = None
         self.__cs_seleted_shaders = []
         self.__assign_cs = Assignation.AutoAssign
+        self.__cs_shader_creator = ShaderCreator()
         self.__us_folder_path = ""
         self.__us_data = {}
+        # Textures of the selection and their paths read by the last retrieval
+        self.__us_texture_paths = []
+        self.__us_shading_groups = []
+        self.__us_textures_by_shading_group = {}
+        # Memoized queries of the shading networks of the update part, the nodes whose sources changed are forgotten
+        self.__us_shading_graph = ShadingGraph()
+        self.__us_changed_nodes = set()
+        # Node of the networks displayed to the callback of its attribute changes
+        self.__us_node_callbacks = {}
+        self.__us_texture_index = None
+        self.__us_index_worker = None
+        self.__us_update_plan = None
+        self.__us_watch = False
         self.__displacement_scale = DEFAULT_DISPLACEMENT_SCALE
         self.__displacement_mid = DEFAULT_DISPLACEMENT_MID
+        self.__cs_convert_tx = False
+        self.__cs_tx_converter = None
+        self.__cs_dedupe = False
+        self.__cs_deduplicator = None
+        self.__cs_reuse_file_nodes = False
 
         # UI attributes
         self.__ui_width = 750
@@ -95,15 +141,45 @@ class ShaderMaker(QtWidgets.QDialog):
         self.__ui_pos = QDesktopWidget().availableGeometry().center() - QPoint(self.__ui_width,self.__ui_height)/2
         self.__ui_cs_folder_path = None
         self.__ui_us_folder_path = None
+        self.__ui_tree_us_files = None
+        self.__ui_tree_us_resolved_index = None
         self.__ui_cs_submit_btn = None
+        self.__cs_thumbnail_provider = None
         self.__ui_us_submit_btn = None
+        self.__ui_us_export_btn = None
+        self.__ui_status_bar = None
         self.__ui_shaders_cs_lyt = None
         self.__auto_assign_radio = None
         self.__assign_to_selection_radio = None
         self.__no_assign_radio = None
 
+        # Scans are started once the path stopped changing
+        self.__cs_scan_timer = QTimer(self)
+        self.__cs_scan_timer.setSingleShot(True)
+        self.__cs_scan_timer.setInterval(SCAN_DEBOUNCE_MS)
+        self.__cs_scan_timer.timeout.connect(self.__start_cs_scan)
+        self.__us_index_timer = QTimer(self)
+        self.__us_index_timer.setSingleShot(True)
+        self.__us_index_timer.setInterval(SCAN_DEBOUNCE_MS)
+        self.__us_index_timer.timeout.connect(self.__start_us_index)
+        # Many selection events are handled once
+        self.__us_selection_timer = QTimer(self)
+        self.__us_selection_timer.setSingleShot(True)
+        self.__us_selection_timer.setInterval(SELECTION_COALESCE_MS)
+        self.__us_selection_timer.timeout.connect(self.__on_selection_coalesced)
+        # New textures are found by watching the folders
+        self.__cs_watcher = LibraryWatcher(self)
+        self.__cs_watcher.directories_changed.connect(self.__on_cs_directories_changed)
+        self.__us_watcher = LibraryWatcher(self)
+        self.__us_watcher.directories_changed.connect(self.__on_us_directories_changed)
+
         self.__retrieve_prefs()
 
+        # Timings and profiling asked by the environment
+        PROFILER.set_json_lines_path(os.environ.get(TIMINGS_ENV_VAR))
+        if PROFILE_ENV_VAR in os.environ:
+            PROFILER.start_profile()
+
         # Retrieve us data
         self.__generate_us_data()
 
@@ -128,6 +204,12 @@ class ShaderMaker(QtWidgets.QDialog):
         self.__prefs["window_size"] = {"width": size.width(), "height": size.height()}
         pos = self.pos()
         self.__prefs["window_pos"] = {"x": pos.x(), "y": pos.y()}
+        self.__prefs["cs_max_depth"] = self.__cs_max_depth
+        self.__prefs["cs_convert_tx"] = self.__cs_convert_tx
+        self.__prefs["cs_dedupe"] = self.__cs_dedupe
+        self.__prefs["cs_reuse_file_nodes"] = self.__cs_reuse_file_nodes
+        self.__prefs["cs_watch"] = self.__cs_watch
+        self.__prefs["us_watch"] = self.__us_watch
 
     def __retrieve_prefs(self):
         """
@@ -137,6 +219,18 @@ class ShaderMaker(QtWidgets.QDialog):
         if "window_pos" in self.__prefs:
             pos = self.__prefs["window_pos"]
             self.__ui_pos = QPoint(pos["x"],pos["y"])
+        if "cs_max_depth" in self.__prefs:
+            self.__cs_max_depth = self.__prefs["cs_max_depth"]
+        if "cs_convert_tx" in self.__prefs:
+            self.__cs_convert_tx = self.__prefs["cs_convert_tx"]
+        if "cs_dedupe" in self.__prefs:
+            self.__cs_dedupe = self.__prefs["cs_dedupe"]
+        if "cs_reuse_file_nodes" in self.__prefs:
+            self.__cs_reuse_file_nodes = self.__prefs["cs_reuse_file_nodes"]
+        if "cs_watch" in self.__prefs:
+            self.__cs_watch = self.__prefs["cs_watch"]
+        if "us_watch" in self.__prefs:
+            self.__us_watch = self.__prefs["us_watch"]
 
 
     def __create_callback(self):
@@ -153,7 +247,19 @@ class ShaderMaker(QtWidgets.QDialog):
         :return:
         """
         OpenMaya.MMessage.removeCallback(self.__us_selection_callback)
+        self.__watch_us_networks([])
+        self.__cs_shader_creator.get_material_index().stop()
+        self.__cs_scan_timer.stop()
+        self.__us_index_timer.stop()
+        self.__us_selection_timer.stop()
+        self.__cancel_cs_scan()
+        self.__cancel_us_index()
+        self.__cs_watcher.stop()
+        self.__us_watcher.stop()
+        self.__cs_thumbnail_provider.cancel()
         self.__save_prefs()
+        if PROFILE_ENV_VAR in os.environ:
+            PROFILER.stop_profile(os.environ[PROFILE_ENV_VAR])
 
     def __browse_cs_folder(self):
         """
@@ -169,6 +275,9 @@ class ShaderMaker(QtWidgets.QDialog):
             self, "Select Directory", dirname)
         if len(folder_path) > 0 and folder_path != self.__cs_folder_path:
             self.__ui_cs_folder_path.setText(folder_path)
+            # No need to wait for a browsed folder
+            self.__cs_scan_timer.stop()
+            self.__start_cs_scan()
 
     def __browse_us_folder(self):
         """
@@ -186,6 +295,9 @@ class ShaderMaker(QtWidgets.QDialog):
             dirname)
         if len(folder_path) > 0 and folder_path != self.__us_folder_path:
             self.__ui_us_folder_path.setText(folder_path)
+            # No need to wait for a browsed folder
+            self.__us_index_timer.stop()
+            self.__start_us_index()
 
     def __create_ui(self):
         """
@@ -241,23 +353,58 @@ class ShaderMaker(QtWidgets.QDialog):
             QtGui.QPixmap(browse_icon_path)))
         browse_cs_btn.clicked.connect(partial(self.__browse_cs_folder))
         folder_cs_lyt.addWidget(browse_cs_btn)
+        rescan_cs_btn = QtWidgets.QPushButton()
+        rescan_cs_btn.setIconSize(icon_size)
+        rescan_cs_btn.setFixedSize(btn_icon_size)
+        rescan_cs_btn.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        rescan_cs_btn.setToolTip("Rescan the folder without using the cache")
+        rescan_cs_btn.clicked.connect(self.__rescan_cs_folder)
+        folder_cs_lyt.addWidget(rescan_cs_btn)
+        folder_cs_lyt.addWidget(QtWidgets.QLabel("Depth"))
+        max_depth_spin = QtWidgets.QSpinBox()
+        max_depth_spin.setRange(0, 16)
+        max_depth_spin.setFixedHeight(btn_icon_size.height() + 3)
+        max_depth_spin.setToolTip("Max depth of the shader folders in the selected folder")
+        max_depth_spin.setValue(self.__cs_max_depth)
+        max_depth_spin.valueChanged.connect(self.__max_depth_cs_changed)
+        folder_cs_lyt.addWidget(max_depth_spin)
+        watch_cs_checkbox = QtWidgets.QCheckBox("Watch")
+        watch_cs_checkbox.setToolTip("Update the shaders when the textures of the folder change")
+        watch_cs_checkbox.setChecked(self.__cs_watch)
+        watch_cs_checkbox.stateChanged.connect(self.__watch_cs_changed)
+        folder_cs_lyt.addWidget(watch_cs_checkbox)
 
         # Layout ML.1.2 : Shaders
-        self.__ui_shaders_cs_list = QTableWidget(0, 8)
+        # Thumbnails are decoded in background and kept on disk
+        self.__cs_thumbnail_provider = ThumbnailProvider(self)
+        self.__ui_shaders_cs_model = ShaderTableModel(
+            SHADER_FIELDS,
+            ["Shader name", "Base Color", "Normal", "Displacement", "Roughness", "Metalness", "Emissive", "SSS",
+             "Preview"],
+            self, THUMBNAIL_COLUMN, self.__cs_thumbnail_provider)
+        self.__ui_shaders_cs_list = QTableView()
+        self.__ui_shaders_cs_list.setModel(self.__ui_shaders_cs_model)
+        self.__ui_shaders_cs_list.setItemDelegate(CheckBoxDelegate(self.__ui_shaders_cs_list))
+        self.__ui_shaders_cs_list.setItemDelegateForColumn(
+            THUMBNAIL_COLUMN, ThumbnailDelegate(self.__ui_shaders_cs_list))
         self.__ui_shaders_cs_list.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Preferred)
         self.__ui_shaders_cs_list.verticalHeader().hide()
+        self.__ui_shaders_cs_list.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.__ui_shaders_cs_list.verticalHeader().setDefaultSectionSize(THUMBNAIL_ROW_HEIGHT)
         self.__ui_shaders_cs_list.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.__ui_shaders_cs_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.__ui_shaders_cs_list.setHorizontalHeaderLabels(
-            ["Shader name", "Base Color", "Normal", "Displacement", "Roughness", "Metalness", "Emissive", "SSS"])
         self.__ui_shaders_cs_list.setShowGrid(False)
         self.__ui_shaders_cs_list.setAlternatingRowColors(True)
         horizontal_header = self.__ui_shaders_cs_list.horizontalHeader()
         horizontal_header.sectionClicked.connect(self.__on_clicked_header_cs_list)
-        horizontal_header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        # Fixed sizes avoid measuring every row when thousands of shaders are displayed
+        horizontal_header.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        horizontal_header.setDefaultSectionSize(85)
         horizontal_header.setSectionResizeMode(0, QHeaderView.Stretch)
-        self.__ui_shaders_cs_list.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.__ui_shaders_cs_list.itemSelectionChanged.connect(self.__on_cs_list_item_selected)
+        horizontal_header.resizeSection(THUMBNAIL_COLUMN, 2 * THUMBNAIL_ROW_HEIGHT)
+        horizontal_header.moveSection(THUMBNAIL_COLUMN, 1)
+        self.__ui_shaders_cs_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.__ui_shaders_cs_list.selectionModel().selectionChanged.connect(self.__on_cs_list_item_selected)
         cs_lyt.addWidget(self.__ui_shaders_cs_list,1)
 
         # Layout ML.1.3 : Displacement scale
@@ -271,6 +418,20 @@ class ShaderMaker(QtWidgets.QDialog):
         displacement_mid_edit.textChanged.connect(self.__displacement_mid_changed)
         displacement_scale_form.addRow(QtWidgets.QLabel("Displacement scale"), displacement_scale_edit)
         displacement_scale_form.addRow(QtWidgets.QLabel("Displacement mid"), displacement_mid_edit)
+        convert_tx_checkbox = QtWidgets.QCheckBox()
+        convert_tx_checkbox.setChecked(self.__cs_convert_tx)
+        convert_tx_checkbox.stateChanged.connect(self.__convert_tx_changed)
+        displacement_scale_form.addRow(QtWidgets.QLabel("Convert textures to .tx"), convert_tx_checkbox)
+        dedupe_checkbox = QtWidgets.QCheckBox()
+        dedupe_checkbox.setToolTip("Make the identical textures of several shader folders point at one file")
+        dedupe_checkbox.setChecked(self.__cs_dedupe)
+        dedupe_checkbox.stateChanged.connect(self.__dedupe_changed)
+        displacement_scale_form.addRow(QtWidgets.QLabel("Share identical textures"), dedupe_checkbox)
+        reuse_file_nodes_checkbox = QtWidgets.QCheckBox()
+        reuse_file_nodes_checkbox.setToolTip("Connect the file nodes of the scene already loading a texture")
+        reuse_file_nodes_checkbox.setChecked(self.__cs_reuse_file_nodes)
+        reuse_file_nodes_checkbox.stateChanged.connect(self.__reuse_file_nodes_changed)
+        displacement_scale_form.addRow(QtWidgets.QLabel("Reuse file nodes"), reuse_file_nodes_checkbox)
         cs_lyt.addLayout(displacement_scale_form)
 
         # Layout ML.1.4 : Submit creation
@@ -321,18 +482,60 @@ class ShaderMaker(QtWidgets.QDialog):
             QtGui.QPixmap(browse_icon_path)))
         browse_us_btn.clicked.connect(partial(self.__browse_us_folder))
         folder_us_lyt.addWidget(browse_us_btn)
+        watch_us_checkbox = QtWidgets.QCheckBox("Watch")
+        watch_us_checkbox.setToolTip("Look for the new versions when the textures of the folder change")
+        watch_us_checkbox.setChecked(self.__us_watch)
+        watch_us_checkbox.stateChanged.connect(self.__watch_us_changed)
+        folder_us_lyt.addWidget(watch_us_checkbox)
 
         # Layout ML.2.2 : Selection files
-        self.__ui_tree_us_files = QtWidgets.QTreeWidget()
+        self.__ui_tree_us_model = TextureTreeModel(self)
+        self.__ui_tree_us_files = QtWidgets.QTreeView()
         self.__ui_tree_us_files.setHeaderHidden(True)
+        self.__ui_tree_us_files.setUniformRowHeights(True)
+        self.__ui_tree_us_files.setModel(self.__ui_tree_us_model)
+        # Connected after the view so that the rows are known by the view when expanded
+        self.__ui_tree_us_model.rowsInserted.connect(self.__on_us_tree_rows_inserted)
         us_lyt.addWidget(self.__ui_tree_us_files)
 
-        # Button ML.2.3 : Submit update
+        # Layout ML.2.3 : Buttons
+        us_btn_lyt = QtWidgets.QHBoxLayout()
+        us_btn_lyt.setAlignment(QtCore.Qt.AlignHCenter)
+        us_lyt.addLayout(us_btn_lyt)
+
+        # Button ML.2.3.1 : Export the update plan
+        self.__ui_us_export_btn = QtWidgets.QPushButton("Export Dry Run")
+        self.__ui_us_export_btn.setFixedSize(size_btn)
+        self.__ui_us_export_btn.setEnabled(False)
+        self.__ui_us_export_btn.clicked.connect(self.__export_update_plan)
+        us_btn_lyt.addWidget(self.__ui_us_export_btn)
+
+        # Button ML.2.3.2 : Audit all the textures of the scene
+        self.__ui_us_audit_btn = QtWidgets.QPushButton("Audit Scene")
+        self.__ui_us_audit_btn.setFixedSize(size_btn)
+        self.__ui_us_audit_btn.setToolTip("Report the outdated, missing and up to date textures of the whole scene")
+        self.__ui_us_audit_btn.clicked.connect(self.__audit_scene)
+        us_btn_lyt.addWidget(self.__ui_us_audit_btn)
+
+        # Button ML.2.3.3 : Merge the duplicate file nodes
+        self.__ui_us_merge_btn = QtWidgets.QPushButton("Merge Duplicate Nodes")
+        self.__ui_us_merge_btn.setFixedSize(size_btn)
+        self.__ui_us_merge_btn.setToolTip("Merge the file nodes and the place2dTextures loading the same texture with "
+                                          "the same settings")
+        self.__ui_us_merge_btn.clicked.connect(self.__merge_duplicate_nodes)
+        us_btn_lyt.addWidget(self.__ui_us_merge_btn)
+
+        # Button ML.2.3.4 : Submit update
         self.__ui_us_submit_btn = QtWidgets.QPushButton("Update Texture Paths")
         self.__ui_us_submit_btn.setFixedSize(size_btn)
         self.__ui_us_submit_btn.setEnabled(False)
         self.__ui_us_submit_btn.clicked.connect(self.__submit_update_shader)
-        us_lyt.addWidget(self.__ui_us_submit_btn, 0, QtCore.Qt.AlignHCenter)
+        us_btn_lyt.addWidget(self.__ui_us_submit_btn)
+
+        # Status bar ML.3 : Timings
+        self.__ui_status_bar = QtWidgets.QStatusBar()
+        self.__ui_status_bar.setSizeGripEnabled(False)
+        main_lyt.addWidget(self.__ui_status_bar)
 
     def __displacement_scale_changed(self, value):
         """
@@ -352,6 +555,61 @@ class ShaderMaker(QtWidgets.QDialog):
         if len(value) > 0:
             self.__displacement_mid = float(value)
 
+    def __convert_tx_changed(self, state):
+        """
+        On convert to .tx checkbox changed
+        :param state
+        :return:
+        """
+        self.__cs_convert_tx = state == QtCore.Qt.Checked
+
+    def __get_cs_tx_converter(self):
+        """
+        Get the converter of the textures to .tx if the conversion is checked
+        :return: TxConverter or None
+        """
+        if not self.__cs_convert_tx:
+            return None
+        if self.__cs_tx_converter is None:
+            self.__cs_tx_converter = TxConverter()
+        return self.__cs_tx_converter
+
+    def __dedupe_changed(self, state):
+        """
+        On share identical textures checkbox changed
+        :param state
+        :return:
+        """
+        self.__cs_dedupe = state == QtCore.Qt.Checked
+
+    def __reuse_file_nodes_changed(self, state):
+        """
+        On reuse file nodes checkbox changed
+        :param state
+        :return:
+        """
+        self.__cs_reuse_file_nodes = state == QtCore.Qt.Checked
+
+    def __get_cs_deduplicator(self):
+        """
+        Get the deduplicator of the textures if the sharing is checked
+        :return: TextureDeduplicator or None
+        """
+        if not self.__cs_dedupe:
+            return None
+        if self.__cs_deduplicator is None:
+            self.__cs_deduplicator = TextureDeduplicator()
+        return self.__cs_deduplicator
+
+    def __max_depth_cs_changed(self, value):
+        """
+        On max depth changed scan the folder of the creation part again
+        :param value
+        :return:
+        """
+        self.__cs_max_depth = value
+        self.__start_cs_scan()
+
     def __refresh_ui(self):
         """
         Refresh the ui according to the model attribute
@@ -379,102 +637,102 @@ class ShaderMaker(QtWidgets.QDialog):
         if self.__assign_cs == Assignation.AssignToSelection and nb_shader_enabled > 1:
             self.__auto_assign_radio.setChecked(True)
 
-    @staticmethod
-    def __generate_field_table_widget(field):
-        """
-        Generate a widget containing a Checkbox according to a shader field
-        :param field
-        :return: widget
-        """
-        cb = QCheckBox()
-        is_found = field.is_found()
-        cb.setEnabled(is_found)
-        cb.setChecked(is_found and field.is_enabled())
-        cb.stateChanged.connect(field.toggle_enabled)
-        widget_wrapper = QWidget()
-        layout = QHBoxLayout()
-        layout.addStretch()
-        layout.addWidget(cb)
-        layout.addStretch()
-        widget_wrapper.setLayout(layout)
-        return widget_wrapper
-
     def __refresh_cs_body(self):
         """
         Refresh the body of the creation part
         :return:
         """
-        self.__ui_shaders_cs_list.setRowCount(0)
-        row_index = 0
-        for shader in self.__cs_shaders:
-            self.__ui_shaders_cs_list.insertRow(row_index)
-            # Title
-            title = shader.get_title()
-            elem_item = QTableWidgetItem(" "+title)
-            elem_item.setData(Qt.UserRole, shader)
-            self.__ui_shaders_cs_list.setItem(row_index, 0, elem_item)
-            # Fields
-            for index, field_keyword in SHADER_FIELDS.items():
-                self.__ui_shaders_cs_list.setCellWidget(
-                    row_index, index, self.__generate_field_table_widget(shader.get_field(field_keyword)))
-            row_index+=1
+        self.__ui_shaders_cs_model.set_shaders(self.__cs_shaders)
 
     def __refresh_us_body(self):
         """
         Refresh the body of the update part by retrieving the textures and comparing it with the last version
         :return:
         """
-        textures_displayed= {}
         if self.__ui_tree_us_files is None: return
 
-        self.__ui_tree_us_files.clear()
-        update_btn_enabled = False
+        with PROFILER.phase("us_refresh"):
+            self.__refresh_us_tree()
+        self.__refresh_status_bar()
+
+        # Refresh the update buttons according to the update plan (none while the index is built)
+        plan = self.__us_update_plan
+        if self.__ui_us_submit_btn is not None:
+            self.__ui_us_submit_btn.setEnabled(plan is not None and len(plan.get_updates()) > 0)
+        if self.__ui_us_export_btn is not None:
+            self.__ui_us_export_btn.setEnabled(plan is not None and len(plan.get_entries()) > 0)
+
+    def __refresh_us_tree(self):
+        """
+        Refresh the tree of the update part with only the differences and compute the update plan
+        :return:
+        """
+        directories = []
+        textures_paths = []
         for directory, data in self.__us_data.items():
             textures = data[0]
             shaders = data[1]
             dir_string = directory + "     ["
             nb_shaders = len(shaders)
             for i in range(len(shaders)):
-                dir_string += shaders[i].name()
+                dir_string += shaders[i]
                 if i != nb_shaders - 1:
                     dir_string += ", "
             dir_string += "]"
 
-            if directory not in textures_displayed:
-                textures_displayed[directory] = []
-
-            item = QtWidgets.QTreeWidgetItem([dir_string])
-            self.__ui_tree_us_files.addTopLevelItem(item)
+            textures_displayed = []
             for texture in textures:
-                filepath = texture.getAttr("fileTextureName")
-                if filepath in textures_displayed[directory]: continue
-                textures_displayed[directory].append(filepath)
+                filepath = cmds.getAttr(texture + ".fileTextureName")
+                textures_paths.append((texture, filepath))
+                if filepath not in textures_displayed:
+                    textures_displayed.append(filepath)
+            directories.append((directory, dir_string, textures_displayed))
+
+        # Only the differences are applied, the new versions are resolved when the textures are displayed
+        texture_index = self.__get_us_texture_index()
+        if texture_index is None:
+            # The index of the update folder is not ready yet
+            self.__us_update_plan = None
+            self.__ui_tree_us_model.set_resolver(None)
+        elif self.__ui_tree_us_resolved_index is not texture_index:
+            self.__ui_tree_us_model.set_resolver(partial(ShaderMaker.__resolve_us_file_path, texture_index))
+        if texture_index is not None:
+            self.__us_update_plan = UpdatePlan.build(texture_index, textures_paths)
+        self.__ui_tree_us_resolved_index = texture_index
+        self.__ui_tree_us_model.set_directories(directories)
+
+    def __refresh_status_bar(self):
+        """
+        Display the last timings and the counters in the status bar
+        :return:
+        """
+        if self.__ui_status_bar is not None:
+            self.__ui_status_bar.showMessage(PROFILER.get_summary())
 
-                filename = os.path.basename(filepath)
-                child = QtWidgets.QTreeWidgetItem([filename])
+    @staticmethod
+    def __resolve_us_file_path(texture_index, filepath):
+        """
+        Get the last version of a texture
+        :param texture_index
+        :param filepath
+        :return: new filepath or None
+        """
+        return UpdatePlan.resolve(texture_index, filepath)[0]
 
-                base = re.search(r"(.*)(?:<UDIM>|[0-9]{4})\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")", filename)
-                if base is None:
-                    print_warning("filename \""+filename+"\" not valid as a texture")
-                    continue
-                match = base.groups()[0]
-                regex = match.replace(".", "\.") + "((?:[0-9]{0,4})\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + "))"
-                # Get the last version
-                new_file_path = self.__us_find_file_in_directory(
-                    self.__us_folder_path, regex)
-
-                child_enabled = new_file_path is not None and new_file_path != filepath
-                update_btn_enabled |= child_enabled
-                child.setDisabled(not child_enabled)
-                item.addChild(child)
-            item.setExpanded(True)
-
-        # Refresh the update button according to the update body
-        if self.__ui_us_submit_btn is not None:
-            self.__ui_us_submit_btn.setEnabled(
-                len(self.__us_data) > 0 and os.path.isdir(self.__us_folder_path) and update_btn_enabled)
-            self.__ui_us_submit_btn.setEnabled(True)
-    def __on_cs_list_item_selected(self):
+    def __on_us_tree_rows_inserted(self, parent, first, last):
+        """
+        Expand the directories added in the tree of the update part
+        :param parent
+        :param first
+        :param last
+        :return:
+        """
+        if parent.isValid():
+            return
+        for row in range(first, last + 1):
+            self.__ui_tree_us_files.expand(self.__ui_tree_us_model.index(row, 0))
+
+    def __on_cs_list_item_selected(self, *args):
         """
         On selection in the table changed retrieve shaders
         :return:
@@ -482,7 +740,7 @@ class ShaderMaker(QtWidgets.QDialog):
         self.__cs_seleted_shaders.clear()
         rows = self.__ui_shaders_cs_list.selectionModel().selectedRows()
         for row in rows:
-            self.__cs_seleted_shaders.append(self.__ui_shaders_cs_list.item(row.row(), 0).data(Qt.UserRole))
+            self.__cs_seleted_shaders.append(self.__ui_shaders_cs_model.get_shader(row.row()))
         self.__refresh_btn()
 
     def __on_clicked_header_cs_list(self, index):
@@ -491,19 +749,8 @@ class ShaderMaker(QtWidgets.QDialog):
         :param index: index column
         :return:
         """
-        print(index)
         if index != 0:
-            enabled = True
-            keyword = SHADER_FIELDS[index]
-            for shader in self.__cs_shaders:
-                if not shader.get_field(keyword).is_enabled():
-                    enabled = False
-                    break
-            for shader in self.__cs_shaders:
-                field = shader.get_field(keyword)
-                if field.is_found():
-                    field.set_enabled(not enabled)
-            self.__refresh_cs_body()
+            self.__ui_shaders_cs_model.toggle_column(index)
 
     def __on_folder_cs_changed(self):
         """
@@ -511,9 +758,19 @@ class ShaderMaker(QtWidgets.QDialog):
         :return:
         """
         folder_path = self.__ui_cs_folder_path.text()
+        if folder_path == self.__cs_folder_path:
+            return
         self.__cs_folder_path = folder_path
-        self.__generate_cs_shaders()
-        self.__refresh_ui()
+        self.__cancel_cs_scan()
+        self.__cs_scan_timer.start()
+
+    def __rescan_cs_folder(self):
+        """
+        Invalidate the cache of the folder of the creation part and scan it again
+        :return:
+        """
+        self.__cs_scanner.get_cache().invalidate(self.__cs_folder_path)
+        self.__start_cs_scan()
 
     def __on_folder_us_changed(self):
         """
@@ -521,111 +778,368 @@ class ShaderMaker(QtWidgets.QDialog):
         :return:
         """
         folder_path = self.__ui_us_folder_path.text()
+        if folder_path == self.__us_folder_path:
+            return
         self.__us_folder_path = folder_path
-        self.__generate_us_data()
-        self.__refresh_ui()
+        self.__us_texture_index = None
+        self.__cancel_us_index()
+        self.__refresh_us_body()
+        self.__us_index_timer.start()
+        self.__start_us_watch()
 
     def on_selection_changed(self, *args, **kwargs):
         """
-        Function called by the callback of the Maya selection
+        Function called by the callback of the Maya selection, the events are handled once Maya is idle
         :return:
         """
-        self.__generate_us_data()
-        self.__refresh_us_body()
+        PROFILER.count("selection_callbacks")
+        if not self.__us_selection_timer.isActive():
+            self.__us_selection_timer.start()
 
-    def __get_us_shading_groups_and_textures(self):
+    def on_node_attribute_changed(self, message, plug, other_plug, client_data):
         """
-        Get the textures and the shading groups of the selection
+        Function called by the callback of the attributes of the nodes of the networks displayed. The network of a
+        node whose sources changed is queried again and the paths are read again once Maya is idle
+        :param message
+        :param plug
+        :param other_plug
+        :param client_data: node name
         :return:
         """
-        files = []
-        selection = pm.ls(sl=True, transforms=True)
-        distinct_shading_groups = []
-        for s in selection:
-            for shape in s.listRelatives(shapes=True, allDescendents=True):
-                if shape is not None:
-                    shading_groups = shape.listConnections(type="shadingEngine")
-                    for shading_group in shading_groups:
-                        if shading_group not in distinct_shading_groups:
-                            distinct_shading_groups.append(shading_group)
-
-        for shading_group in distinct_shading_groups:
-            textures = self.__get_textures_recursive(shading_group)
-            for texture in textures:
-                files.append({texture, shading_group})
-        return files
+        if message & (OpenMaya.MNodeMessage.kConnectionMade | OpenMaya.MNodeMessage.kConnectionBroken):
+            # Only the sources of the node matter and the dag objects are not part of the networks
+            if not message & OpenMaya.MNodeMessage.kIncomingDirection or \
+                    other_plug.node().hasFn(OpenMaya.MFn.kDagNode):
+                return
+            self.__us_changed_nodes.add(client_data)
+        elif not message & OpenMaya.MNodeMessage.kAttributeSet or \
+                plug.partialName(False, False, False, False, False, True) != "fileTextureName":
+            return
+        if not self.__us_selection_timer.isActive():
+            self.__us_selection_timer.start()
 
-    def __get_textures_recursive(self, node):
+    def __watch_us_networks(self, nodes):
         """
-        Get the textures from a node recursively
-        :param node:
-        :return: textures
+        Watch the attribute changes of the nodes of the networks displayed only. The nodes not watched anymore are
+        forgotten by the shading graph as their changes are not notified
+        :param nodes
+        :return:
         """
-        textures = []
-        connections = node.listConnections(source=True, destination=False)
-        for connection in connections:
-            if connection.type() == 'file':
-                textures.append(connection)
-            else:
-                textures.extend(self.__get_textures_recursive(connection))
-        return textures
+        nodes = set(nodes)
+        unwatched_nodes = [node for node in self.__us_node_callbacks if node not in nodes]
+        for node in unwatched_nodes:
+            OpenMaya.MMessage.removeCallback(self.__us_node_callbacks.pop(node))
+        self.__us_shading_graph.forget(unwatched_nodes)
+        for node in nodes:
+            if node in self.__us_node_callbacks:
+                continue
+            selection_list = OpenMaya.MSelectionList()
+            selection_list.add(node)
+            node_object = OpenMaya.MObject()
+            selection_list.getDependNode(0, node_object)
+            self.__us_node_callbacks[node] = \
+                OpenMaya.MNodeMessage.addAttributeChangedCallback(node_object, self.on_node_attribute_changed, node)
+
+    def __on_selection_coalesced(self):
+        """
+        Refresh the update part if the textures of the selection changed
+        :return:
+        """
+        if self.__generate_us_data():
+            self.__refresh_us_body()
 
-    def __generate_us_data(self):
+    @staticmethod
+    def __get_us_shading_groups():
         """
-        Generate model data for the update part
-        :return:
+        Get the shading groups of the selection
+        :return: shading group names
         """
-        self.__us_data.clear()
-        for texture, shading_group in self.__get_us_shading_groups_and_textures():
-            dirname = os.path.dirname(texture.getAttr("fileTextureName"))
-            if dirname not in self.__us_data:
-                self.__us_data[dirname] = [[], []]
+        selection = cmds.ls(sl=True, transforms=True, long=True)
+        if not selection:
+            return []
+        shapes = cmds.listRelatives(selection, shapes=True, allDescendents=True, fullPath=True)
+        if not shapes:
+            return []
+        distinct_shading_groups = []
+        distinct_shading_groups_set = set()
+        for shading_group in cmds.listConnections(shapes, type="shadingEngine") or []:
+            if shading_group not in distinct_shading_groups_set:
+                distinct_shading_groups_set.add(shading_group)
+                distinct_shading_groups.append(shading_group)
+        return distinct_shading_groups
 
-            self.__us_data[dirname][0].append(texture)
+    def __generate_us_data(self, force=False):
+        """
+        Generate model data for the update part
+        :param force: whether the textures of the shading groups are retrieved again
+        :return: whether the data changed
+        """
+        with PROFILER.phase("us_data"):
+            return self.__retrieve_us_data(force)
 
-            if shading_group not in self.__us_data[dirname][1]:
-                self.__us_data[dirname][1].append(shading_group)
+    def __retrieve_us_data(self, force):
+        """
+        Retrieve the textures of the shading groups of the selection, the shading networks are queried again only for
+        the shading groups added or whose sources changed and the paths are always read again
+        :param force: whether the textures of the shading groups are retrieved again
+        :return: whether the data changed
+        """
+        if force:
+            self.__us_shading_graph = ShadingGraph()
+            self.__us_textures_by_shading_group.clear()
+        else:
+            for shading_group in self.__us_shading_graph.forget(self.__us_changed_nodes):
+                self.__us_textures_by_shading_group.pop(shading_group, None)
+        self.__us_changed_nodes.clear()
+        shading_groups = ShaderMaker.__get_us_shading_groups()
+        # Forget the textures of the shading groups removed from the selection
+        shading_groups_set = set(shading_groups)
+        for shading_group in list(self.__us_textures_by_shading_group.keys()):
+            if shading_group not in shading_groups_set:
+                del self.__us_textures_by_shading_group[shading_group]
+        self.__us_shading_groups = shading_groups
+        # Only the shading groups added to the selection are traversed
+        added_shading_groups = \
+            [shading_group for shading_group in shading_groups
+             if shading_group not in self.__us_textures_by_shading_group]
+        self.__us_textures_by_shading_group.update(
+            self.__us_shading_graph.get_textures_by_shading_group(added_shading_groups))
+
+        us_data = {}
+        texture_paths = []
+        for shading_group in shading_groups:
+            for texture in self.__us_textures_by_shading_group[shading_group]:
+                if not cmds.objExists(texture):
+                    continue
+                file_path = cmds.getAttr(texture + ".fileTextureName")
+                texture_paths.append((texture, file_path))
+                dirname = os.path.dirname(file_path)
+                if dirname not in us_data:
+                    us_data[dirname] = [[], []]
+
+                us_data[dirname][0].append(texture)
+
+                if shading_group not in us_data[dirname][1]:
+                    us_data[dirname][1].append(shading_group)
+        networks_nodes = [texture for texture, _ in texture_paths]
+        for shading_group in shading_groups:
+            networks_nodes.extend(self.__us_shading_graph.get_network(shading_group))
+        self.__watch_us_networks(networks_nodes)
+        # The tree is refreshed only if the textures or their paths changed
+        if not force and texture_paths == self.__us_texture_paths and us_data == self.__us_data:
+            return False
+        self.__us_texture_paths = texture_paths
+        self.__us_data = us_data
+        return True
+
+    def __cancel_cs_scan(self):
+        """
+        Cancel the running scan and update of the creation part
+        :return:
+        """
+        if self.__cs_scan_worker is not None:
+            self.__cs_scan_worker.cancel()
+            self.__cs_scan_worker = None
+        if self.__cs_update_worker is not None:
+            self.__cs_update_worker.cancel()
+            self.__cs_update_worker = None
 
-    def __generate_cs_shaders(self):
+    def __start_cs_scan(self):
         """
-        Generate the model data for the creatino part
+        Scan the folder of the creation part in background, the shaders are displayed as soon as they are found
         :return:
         """
+        self.__cancel_cs_scan()
         self.__cs_shaders.clear()
+        self.__cs_folders.clear()
+        self.__cs_seleted_shaders.clear()
+        self.__refresh_cs_body()
+        self.__refresh_btn()
+        self.__start_cs_watch()
         if not os.path.isdir(self.__cs_folder_path):
             return
-        child_dir = os.listdir(self.__cs_folder_path)
-        list_dir = []
-        has_texture = False
-
-        for child in child_dir:
-            if os.path.isdir(self.__cs_folder_path + "/" + child):
-                list_dir.append(child)
-            else:
-                if re.match(r".*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")", child):
-                    has_texture = True
-
-        if has_texture:
-            # If the folder is a shader folder
-            shaders = Shader(os.path.basename(self.__cs_folder_path)).load(self.__cs_folder_path)
-            for shad, nb in shaders:
-                if nb > 0:
-                    self.__cs_shaders.append(shad)
+        # Shader folders are found at any depth of the folder
+        worker = ScanWorker(partial(ShaderMaker.__iter_cs_shaders, self.__cs_folder_path, self.__cs_scanner,
+                                    self.__cs_max_depth))
+        worker.item_found.connect(partial(self.__on_cs_folder_found, worker))
+        worker.scan_finished.connect(partial(self.__on_cs_scan_finished, worker))
+        self.__cs_scan_worker = worker
+        worker.start()
+
+    @staticmethod
+    def __iter_cs_shaders(folder_path, scanner, max_depth, is_cancelled):
+        """
+        Iterate over the shader folders of the folder of the creation part and time the scan
+        :param folder_path
+        :param scanner: LibraryScanner
+        :param max_depth
+        :param is_cancelled: function returning whether the scan has to stop
+        :return: generator of shader folder and shaders
+        """
+        with PROFILER.phase("cs_scan"):
+            for item in Shader.iter_shader_folders(folder_path, scanner, max_depth, is_cancelled):
+                yield item
+
+    def __on_cs_folder_found(self, worker, item):
+        """
+        Add the shaders of a shader folder found by the scan of the creation part
+        :param worker: worker that found the shader folder
+        :param item: shader folder and shaders
+        :return:
+        """
+        if worker is not self.__cs_scan_worker:
+            return
+        directory, shaders = item
+        self.__cs_folders[directory] = shaders
+        for shader in shaders:
+            self.__cs_shaders.append(shader)
+            self.__ui_shaders_cs_model.append_shader(shader)
+
+    def __on_cs_scan_finished(self, worker):
+        """
+        Update the directories changed during the scan or the update of the creation part
+        :param worker: worker finished
+        :return:
+        """
+        if worker is self.__cs_scan_worker:
+            self.__cs_scan_worker = None
+        elif worker is self.__cs_update_worker:
+            self.__cs_update_worker = None
+        self.__refresh_status_bar()
+        self.__update_cs_directories()
+
+    def __watch_cs_changed(self, state):
+        """
+        On watch checkbox of the creation part changed
+        :param state
+        :return:
+        """
+        self.__cs_watch = state == QtCore.Qt.Checked
+        self.__start_cs_watch()
+
+    def __start_cs_watch(self):
+        """
+        Watch the folder of the creation part if the watch is checked
+        :return:
+        """
+        self.__cs_watch_pending.clear()
+        if self.__cs_watch and os.path.isdir(self.__cs_folder_path):
+            self.__cs_watcher.watch(self.__cs_folder_path, self.__cs_max_depth)
         else:
-            # If the folder is a folder of shader folder
-            for directory in list_dir:
-                dir_path = self.__cs_folder_path + "/" + directory
-                has_texture_2 = False
-                child_dir_2 = os.listdir(dir_path)
-                for child in child_dir_2:
-                    if re.match(r".*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")", child):
-                        has_texture_2 = True
-                        break
-                if has_texture_2:
-                    shaders = Shader(directory).load(dir_path)
-                    for shad, nb in shaders:
-                        if nb > 0:
-                            self.__cs_shaders.append(shad)
+            self.__cs_watcher.stop()
+
+    def __on_cs_directories_changed(self, directories):
+        """
+        Update the shaders of the directories changed in the folder of the creation part
+        :param directories
+        :return:
+        """
+        self.__cs_watch_pending.update(directories)
+        self.__update_cs_directories()
+
+    def __update_cs_directories(self):
+        """
+        Classify again the directories changed once the running scan or update is finished
+        :return:
+        """
+        if len(self.__cs_watch_pending) == 0 or self.__cs_scan_worker is not None or \
+                self.__cs_update_worker is not None:
+            return
+        directories = sorted(self.__cs_watch_pending)
+        self.__cs_watch_pending.clear()
+        worker = ScanWorker(partial(ShaderMaker.__iter_cs_updates, self.__cs_folder_path, self.__cs_scanner,
+                                    self.__cs_max_depth, directories))
+        worker.item_found.connect(partial(self.__on_cs_directory_updated, worker))
+        worker.scan_finished.connect(partial(self.__on_cs_scan_finished, worker))
+        self.__cs_update_worker = worker
+        worker.start()
+
+    @staticmethod
+    def __iter_cs_updates(folder_path, scanner, max_depth, directories, is_cancelled):
+        """
+        Iterate over the shader folders of the directories changed, the directories unchanged are read from the
+        cache of the scanner
+        :param folder_path: folder of the creation part
+        :param scanner: LibraryScanner
+        :param max_depth
+        :param directories: directories changed
+        :param is_cancelled: function returning whether the update has to stop
+        :return: generator of directory and list of its shader folders and shaders
+        """
+        with PROFILER.phase("cs_watch_update"):
+            updated = []
+            for directory in sorted(directories):
+                # A directory is updated with its parent
+                if any(directory.startswith(parent + "/") for parent in updated):
+                    continue
+                relative_path = os.path.relpath(directory, folder_path).replace("\\", "/")
+                depth = 0 if relative_path == os.curdir else len(relative_path.split("/"))
+                if relative_path.startswith(os.pardir) or depth > max_depth:
+                    continue
+                updated.append(directory)
+                PROFILER.count("directories_updated")
+                yield directory, list(Shader.iter_shader_folders(directory, scanner, max_depth - depth, is_cancelled))
+
+    def __on_cs_directory_updated(self, worker, item):
+        """
+        Replace the shaders of a directory changed in place
+        :param worker: worker that updated the directory
+        :param item: directory and list of its shader folders and shaders
+        :return:
+        """
+        if worker is not self.__cs_update_worker:
+            return
+        directory, folders = item
+        prefix = directory + "/"
+        old_shaders = {}
+        for folder in [folder for folder in self.__cs_folders if folder == directory or folder.startswith(prefix)]:
+            for shader in self.__cs_folders.pop(folder):
+                old_shaders[(folder, shader.get_title())] = shader
+        for folder, shaders in folders:
+            self.__cs_folders[folder] = shaders
+            for shader in shaders:
+                old_shader = old_shaders.pop((folder, shader.get_title()), None)
+                if old_shader is None:
+                    self.__cs_shaders.append(shader)
+                    self.__ui_shaders_cs_model.append_shader(shader)
+                    continue
+                # The fields disabled stay disabled while their texture doesn't change
+                for field, old_field in zip(shader.get_fields(), old_shader.get_fields()):
+                    if field.get_file_name() == old_field.get_file_name():
+                        field.set_enabled(old_field.is_enabled())
+                self.__cs_shaders[self.__cs_shaders.index(old_shader)] = shader
+                self.__ui_shaders_cs_model.replace_shader(old_shader, shader)
+        for old_shader in old_shaders.values():
+            self.__cs_shaders.remove(old_shader)
+            self.__ui_shaders_cs_model.remove_shader(old_shader)
+        self.__on_cs_list_item_selected()
+
+    def __watch_us_changed(self, state):
+        """
+        On watch checkbox of the update part changed
+        :param state
+        :return:
+        """
+        self.__us_watch = state == QtCore.Qt.Checked
+        self.__start_us_watch()
+
+    def __start_us_watch(self):
+        """
+        Watch the folder of the update part if the watch is checked
+        :return:
+        """
+        if self.__us_watch and os.path.isdir(self.__us_folder_path):
+            self.__us_watcher.watch(self.__us_folder_path, DEFAULT_INDEX_DEPTH)
+        else:
+            self.__us_watcher.stop()
+
+    def __on_us_directories_changed(self, directories):
+        """
+        Build again the index of the update part in background, the tree is updated in place with the new versions
+        :param directories
+        :return:
+        """
+        self.__us_index_timer.start()
 
     def __get_shading_values(self):
         """
@@ -642,138 +1156,150 @@ class ShaderMaker(QtWidgets.QDialog):
         Create the shader according to the method of assignation checked
         :return:
         """
-        pm.undoInfo(openChunk=True)
-        no_items_to_assign = False
-        shading_values = self.__get_shading_values()
-        if self.__assign_cs == Assignation.AutoAssign:  # AutoAssign
-            # Get all the shading groups to reassign
-            to_reassign = {}
-            selection = pm.ls(materials=True)
-            for s in selection:
-                for shader in self.__cs_seleted_shaders:
-                    print(shader.get_title() , s.name())
-                    if shader.get_title() == s.name():
-                        shading_groups = s.listConnections(type="shadingEngine")
-                        for shading_group in shading_groups:
-                            if shading_group not in to_reassign:
-                                to_reassign[shading_group] = shader.get_title()
-                                break
-            no_items_to_assign = len(to_reassign) == 0
-            if not no_items_to_assign:
-                # Reassign the right to each shading group
-                for shading_group, shader_title in to_reassign.items():
-                    self.__delete_existing_shader(shading_group)
-
-                shading_nodes = {}
-                for shader in self.__cs_seleted_shaders:
-                    arnold_node, displacement_node = shader.generate_shading_nodes(shading_values)
-                    shading_nodes[shader.get_title()] = {arnold_node, displacement_node}
-
-                for shading_group, shader_title in to_reassign.items():
-                    arnold_node, displacement_node = shading_nodes[shader_title]
-                    arnold_node.outColor >> shading_group.surfaceShader
-                    if displacement_node is not None:
-                        displacement_node.displacement >> shading_group.displacementShader
-
-        elif self.__assign_cs == Assignation.AssignToSelection:  # AssignToSelection
-            selection = pm.ls(sl=True, transforms=True)
-            no_items_to_assign = len(selection) == 0
-            if not no_items_to_assign:
-                # Create a new shading group
-                shading_group = pm.sets(name="SG", empty=True, renderable=True, noSurfaceShader=True)
-                # Generate new shader and assign to shading group
-                for shader in self.__cs_seleted_shaders:
-                    arnold_node, displacement_node = shader.generate_shading_nodes(shading_values)
-                    arnold_node.outColor >> shading_group.surfaceShader
-                    if displacement_node is not None:
-                        displacement_node.displacement >> shading_group.displacementShader
-                # Assign the object in the shading group
-                for obj in selection:
-                    pm.sets(shading_group, forceElement=obj)
-        if self.__assign_cs == Assignation.NoAssign or no_items_to_assign:  # NoAssignation
-            dtx = 1
-            i = 0
-            # Generate new shader and assign each to an object
-            for shader in self.__cs_seleted_shaders:
-                obj = pm.sphere()[0]
-                obj.translate.set([dtx * i, 0, 0])
-
-                shading_group = pm.sets(name=shader.get_title() + "_sg", empty=True, renderable=True,
-                                     noSurfaceShader=True)
-                arnold_node, displacement_node = shader.generate_shading_nodes(shading_values)
-                arnold_node.outColor >> shading_group.surfaceShader
-                if displacement_node is not None:
-                    displacement_node.displacement >> shading_group.displacementShader
-                pm.sets(shading_group, forceElement=obj)
-                i += 1
-        pm.undoInfo(closeChunk=True)
-
-    def __delete_existing_shader(self, node):
-        """
-        Delete an existing shader recursively
-        :param node:
-        :return:
-        """
-        for s in node.inputs():
-            if not pm.objExists(s) or s.type() == "transform": continue
-            self.__delete_existing_shader(s)
-            try:
-                if "default" not in s.name():
-                    print("Existing shaders deleted : "+s.name())
-                    pm.delete(s)
-            except:
-                pass
+        with PROFILER.phase("cs_submit"):
+            self.__cs_shader_creator.create(self.__cs_seleted_shaders, self.__assign_cs,
+                                            self.__get_shading_values(), cmds.ls(sl=True, transforms=True) or [],
+                                            self.__get_cs_tx_converter(), self.__get_cs_deduplicator(),
+                                            self.__cs_reuse_file_nodes)
+        self.__refresh_status_bar()
 
     def __submit_update_shader(self):
         """
-        Update file path with model datas
+        Apply the update plan computed by the last refresh
         :return:
         """
-        pm.undoInfo(openChunk=True)
-        for directory, data in self.__us_data.items():
-            textures = data[0]
-            for texture in textures:
-                filepath = texture.getAttr("fileTextureName")
-                filename = os.path.basename(filepath)
+        plan = self.__get_us_update_plan()
+        updates = plan.get_updates()
+        # Nodes deleted since the refresh are ignored
+        existing_nodes = set(cmds.ls([node for node, _, _ in updates]) or []) if len(updates) > 0 else set()
+        cmds.undoInfo(openChunk=True)
+        try:
+            with PROFILER.phase("us_submit"):
+                nb_updated = 0
+                for node, filepath, new_file_path in updates:
+                    if node in existing_nodes:
+                        cmds.setAttr(node + ".fileTextureName", new_file_path, type="string")
+                        nb_updated += 1
+                PROFILER.count("textures_updated", nb_updated)
+                self.__generate_us_data(force=True)
+            self.__refresh_us_body()
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+    def __get_us_update_plan(self):
+        """
+        Get the update plan of the last refresh, the index is built now if it is not ready
+        :return: UpdatePlan
+        """
+        if self.__us_update_plan is None or self.__ui_tree_us_resolved_index is not self.__us_texture_index:
+            self.__get_us_texture_index(build=True)
+            self.__refresh_us_body()
+        return self.__us_update_plan
+
+    def __export_update_plan(self):
+        """
+        Export the update plan as a dry run report without modifying the scene
+        :return:
+        """
+        plan = self.__get_us_update_plan()
+        dirname = self.__us_folder_path if len(self.__us_folder_path) > 0 else ShaderMaker.__get_dir_name()
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Dry Run", os.path.join(dirname, "update_plan.json"), "JSON (*.json)")
+        if len(path) > 0:
+            plan.write_report(path)
+            print_warning("Update plan exported : " + path)
 
-                base = re.search("(.*)(?:<UDIM>|[0-9]{4})\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")", filename)
-                match = base.groups()[0]
-                regex = match.replace(".", "\.") + "((?:[0-9]{0,4})\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + "))"
+    def __audit_scene(self):
+        """
+        Audit all the textures of the scene against the update folder and export the report
+        :return:
+        """
+        if not os.path.isdir(self.__us_folder_path):
+            print_warning("Audit impossible, the update folder doesn't exist : " + self.__us_folder_path)
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Audit Scene", os.path.join(self.__us_folder_path, "texture_audit.csv"), "CSV (*.csv);;JSON (*.json)")
+        if len(path) == 0:
+            return
+        audit = TextureAudit.build(self.__get_us_texture_index(build=True),
+                                   {cmds.file(query=True, sceneName=True): ShadingGraph.get_scene_textures()})
+        audit.write_report(path)
+        counts = audit.get_counts()
+        print_warning("Texture audit exported : %s (%s)" % (path, ", ".join(
+            "%d %s" % (count, status.replace("_", " ")) for status, count in counts.items())))
+        self.__refresh_status_bar()
 
-                new_file_path = self.__us_find_file_in_directory(self.__us_folder_path, regex)
-                if new_file_path is not None and new_file_path != filepath:
-                    texture.fileTextureName.set(new_file_path)
-        self.__generate_us_data()
+    def __merge_duplicate_nodes(self):
+        """
+        Merge the duplicate file nodes and place2dTextures of the scene and refresh the textures listed
+        :return:
+        """
+        nb_place_textures, nb_file_nodes = FileNodeRegistry.merge_duplicates()
+        print_warning("Duplicate nodes merged : %d file nodes, %d place2dTextures" % (nb_file_nodes, nb_place_textures))
+        self.__generate_us_data(force=True)
+        self.__refresh_us_body()
+        self.__refresh_status_bar()
+
+    def __get_us_texture_index(self, build=False):
+        """
+        Get the index of the textures of the update folder (built once for each folder)
+        :param build: whether the index is built now if it is not ready
+        :return: texture index or None if not ready
+        """
+        if self.__us_texture_index is None or self.__us_texture_index.get_root() != self.__us_folder_path:
+            if not build:
+                return None
+            self.__cancel_us_index()
+            self.__us_texture_index = TextureIndex(self.__us_folder_path, FILE_EXTENSION_SUPPORTED)
+            self.__us_texture_index.build()
+        return self.__us_texture_index
+
+    @staticmethod
+    def __build_us_texture_index(folder_path, is_cancelled):
+        """
+        Build the index of the textures of a folder
+        :param folder_path
+        :param is_cancelled: function returning whether the build has to stop
+        :return: generator of the texture index
+        """
+        texture_index = TextureIndex(folder_path, FILE_EXTENSION_SUPPORTED)
+        texture_index.build(is_cancelled)
+        yield texture_index
+
+    def __cancel_us_index(self):
+        """
+        Cancel the running build of the index of the update part
+        :return:
+        """
+        if self.__us_index_worker is not None:
+            self.__us_index_worker.cancel()
+            self.__us_index_worker = None
+
+    def __start_us_index(self):
+        """
+        Build the index of the folder of the update part in background
+        :return:
+        """
+        self.__cancel_us_index()
+        if not os.path.isdir(self.__us_folder_path):
+            return
+        worker = ScanWorker(partial(ShaderMaker.__build_us_texture_index, self.__us_folder_path))
+        worker.item_found.connect(partial(self.__on_us_index_built, worker))
+        self.__us_index_worker = worker
+        worker.start()
+
+    def __on_us_index_built(self, worker, texture_index):
+        """
+        Refresh the update part when the index is built
+        :param worker: worker that built the index
+        :param texture_index
+        :return:
+        """
+        if worker is not self.__us_index_worker:
+            return
+        self.__us_index_worker = None
+        self.__us_texture_index = texture_index
         self.__refresh_us_body()
-        pm.undoInfo(closeChunk=True)
-
-    def __us_find_file_in_directory(self, directory, regex, depth=4):
-        """
-        Get the last version of a filepath
-        :param directory: base directory
-        :param regex: regex that the filename has to valid
-        :param depth: recursivity depth
-        :return: filepath
-        """
-        if depth > 0:
-            filename = None
-            if os.path.isdir(directory):
-                for f in os.listdir(directory):
-                    if os.path.isfile(directory+"/"+f):
-                        match = re.match(regex, f)
-                        if match is not None:
-                            filename = match.group()
-                            break
-            if filename is not None:
-                return directory + "/" + filename
-            else:
-                if os.path.exists(directory):
-                    for d in os.scandir(directory):
-                        if d.is_dir():
-                            filepath = self.__us_find_file_in_directory(d.path.replace('\\', '/'), regex, depth - 1)
-                            if filepath is not None:
-                                return filepath
-        return None
 
     def set_all_shaders_enabled(self, enabled):
         """
@@ -0,0 +1,311 @@
+from PySide2.QtCore import *
+from PySide2.QtGui import *
+from PySide2.QtWidgets import *
+
+########################################################################################################################
+
+# Fields displayed in the thumbnail column
+THUMBNAIL_FIELDS = ["base_color", "normal"]
+
+THUMBNAIL_MARGIN = 2
+
+########################################################################################################################
+
+
+class ShaderTableModel(QAbstractTableModel):
+    """
+    Model of the shaders of the creation part backed by the Shader and ShaderField objects
+    """
+    def __init__(self, fields, headers, parent=None, thumbnail_column=None, thumbnail_provider=None):
+        """
+        Constructor
+        :param fields: dict of column index to field keyword
+        :param headers: labels of the columns
+        :param parent
+        :param thumbnail_column: index of the column of the thumbnails or None
+        :param thumbnail_provider: ThumbnailProvider loading the thumbnails
+        """
+        super(ShaderTableModel, self).__init__(parent)
+        self.__fields = fields
+        self.__headers = headers
+        self.__shaders = []
+        self.__thumbnail_column = thumbnail_column
+        self.__thumbnail_provider = thumbnail_provider
+        # Texture path to the rows waiting for its thumbnail
+        self.__thumbnail_rows = {}
+        if thumbnail_provider is not None:
+            thumbnail_provider.thumbnail_ready.connect(self.__on_thumbnail_ready)
+
+    def set_shaders(self, shaders):
+        """
+        Setter of the shaders
+        :param shaders
+        :return:
+        """
+        self.beginResetModel()
+        self.__shaders = list(shaders)
+        self.__thumbnail_rows.clear()
+        if self.__thumbnail_provider is not None:
+            self.__thumbnail_provider.cancel()
+        self.endResetModel()
+
+    def append_shader(self, shader):
+        """
+        Append a shader at the end of the model
+        :param shader
+        :return:
+        """
+        row = len(self.__shaders)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.__shaders.append(shader)
+        self.endInsertRows()
+
+    def __get_row(self, shader):
+        """
+        Get the row of a shader
+        :param shader
+        :return: row or None
+        """
+        for row, row_shader in enumerate(self.__shaders):
+            if row_shader is shader:
+                return row
+        return None
+
+    def replace_shader(self, shader, new_shader):
+        """
+        Replace a shader by another one in the same row
+        :param shader
+        :param new_shader
+        :return:
+        """
+        row = self.__get_row(shader)
+        if row is None:
+            return
+        self.__shaders[row] = new_shader
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.__headers) - 1))
+
+    def remove_shader(self, shader):
+        """
+        Remove the row of a shader
+        :param shader
+        :return:
+        """
+        row = self.__get_row(shader)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.__shaders[row]
+        # The rows waiting for a thumbnail are shifted
+        for file_path, rows in self.__thumbnail_rows.items():
+            self.__thumbnail_rows[file_path] = set(r - 1 if r > row else r for r in rows if r != row)
+        self.endRemoveRows()
+
+    def get_shader(self, row):
+        """
+        Getter of the shader of a row
+        :param row
+        :return: shader
+        """
+        return self.__shaders[row]
+
+    def toggle_column(self, column):
+        """
+        Toggle the enabled state of the found fields of a column
+        :param column
+        :return:
+        """
+        if column not in self.__fields or len(self.__shaders) == 0:
+            return
+        keyword = self.__fields[column]
+        enabled = all(shader.get_field(keyword).is_enabled() for shader in self.__shaders)
+        for shader in self.__shaders:
+            field = shader.get_field(keyword)
+            if field.is_found():
+                field.set_enabled(not enabled)
+        self.dataChanged.emit(self.index(0, column), self.index(len(self.__shaders) - 1, column),
+                              [Qt.CheckStateRole])
+
+    @staticmethod
+    def __get_thumbnail_path(field):
+        """
+        Get the texture displayed in the thumbnail of a field (first tile of an UDIM texture)
+        :param field
+        :return: path or None
+        """
+        if not field.is_found():
+            return None
+        tiles = field.get_tiles()
+        if len(tiles) > 0:
+            return field.get_file_name().replace("<UDIM>", str(tiles[0]))
+        return field.get_file_name()
+
+    def __get_thumbnails(self, row):
+        """
+        Get the thumbnails of a row, the missing ones are asked to the provider
+        :param row
+        :return: list of QPixmap or None for each thumbnail field
+        """
+        shader = self.__shaders[row]
+        thumbnails = []
+        for keyword in THUMBNAIL_FIELDS:
+            file_path = ShaderTableModel.__get_thumbnail_path(shader.get_field(keyword))
+            pixmap = None
+            if file_path is not None:
+                pixmap = self.__thumbnail_provider.get_thumbnail(file_path)
+                if pixmap is None:
+                    self.__thumbnail_rows.setdefault(file_path, set()).add(row)
+            thumbnails.append(pixmap)
+        return thumbnails
+
+    def __on_thumbnail_ready(self, file_path):
+        """
+        Repaint the rows waiting for a thumbnail
+        :param file_path
+        :return:
+        """
+        for row in self.__thumbnail_rows.pop(file_path, []):
+            if row < len(self.__shaders):
+                index = self.index(row, self.__thumbnail_column)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.__shaders)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.__headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.__headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        shader = self.__shaders[index.row()]
+        column = index.column()
+        if column == 0:
+            if role == Qt.DisplayRole:
+                return " " + shader.get_title()
+            if role == Qt.UserRole:
+                return shader
+            return None
+        if column == self.__thumbnail_column:
+            if role == Qt.DecorationRole and self.__thumbnail_provider is not None:
+                return self.__get_thumbnails(index.row())
+            return None
+        field = shader.get_field(self.__fields[column])
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if field.is_found() and field.is_enabled() else Qt.Unchecked
+        if role == Qt.ToolTipRole and field.is_found():
+            tiles = field.get_tiles()
+            if len(tiles) > 0:
+                return "%s\n%d UDIM tiles (%d-%d)" % (field.get_file_name(), len(tiles), tiles[0], tiles[-1])
+            return field.get_file_name()
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() not in self.__fields or role != Qt.CheckStateRole:
+            return False
+        field = self.__shaders[index.row()].get_field(self.__fields[index.column()])
+        if not field.is_found():
+            return False
+        field.set_enabled(value == Qt.Checked)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() in self.__fields and self.__shaders[index.row()].get_field(self.__fields[index.column()]).is_found():
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+
+class CheckBoxDelegate(QStyledItemDelegate):
+    """
+    Delegate painting a centered checkbox from the check state of the model
+    """
+    @staticmethod
+    def __get_style(option):
+        """
+        Get the style to paint with
+        :param option
+        :return: style
+        """
+        return option.widget.style() if option.widget is not None else QApplication.style()
+
+    @staticmethod
+    def __get_check_rect(option):
+        """
+        Get the rect of the checkbox centered in the cell
+        :param option
+        :return: rect
+        """
+        style = CheckBoxDelegate.__get_style(option)
+        indicator_rect = style.subElementRect(QStyle.SE_CheckBoxIndicator, QStyleOptionButton(), option.widget)
+        return QStyle.alignedRect(option.direction, Qt.AlignCenter, indicator_rect.size(), option.rect)
+
+    def paint(self, painter, option, index):
+        item_option = QStyleOptionViewItem(option)
+        self.initStyleOption(item_option, index)
+        style = CheckBoxDelegate.__get_style(option)
+        # Draw the background of the cell without the default check indicator
+        item_option.features = item_option.features & ~QStyleOptionViewItem.HasCheckIndicator
+        style.drawControl(QStyle.CE_ItemViewItem, item_option, painter, option.widget)
+
+        check_option = QStyleOptionButton()
+        check_option.rect = CheckBoxDelegate.__get_check_rect(option)
+        check_option.state = QStyle.State_On if index.data(Qt.CheckStateRole) == Qt.Checked else QStyle.State_Off
+        if index.flags() & Qt.ItemIsUserCheckable:
+            check_option.state |= QStyle.State_Enabled
+        style.drawControl(QStyle.CE_CheckBox, check_option, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not index.flags() & Qt.ItemIsUserCheckable:
+            return False
+        if event.type() in [QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick]:
+            if event.button() != Qt.LeftButton or not CheckBoxDelegate.__get_check_rect(option).contains(event.pos()):
+                return False
+            if event.type() == QEvent.MouseButtonDblClick:
+                return True
+        elif event.type() == QEvent.KeyPress:
+            if event.key() not in [Qt.Key_Space, Qt.Key_Select]:
+                return False
+        else:
+            return False
+        state = Qt.Unchecked if index.data(Qt.CheckStateRole) == Qt.Checked else Qt.Checked
+        return model.setData(index, state, Qt.CheckStateRole)
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """
+    Delegate painting the thumbnails of a row side by side
+    """
+    def paint(self, painter, option, index):
+        item_option = QStyleOptionViewItem(option)
+        self.initStyleOption(item_option, index)
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        # Draw the background of the cell without the default decoration
+        item_option.features = item_option.features & ~QStyleOptionViewItem.HasDecoration
+        style.drawControl(QStyle.CE_ItemViewItem, item_option, painter, option.widget)
+
+        thumbnails = index.data(Qt.DecorationRole) or []
+        size = option.rect.height() - 2 * THUMBNAIL_MARGIN
+        if size <= 0:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        x = option.rect.x() + THUMBNAIL_MARGIN
+        for pixmap in thumbnails:
+            cell = QRect(x, option.rect.y() + THUMBNAIL_MARGIN, size, size)
+            if pixmap is not None:
+                scaled_size = pixmap.size().scaled(cell.size(), Qt.KeepAspectRatio)
+                painter.drawPixmap(QStyle.alignedRect(option.direction, Qt.AlignCenter, scaled_size, cell), pixmap)
+            x += size + THUMBNAIL_MARGIN
+        painter.restore()
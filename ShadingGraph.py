@@ -0,0 +1,252 @@
+import maya.cmds as cmds
+
+from .core.Profiler import PROFILER
+
+########################################################################################################################
+
+# Attribute of the texture path of each texture node type
+TEXTURE_PATH_ATTRIBUTES = {
+    "file": "fileTextureName",
+    "aiImage": "filename"
+}
+
+
+########################################################################################################################
+
+
+class ShadingGraph:
+    """
+    Queries on the shading networks of the scene. The connections are memoized so a node shared by many shading
+    groups is queried once, the nodes whose connections changed have to be forgotten
+    """
+    def __init__(self, texture_type="file"):
+        """
+        Constructor
+        :param texture_type: node type of the textures
+        """
+        self.__texture_type = texture_type
+        self.__sources = {}
+        self.__textures = {}
+        # Node to the nodes traversed to find its textures
+        self.__networks = {}
+        self.__shading_types = {}
+
+    def __get_sources(self, node):
+        """
+        Get the nodes connected as source of a node without the dag objects
+        :param node
+        :return: list of source and whether it is a texture
+        """
+        if node not in self.__sources:
+            PROFILER.count("graph_queries")
+            connections = cmds.listConnections(node, source=True, destination=False) or []
+            sources = []
+            if len(connections) > 0:
+                dag_objects = set(cmds.ls(connections, dagObjects=True) or [])
+                textures = set(cmds.ls(connections, type=self.__texture_type) or [])
+                for connection in connections:
+                    if connection not in dag_objects:
+                        sources.append((connection, connection in textures))
+            self.__sources[node] = sources
+        return self.__sources[node]
+
+    def get_textures(self, node):
+        """
+        Get the textures upstream of a node with an iterative traversal that visits each node once
+        :param node
+        :return: texture names
+        """
+        if node in self.__textures:
+            return self.__textures[node]
+        textures = []
+        network = set()
+        visited = {node}
+        stack = [(node, False)]
+        while len(stack) > 0:
+            current, is_texture = stack.pop()
+            if is_texture:
+                textures.append(current)
+                continue
+            network.add(current)
+            # Reversed to visit the sources in the order of the connections
+            for source, source_is_texture in reversed(self.__get_sources(current)):
+                if source not in visited:
+                    visited.add(source)
+                    stack.append((source, source_is_texture))
+        self.__textures[node] = textures
+        self.__networks[node] = network
+        return textures
+
+    def get_network(self, node):
+        """
+        Get the nodes traversed to find the textures upstream of a node, the node included and the textures excluded
+        :param node
+        :return: set of node names
+        """
+        self.get_textures(node)
+        return self.__networks[node]
+
+    def forget(self, nodes):
+        """
+        Forget the memoized sources of nodes and the textures of the networks containing them
+        :param nodes: nodes whose connections changed
+        :return: nodes whose textures are forgotten
+        """
+        nodes = set(nodes)
+        for node in nodes:
+            self.__sources.pop(node, None)
+        forgotten = [node for node, network in self.__networks.items() if not network.isdisjoint(nodes)]
+        for node in forgotten:
+            del self.__networks[node]
+            del self.__textures[node]
+        return forgotten
+
+    @staticmethod
+    def get_scene_textures():
+        """
+        Get all the texture nodes of the scene with a single query of the nodes (aiImage only if Arnold is loaded)
+        :return: list of node, node type and texture path
+        """
+        node_types = set(cmds.ls(nodeTypes=True) or [])
+        texture_types = [node_type for node_type in TEXTURE_PATH_ATTRIBUTES if node_type in node_types]
+        nodes_and_types = cmds.ls(type=texture_types, showType=True) or []
+        textures = []
+        # Names and types are alternated
+        for i in range(0, len(nodes_and_types) - 1, 2):
+            node, node_type = nodes_and_types[i], nodes_and_types[i + 1]
+            file_path = cmds.getAttr(node + "." + TEXTURE_PATH_ATTRIBUTES[node_type])
+            if file_path:
+                textures.append((node, node_type, file_path))
+        return textures
+
+    def __fetch_sources(self, nodes):
+        """
+        Memoize the sources of nodes with a single query for all the nodes not queried yet
+        :param nodes
+        :return:
+        """
+        nodes = [node for node in nodes if node not in self.__sources]
+        if len(nodes) == 0:
+            return
+        PROFILER.count("graph_queries")
+        connections = cmds.listConnections(nodes, source=True, destination=False, connections=True) or []
+        # Connections are pairs of plug of the node and source node
+        pairs = [(connections[i].split(".")[0], connections[i + 1]) for i in range(0, len(connections) - 1, 2)]
+        found = list({source for _, source in pairs})
+        dag_objects = set()
+        textures = set()
+        if len(found) > 0:
+            dag_objects.update(cmds.ls(found, dagObjects=True) or [])
+            textures.update(cmds.ls(found, type=self.__texture_type) or [])
+        sources = {node: [] for node in nodes}
+        for node, source in pairs:
+            if node in sources and source not in dag_objects:
+                sources[node].append((source, source in textures))
+        self.__sources.update(sources)
+
+    def get_textures_by_shading_group(self, shading_groups):
+        """
+        Get the textures of each shading group. The networks are queried level by level with one query for each
+        depth for all the shading groups, the nodes already queried are not queried again
+        :param shading_groups
+        :return: dict of shading group to texture names
+        """
+        visited = set(shading_groups)
+        level = list(shading_groups)
+        while len(level) > 0:
+            self.__fetch_sources(level)
+            next_level = []
+            for node in level:
+                for source, is_texture in self.__sources[node]:
+                    if not is_texture and source not in visited:
+                        visited.add(source)
+                        next_level.append(source)
+            level = next_level
+        return {shading_group: self.get_textures(shading_group) for shading_group in shading_groups}
+
+    def __is_shading_type(self, node_type):
+        """
+        Whether a node type is a rendering node (shader, texture or utility)
+        :param node_type
+        :return: boolean
+        """
+        if node_type not in self.__shading_types:
+            classifications = cmds.getClassification(node_type) or []
+            self.__shading_types[node_type] = any(classifications)
+        return self.__shading_types[node_type]
+
+    def __get_upstream_nodes(self, shading_groups):
+        """
+        Get the nodes upstream of shading groups with a query for each depth of the networks. Dag objects, default
+        and referenced nodes are neither included nor traversed
+        :param shading_groups
+        :return: list of upstream nodes and dict of node to its upstream sources
+        """
+        upstream_nodes = []
+        upstream_nodes_set = set()
+        sources = {}
+        visited = set(shading_groups)
+        level = list(shading_groups)
+        while len(level) > 0:
+            PROFILER.count("graph_queries")
+            connections = cmds.listConnections(level, source=True, destination=False, connections=True) or []
+            # Connections are pairs of plug of the node and source node
+            pairs = [(connections[i].split(".")[0], connections[i + 1]) for i in range(0, len(connections) - 1, 2)]
+            found = []
+            for _, source in pairs:
+                if source not in visited:
+                    visited.add(source)
+                    found.append(source)
+            excluded = set()
+            if len(found) > 0:
+                excluded.update(cmds.ls(found, dagObjects=True) or [])
+                excluded.update(cmds.ls(found, defaultNodes=True) or [])
+                excluded.update(cmds.ls(found, referencedNodes=True) or [])
+                excluded.update(node for node in found if "default" in node)
+            level = [node for node in found if node not in excluded]
+            upstream_nodes.extend(level)
+            upstream_nodes_set.update(level)
+            for node, source in pairs:
+                if source in upstream_nodes_set:
+                    sources.setdefault(node, set()).add(source)
+        return upstream_nodes, sources
+
+    def get_exclusive_nodes(self, shading_groups):
+        """
+        Get the nodes upstream of shading groups that no other shading network uses. A node is used by another
+        network when it is connected to another shading group or rendering node, the nodes upstream of it are then
+        used too
+        :param shading_groups
+        :return: node names
+        """
+        if len(shading_groups) == 0:
+            return []
+        upstream_nodes, sources = self.__get_upstream_nodes(shading_groups)
+        if len(upstream_nodes) == 0:
+            return []
+        networks_nodes = set(upstream_nodes)
+        networks_nodes.update(shading_groups)
+        connections = cmds.listConnections(upstream_nodes, source=False, destination=True, connections=True) or []
+        pairs = [(connections[i].split(".")[0], connections[i + 1]) for i in range(0, len(connections) - 1, 2)]
+        destinations = list({destination for _, destination in pairs if destination not in networks_nodes})
+        types = {}
+        if len(destinations) > 0:
+            # Names and types alternate
+            names_and_types = cmds.ls(destinations, showType=True) or []
+            types = dict(zip(names_and_types[0::2], names_and_types[1::2]))
+        used_nodes = set()
+        stack = []
+        for node, destination in pairs:
+            if destination in networks_nodes or destination not in types:
+                continue
+            node_type = types[destination]
+            if node_type == "shadingEngine" or self.__is_shading_type(node_type):
+                stack.append(node)
+        # The sources of a used node are used too
+        while len(stack) > 0:
+            node = stack.pop()
+            if node in used_nodes:
+                continue
+            used_nodes.add(node)
+            stack.extend(sources.get(node, []))
+        return [node for node in upstream_nodes if node not in used_nodes]
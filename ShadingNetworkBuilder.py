@@ -0,0 +1,217 @@
+import maya.cmds as cmds
+
+from .core.Profiler import PROFILER
+
+########################################################################################################################
+
+# Attributes set on the file nodes created (UDIM tiling)
+FILE_NODE_SETTINGS = {
+    "uvTilingMode": 3
+}
+
+
+########################################################################################################################
+
+
+class ShadingNetworkBuilder:
+    """
+    Record the nodes, attributes and connections of many shading networks and build them all in one pass
+    with maya.cmds. Nodes to create are referenced by the handles returned by the builder, existing nodes by their
+    name. An MDGModifier would not be on the undo queue of Maya without a command plugin, the commands keep the
+    build undoable in one chunk and register the nodes in the default render lists
+    """
+    def __init__(self, file_node_registry=None, file_names=None):
+        """
+        Constructor
+        :param file_node_registry: FileNodeRegistry to reuse the file nodes of a texture or None to create them all
+        :param file_names: dict of texture path to the path the file nodes point at instead (.tx, shared texture)
+        """
+        self.__file_node_registry = file_node_registry
+        self.__file_names = file_names if file_names is not None else {}
+        self.__nodes = []
+        self.__shading_groups = []
+        self.__attributes = []
+        self.__connections = []
+        self.__assignments = []
+        self.__spheres = []
+        self.__names = {}
+        self.__created_nodes = []
+
+    def create_node(self, node_type, name, category):
+        """
+        Record a shading node to create
+        :param node_type
+        :param name
+        :param category: asShader, asTexture or asUtility
+        :return: handle of the node
+        """
+        handle = self.__get_next_handle()
+        self.__nodes.append((handle, node_type, name, category))
+        return handle
+
+    def create_shading_group(self, name):
+        """
+        Record a shading group to create
+        :param name
+        :return: handle of the shading group
+        """
+        handle = self.__get_next_handle()
+        self.__shading_groups.append((handle, name))
+        return handle
+
+    def create_sphere(self, translate):
+        """
+        Record a NURBS sphere to create to display a shader
+        :param translate: position of the sphere
+        :return: handle of the sphere
+        """
+        handle = self.__get_next_handle()
+        self.__spheres.append((handle, translate))
+        return handle
+
+    def __get_next_handle(self):
+        """
+        Get the handle of the next node recorded
+        :return: handle
+        """
+        return len(self.__nodes) + len(self.__shading_groups) + len(self.__spheres)
+
+    def create_place_texture(self):
+        """
+        Record a place2dTexture to create for a shader, the file nodes share one with a registry
+        :return: handle or name of the place2dTexture
+        """
+        if self.__file_node_registry is not None:
+            return self.__file_node_registry.get_place_texture(self)
+        return self.create_node("place2dTexture", "place2dTexture", "asUtility")
+
+    def create_file_node(self, name, file_name, place_texture):
+        """
+        Record a file node to create for a texture or get the one of the registry
+        :param name
+        :param file_name: texture path
+        :param place_texture: handle or name of the place2dTexture of the shader
+        :return: handle or name of the file node
+        """
+        file_name = self.__file_names.get(file_name, file_name)
+        if self.__file_node_registry is not None:
+            file_node = self.__file_node_registry.get_file_node(file_name, FILE_NODE_SETTINGS)
+            if file_node is not None:
+                return file_node
+        file_node = self.create_node("file", name, "asTexture")
+        self.set_attr(file_node, "fileTextureName", file_name)
+        for attribute, value in FILE_NODE_SETTINGS.items():
+            self.set_attr(file_node, attribute, value)
+        self.connect(place_texture, "outUV", file_node, "uvCoord")
+        if self.__file_node_registry is not None:
+            self.__file_node_registry.add_file_node(file_name, FILE_NODE_SETTINGS, file_node)
+        return file_node
+
+    def set_attr(self, node, attribute, value):
+        """
+        Record an attribute to set
+        :param node: handle or name of the node
+        :param attribute
+        :param value
+        :return:
+        """
+        self.__attributes.append((node, attribute, value))
+
+    def connect(self, source, source_attribute, destination, destination_attribute):
+        """
+        Record a connection (forced as PyMEL >> does)
+        :param source: handle or name of the source node
+        :param source_attribute
+        :param destination: handle or name of the destination node
+        :param destination_attribute
+        :return:
+        """
+        self.__connections.append((source, source_attribute, destination, destination_attribute))
+
+    def assign(self, shading_group, objects):
+        """
+        Record objects to assign to a shading group
+        :param shading_group: handle or name of the shading group
+        :param objects: handles or names of the objects
+        :return:
+        """
+        self.__assignments.append((shading_group, list(objects)))
+
+    def get_name(self, node):
+        """
+        Get the name of a node once built
+        :param node: handle or name of the node
+        :return: name
+        """
+        if isinstance(node, int):
+            return self.__names[node]
+        return node
+
+    def get_created_nodes(self):
+        """
+        Getter of the nodes created by the build
+        :return: node names
+        """
+        return list(self.__created_nodes)
+
+    def do_it(self):
+        """
+        Build all the recorded networks in a single undo chunk, the nodes created are deleted if the build fails
+        :return:
+        """
+        cmds.undoInfo(openChunk=True)
+        try:
+            with PROFILER.phase("node_creation"):
+                try:
+                    self.__build()
+                except Exception:
+                    # No half built network is left in the scene
+                    self.__delete_created_nodes()
+                    raise
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        PROFILER.count("nodes_created", len(self.__nodes) + len(self.__shading_groups))
+
+    def __build(self):
+        """
+        Create the nodes, set the attributes and make the connections and the assignments
+        :return:
+        """
+        for handle, node_type, name, category in self.__nodes:
+            kwargs = {category: True, "name": name}
+            node = cmds.shadingNode(node_type, **kwargs)
+            self.__names[handle] = node
+            self.__created_nodes.append(node)
+        for handle, name in self.__shading_groups:
+            shading_group = cmds.sets(name=name, empty=True, renderable=True, noSurfaceShader=True)
+            self.__names[handle] = shading_group
+            self.__created_nodes.append(shading_group)
+        for handle, translate in self.__spheres:
+            # Transform and construction history of the sphere
+            sphere = cmds.sphere()
+            self.__names[handle] = sphere[0]
+            self.__created_nodes.extend(sphere)
+            cmds.setAttr(sphere[0] + ".translate", *translate)
+        for node, attribute, value in self.__attributes:
+            plug = self.get_name(node) + "." + attribute
+            if isinstance(value, str):
+                cmds.setAttr(plug, value, type="string")
+            else:
+                cmds.setAttr(plug, value)
+        for source, source_attribute, destination, destination_attribute in self.__connections:
+            cmds.connectAttr(self.get_name(source) + "." + source_attribute,
+                             self.get_name(destination) + "." + destination_attribute, force=True)
+        for shading_group, objects in self.__assignments:
+            if len(objects) > 0:
+                cmds.sets([self.get_name(obj) for obj in objects], edit=True, forceElement=self.get_name(shading_group))
+
+    def __delete_created_nodes(self):
+        """
+        Delete the nodes created by the build, the objects assigned to a shading group created stay unassigned
+        :return:
+        """
+        existing_nodes = [node for node in self.__created_nodes if cmds.objExists(node)]
+        if len(existing_nodes) > 0:
+            cmds.delete(existing_nodes)
+        self.__created_nodes = []
+        self.__names.clear()
@@ -0,0 +1,254 @@
+import os
+
+from PySide2.QtCore import *
+
+
+class _DirectoryNode:
+    """
+    A directory of textures in the tree
+    """
+    def __init__(self, node_id, key, label, file_paths):
+        """
+        Constructor
+        :param node_id: unique id of the node, used as internal id of the indexes of its textures
+        :param key: directory
+        :param label: text displayed
+        :param file_paths: texture paths of the directory
+        """
+        self.node_id = node_id
+        self.key = key
+        self.label = label
+        self.file_paths = file_paths
+        self.nb_fetched = 0
+        self.row = 0
+
+
+class TextureTreeModel(QAbstractItemModel):
+    """
+    Lazy model of the textures of the update part, the textures of a directory are added and their new version
+    resolved only when they are displayed
+    """
+    def __init__(self, parent=None):
+        """
+        Constructor
+        :param parent
+        """
+        super(TextureTreeModel, self).__init__(parent)
+        self.__directories = []
+        # Internal id of the indexes : 0 for the directories, id of the directory for the textures
+        self.__nodes_by_id = {}
+        self.__next_node_id = 1
+        self.__resolver = None
+        self.__new_file_paths = {}
+
+    def set_resolver(self, resolver):
+        """
+        Setter of the function that gives the new version of a texture (or None if not found)
+        :param resolver
+        :return:
+        """
+        self.__resolver = resolver
+        self.__new_file_paths.clear()
+        for node in self.__directories:
+            if node.nb_fetched > 0:
+                parent = self.index(node.row, 0)
+                self.dataChanged.emit(self.index(0, 0, parent), self.index(node.nb_fetched - 1, 0, parent))
+
+    def get_new_file_path(self, file_path):
+        """
+        Get the new version of a texture
+        :param file_path
+        :return: new file path or None
+        """
+        if self.__resolver is None:
+            return None
+        if file_path not in self.__new_file_paths:
+            self.__new_file_paths[file_path] = self.__resolver(file_path)
+        return self.__new_file_paths[file_path]
+
+    def has_update(self, file_path):
+        """
+        Whether a new version of the texture is found
+        :param file_path
+        :return: boolean
+        """
+        new_file_path = self.get_new_file_path(file_path)
+        return new_file_path is not None and new_file_path != file_path
+
+    def set_directories(self, directories):
+        """
+        Update the model with only the differences with the current directories
+        :param directories: list of directory, label and texture paths
+        :return:
+        """
+        new_keys = {key for key, _, _ in directories}
+        # Remove the directories that are not displayed anymore
+        for row in reversed(range(len(self.__directories))):
+            if self.__directories[row].key not in new_keys:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.__nodes_by_id[self.__directories[row].node_id]
+                del self.__directories[row]
+                self.__update_rows()
+                self.endRemoveRows()
+
+        for row, (key, label, file_paths) in enumerate(directories):
+            current_row = self.__find_row(key, row)
+            if current_row is None:
+                self.beginInsertRows(QModelIndex(), row, row)
+                node = _DirectoryNode(self.__next_node_id, key, label, list(file_paths))
+                self.__next_node_id += 1
+                self.__nodes_by_id[node.node_id] = node
+                self.__directories.insert(row, node)
+                self.__update_rows()
+                self.endInsertRows()
+                continue
+            if current_row != row:
+                self.beginMoveRows(QModelIndex(), current_row, current_row, QModelIndex(), row)
+                self.__directories.insert(row, self.__directories.pop(current_row))
+                self.__update_rows()
+                self.endMoveRows()
+            node = self.__directories[row]
+            if node.label != label:
+                node.label = label
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index)
+            self.__set_file_paths(node, file_paths)
+
+    def __find_row(self, key, start):
+        """
+        Find the row of a directory
+        :param key: directory
+        :param start: first row to look at
+        :return: row or None
+        """
+        for row in range(start, len(self.__directories)):
+            if self.__directories[row].key == key:
+                return row
+        return None
+
+    def __update_rows(self):
+        """
+        Store the row of each directory
+        :return:
+        """
+        for row, node in enumerate(self.__directories):
+            node.row = row
+
+    def __set_file_paths(self, node, file_paths):
+        """
+        Update the textures of a directory with only the differences
+        :param node
+        :param file_paths
+        :return:
+        """
+        if node.file_paths == file_paths:
+            return
+        # Textures of a directory are either not fetched or all fetched
+        if node.nb_fetched == 0:
+            node.file_paths = list(file_paths)
+            return
+        parent = self.index(node.row, 0)
+        new_file_paths = set(file_paths)
+        for row in reversed(range(len(node.file_paths))):
+            if node.file_paths[row] not in new_file_paths:
+                self.beginRemoveRows(parent, row, row)
+                del node.file_paths[row]
+                node.nb_fetched = len(node.file_paths)
+                self.endRemoveRows()
+        current_file_paths = set(node.file_paths)
+        for row, file_path in enumerate(file_paths):
+            if row < len(node.file_paths) and node.file_paths[row] == file_path:
+                continue
+            if file_path in current_file_paths:
+                current_row = node.file_paths.index(file_path, row)
+                self.beginMoveRows(parent, current_row, current_row, parent, row)
+                node.file_paths.insert(row, node.file_paths.pop(current_row))
+                self.endMoveRows()
+            else:
+                self.beginInsertRows(parent, row, row)
+                node.file_paths.insert(row, file_path)
+                node.nb_fetched = len(node.file_paths)
+                self.endInsertRows()
+
+    def __get_parent_node(self, index):
+        """
+        Get the directory of a texture index
+        :param index
+        :return: node or None if the index is a directory
+        """
+        return self.__nodes_by_id.get(index.internalId())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, self.__directories[parent.row()].node_id)
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = self.__get_parent_node(index)
+        if node is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.__directories)
+        if self.__get_parent_node(parent) is None:
+            return self.__directories[parent.row()].nb_fetched
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.__directories) > 0
+        if self.__get_parent_node(parent) is None:
+            return len(self.__directories[parent.row()].file_paths) > 0
+        return False
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or self.__get_parent_node(parent) is not None:
+            return False
+        node = self.__directories[parent.row()]
+        return node.nb_fetched < len(node.file_paths)
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        node = self.__directories[parent.row()]
+        self.beginInsertRows(parent, node.nb_fetched, len(node.file_paths) - 1)
+        node.nb_fetched = len(node.file_paths)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = self.__get_parent_node(index)
+        if node is None:
+            if role == Qt.DisplayRole:
+                return self.__directories[index.row()].label
+            return None
+        file_path = node.file_paths[index.row()]
+        if role == Qt.DisplayRole:
+            return os.path.basename(file_path)
+        if role == Qt.ToolTipRole:
+            new_file_path = self.get_new_file_path(file_path)
+            return new_file_path if new_file_path is not None else file_path
+        if role == Qt.UserRole:
+            return file_path
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        node = self.__get_parent_node(index)
+        if node is None:
+            return Qt.ItemIsEnabled
+        # Files without new version are displayed disabled
+        if self.has_update(node.file_paths[index.row()]):
+            return Qt.ItemIsEnabled
+        return Qt.NoItemFlags
@@ -0,0 +1,206 @@
+from collections import OrderedDict
+
+from PySide2.QtCore import QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, QSize, Qt, Signal
+from PySide2.QtGui import QImage, QImageReader, QPixmap
+
+from .core.ThumbnailCache import ThumbnailCache
+from .core.Profiler import PROFILER
+
+########################################################################################################################
+
+# Number of thumbnails decoded at the same time
+DEFAULT_THUMBNAIL_THREADS = 4
+
+# Number of thumbnails kept in memory
+DEFAULT_MAX_PIXMAPS = 1000
+
+# Thumbnail that could not be decoded
+_FAILED = object()
+
+
+########################################################################################################################
+
+
+def _get_scaled_size(width, height, size):
+    """
+    Get the size of a thumbnail keeping the aspect ratio of the image
+    :param width
+    :param height
+    :param size: size of the longest side
+    :return: width and height
+    """
+    if width >= height:
+        return size, max(1, round(height * size / width))
+    return max(1, round(width * size / height)), size
+
+
+def _read_with_qt(file_path, size):
+    """
+    Read a downsampled image with the image formats of Qt (JPEG images are decoded directly at the reduced size)
+    :param file_path
+    :param size: size of the longest side
+    :return: QImage or None
+    """
+    reader = QImageReader(file_path)
+    if not reader.canRead():
+        return None
+    image_size = reader.size()
+    if image_size.isValid():
+        reader.setScaledSize(QSize(*_get_scaled_size(image_size.width(), image_size.height(), size)))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if max(image.width(), image.height()) > size:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+def _read_with_oiio(file_path, size):
+    """
+    Read a downsampled image with OpenImageIO for the formats unknown by Qt (exr, tx), if it is available
+    :param file_path
+    :param size: size of the longest side
+    :return: QImage or None
+    """
+    try:
+        import OpenImageIO as oiio
+    except ImportError:
+        return None
+    try:
+        source = oiio.ImageBuf(file_path)
+        spec = source.spec()
+        if spec.width <= 0 or spec.height <= 0:
+            return None
+        nb_channels = 3 if spec.nchannels >= 3 else 1
+        width, height = _get_scaled_size(spec.width, spec.height, size)
+        thumbnail = oiio.ImageBufAlgo.resize(source, roi=oiio.ROI(0, width, 0, height, 0, 1, 0, nb_channels))
+        if spec.format.basetype in [oiio.HALF, oiio.FLOAT, oiio.DOUBLE]:
+            thumbnail = oiio.ImageBufAlgo.colorconvert(thumbnail, "linear", "sRGB")
+        pixels = thumbnail.get_pixels(oiio.UINT8).tobytes()
+    except Exception:
+        return None
+    image_format = QImage.Format_RGB888 if nb_channels == 3 else QImage.Format_Grayscale8
+    # The pixels are copied as the buffer is released with the bytes
+    return QImage(pixels, width, height, width * nb_channels, image_format).copy()
+
+
+class _ThumbnailJob(QRunnable):
+    """
+    Load a thumbnail from the cache or decode it in a thread of the pool
+    """
+    def __init__(self, provider, cache, file_path):
+        """
+        Constructor
+        :param provider: ThumbnailProvider notified of the thumbnail
+        :param cache: ThumbnailCache
+        :param file_path: path of the texture
+        """
+        super(_ThumbnailJob, self).__init__()
+        self.__provider = provider
+        self.__cache = cache
+        self.__file_path = file_path
+
+    def __decode(self):
+        """
+        Decode the texture downsampled and store its thumbnail in the cache
+        :return: QImage or None
+        """
+        key = self.__cache.get_key(self.__file_path)
+        if key is None:
+            return None
+        data = self.__cache.get(key)
+        if data is not None:
+            image = QImage()
+            if image.loadFromData(QByteArray(data), "PNG"):
+                return image
+        size = self.__cache.get_size()
+        image = _read_with_qt(self.__file_path, size)
+        if image is None:
+            image = _read_with_oiio(self.__file_path, size)
+        if image is None:
+            return None
+        PROFILER.count("thumbnails_decoded")
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        self.__cache.set(key, bytes(buffer.data()))
+        return image
+
+    def run(self):
+        """
+        Run the job in a thread of the pool
+        :return:
+        """
+        image = self.__decode()
+        try:
+            self.__provider.image_loaded.emit(self.__file_path, image)
+        except RuntimeError:
+            # The provider has been deleted with the window
+            pass
+
+
+class ThumbnailProvider(QObject):
+    """
+    Thumbnails of textures loaded on a thread pool, the textures are never decoded in the main thread. The last
+    thumbnails asked are loaded first so the visible rows come before the rows scrolled past
+    """
+    # Sent from the threads of the pool with the texture path and the QImage (None if it could not be decoded)
+    image_loaded = Signal(str, object)
+    thumbnail_ready = Signal(str)
+
+    def __init__(self, parent=None, cache=None, nb_threads=DEFAULT_THUMBNAIL_THREADS, max_pixmaps=DEFAULT_MAX_PIXMAPS):
+        """
+        Constructor
+        :param parent
+        :param cache: ThumbnailCache
+        :param nb_threads: number of thumbnails decoded at the same time
+        :param max_pixmaps: number of thumbnails kept in memory
+        """
+        super(ThumbnailProvider, self).__init__(parent)
+        self.__cache = cache if cache is not None else ThumbnailCache()
+        self.__pool = QThreadPool()
+        self.__pool.setMaxThreadCount(nb_threads)
+        self.__max_pixmaps = max_pixmaps
+        self.__pixmaps = OrderedDict()
+        self.__pending = set()
+        self.__priority = 0
+        self.image_loaded.connect(self.__on_image_loaded)
+
+    def get_thumbnail(self, file_path):
+        """
+        Get the thumbnail of a texture, it is loaded in background if it is not in memory
+        :param file_path
+        :return: QPixmap or None if not loaded yet or not decodable
+        """
+        pixmap = self.__pixmaps.get(file_path)
+        if pixmap is not None:
+            self.__pixmaps.move_to_end(file_path)
+            return pixmap if pixmap is not _FAILED else None
+        if file_path not in self.__pending:
+            self.__pending.add(file_path)
+            self.__priority += 1
+            self.__pool.start(_ThumbnailJob(self, self.__cache, file_path), self.__priority)
+        return None
+
+    def cancel(self):
+        """
+        Forget the thumbnails asked and not started
+        :return:
+        """
+        self.__pool.clear()
+        self.__pending.clear()
+
+    def __on_image_loaded(self, file_path, image):
+        """
+        Keep a thumbnail loaded in memory and notify it
+        :param file_path
+        :param image: QImage or None
+        :return:
+        """
+        if file_path not in self.__pending:
+            return
+        self.__pending.discard(file_path)
+        self.__pixmaps[file_path] = QPixmap.fromImage(image) if image is not None else _FAILED
+        while len(self.__pixmaps) > self.__max_pixmaps:
+            self.__pixmaps.popitem(last=False)
+        self.thumbnail_ready.emit(file_path)
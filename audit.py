@@ -0,0 +1,62 @@
+"""
+Audit all the textures of Maya scenes against a folder of new versions without the interface, under mayapy :
+
+    mayapy -m shader_maker.audit <update folder> <scene.ma> [<scene.ma> ...] -o <report.csv|report.json>
+
+The folder is indexed once for all the scenes. Each texture is reported as outdated, missing, up to date or
+unresolved, with the scene it comes from.
+"""
+import argparse
+import sys
+
+
+def _parse_args(args):
+    """
+    Parse the command line
+    :param args
+    :return: namespace of the arguments
+    """
+    from .core.TextureIndex import DEFAULT_DEPTH
+    parser = argparse.ArgumentParser(prog="mayapy -m shader_maker.audit",
+                                     description="Audit the textures of Maya scenes against a folder of new versions")
+    parser.add_argument("root", help="folder of the new versions of the textures")
+    parser.add_argument("scenes", nargs="+", help="scenes to audit")
+    parser.add_argument("-o", "--output", required=True, help="report written as CSV (.csv) or else as JSON")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="recursivity depth of the folder")
+    parser.add_argument("--workers", type=int, default=None, help="number of files checked at the same time")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """
+    Entry point of the audit
+    :param args: command line arguments
+    :return: exit code
+    """
+    options = _parse_args(sys.argv[1:] if args is None else list(args))
+    from .batch import _initialize_maya
+    from .core.Shader import FILE_EXTENSION_SUPPORTED
+    from .core.TextureIndex import TextureIndex
+    from .core.TextureAudit import TextureAudit, DEFAULT_MAX_WORKERS
+
+    texture_index = TextureIndex(options.root, FILE_EXTENSION_SUPPORTED, options.depth)
+    texture_index.build()
+    _initialize_maya()
+    import maya.cmds as cmds
+    from .ShadingGraph import ShadingGraph
+
+    textures_by_scene = {}
+    for scene in options.scenes:
+        cmds.file(scene, open=True, force=True)
+        textures_by_scene[scene] = ShadingGraph.get_scene_textures()
+    audit = TextureAudit.build(texture_index, textures_by_scene,
+                               options.workers if options.workers is not None else DEFAULT_MAX_WORKERS)
+    audit.write_report(options.output)
+    for status, count in audit.get_counts().items():
+        print("%s : %d" % (status.replace("_", " ").capitalize(), count))
+    print("Report written : " + options.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Create the shaders of a texture library without the interface, under mayapy :
+
+    mayapy -m shader_maker.batch <library> -o <scene.ma> [--split] [--workers N]
+
+The shader folders of the library are found as in the interface. They are built in one scene or, with --split,
+in one scene for each shader folder. With --workers the folders are spread across several mayapy processes.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+########################################################################################################################
+
+ASSIGNATIONS = {
+    "none": "NoAssign",
+    "name": "AutoAssign",
+    "selection": "AssignToSelection"
+}
+
+SCENE_TYPES = {
+    ".ma": "mayaAscii",
+    ".mb": "mayaBinary"
+}
+
+ARNOLD_PLUGIN = "mtoa"
+
+
+########################################################################################################################
+
+
+def _parse_args(args):
+    """
+    Parse the command line
+    :param args
+    :return: namespace of the arguments
+    """
+    from .core.LibraryScanner import DEFAULT_MAX_DEPTH
+    from .core.TxConverter import CHECK_MODES, CHECK_MTIME
+    parser = argparse.ArgumentParser(prog="mayapy -m shader_maker.batch",
+                                     description="Create the shaders of a texture library in Maya scenes")
+    parser.add_argument("library", help="folder of the texture library")
+    parser.add_argument("-o", "--output", required=True,
+                        help="scene to write (.ma or .mb), folder of the scenes with --split")
+    parser.add_argument("--depth", type=int, default=DEFAULT_MAX_DEPTH,
+                        help="max depth of the shader folders in the library")
+    parser.add_argument("--assign", choices=sorted(ASSIGNATIONS.keys()), default="none",
+                        help="none : on spheres, name : replace the shaders of the same name in --scene, "
+                             "selection : assign to --objects")
+    parser.add_argument("--scene", help="scene opened before building the shaders")
+    parser.add_argument("--objects", nargs="*", default=[], help="objects to assign with --assign selection")
+    parser.add_argument("--displacement-scale", type=float, default=None)
+    parser.add_argument("--displacement-mid", type=float, default=None)
+    parser.add_argument("--split", action="store_true", help="write one scene for each shader folder")
+    parser.add_argument("--scene-type", choices=sorted(SCENE_TYPES.keys()), default=".ma",
+                        help="type of the scenes written with --split")
+    parser.add_argument("--workers", type=int, default=1, help="number of mayapy processes")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="make the copies of a texture in several shader folders point at one file")
+    parser.add_argument("--reuse-file-nodes", action="store_true",
+                        help="connect the file nodes already loading a texture instead of creating new ones")
+    parser.add_argument("--merge-duplicates", action="store_true",
+                        help="merge the duplicate file nodes and place2dTextures before saving the scene")
+    parser.add_argument("--tx", action="store_true", help="convert the textures to .tx before creating the shaders")
+    parser.add_argument("--tx-command", default=None,
+                        help="command of the converter with {input} and {output} (maketx by default)")
+    parser.add_argument("--tx-check", choices=CHECK_MODES, default=CHECK_MTIME,
+                        help="what has to be unchanged in a texture to keep its .tx")
+    parser.add_argument("--tx-workers", type=int, default=None, help="number of conversions at the same time")
+    parser.add_argument("--folders-file", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-index", type=int, default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(args)
+
+
+def _initialize_maya():
+    """
+    Initialize Maya in standalone and load Arnold
+    :return:
+    """
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    import maya.cmds as cmds
+    cmds.loadPlugin(ARNOLD_PLUGIN, quiet=True)
+
+
+def _find_shader_folders(library, max_depth):
+    """
+    Find the shader folders of the library
+    :param library
+    :param max_depth
+    :return: folders
+    """
+    from .core.ScanCache import ScanCache
+    from .core.LibraryScanner import LibraryScanner
+    from .core.Shader import SHADER_FIELDS_CLASSIFIER
+    scanner = LibraryScanner(SHADER_FIELDS_CLASSIFIER, ScanCache(SHADER_FIELDS_CLASSIFIER.get_signature()))
+    return [directory for directory, _ in scanner.iter_shader_directories(library, max_depth)]
+
+
+def _get_scene_path(options, folder=None, worker_index=None):
+    """
+    Get the path of the scene to write
+    :param options
+    :param folder: shader folder with --split
+    :param worker_index: index of the worker writing a part of the shaders in one scene
+    :return: path
+    """
+    if folder is not None:
+        relative_path = os.path.relpath(folder, options.library)
+        name = "shaders" if relative_path == os.curdir else relative_path.replace(os.sep, "_").replace("/", "_")
+        return os.path.join(options.output, name + options.scene_type)
+    if worker_index is None:
+        return options.output
+    base, ext = os.path.splitext(options.output)
+    return "%s_%d%s" % (base, worker_index, ext)
+
+
+def _save_scene(path):
+    """
+    Save the current scene
+    :param path
+    :return:
+    """
+    import maya.cmds as cmds
+    directory = os.path.dirname(path)
+    if len(directory) > 0 and not os.path.isdir(directory):
+        os.makedirs(directory)
+    scene_type = SCENE_TYPES.get(os.path.splitext(path)[1].lower(), "mayaAscii")
+    cmds.file(rename=path)
+    cmds.file(save=True, force=True, type=scene_type)
+    print("Scene saved : " + path)
+
+
+def _build_scene(options, folders, scene_path, shader_creator, tx_converter, deduplicator):
+    """
+    Create the shaders of shader folders in a new scene
+    :param options
+    :param folders
+    :param scene_path
+    :param shader_creator: ShaderCreator
+    :param tx_converter: TxConverter or None to keep the textures
+    :param deduplicator: TextureDeduplicator or None to keep the copies of the textures
+    :return: number of shaders created
+    """
+    import maya.cmds as cmds
+    from .ShaderCreator import Assignation
+    from .core.Shader import Shader, SHADER_FIELDS_CLASSIFIER, DEFAULT_DISPLACEMENT_SCALE, DEFAULT_DISPLACEMENT_MID
+    from .core.LibraryScanner import LibraryScanner
+
+    # The index is built again for each scene
+    shader_creator.get_material_index().stop()
+    if options.scene is not None:
+        cmds.file(options.scene, open=True, force=True)
+    else:
+        cmds.file(new=True, force=True)
+
+    # The folders are already found, only their textures are listed
+    scanner = LibraryScanner(SHADER_FIELDS_CLASSIFIER)
+    shaders = []
+    for folder in folders:
+        shaders.extend(Shader.iter_shaders(folder, scanner, 0))
+    if len(shaders) == 0:
+        return 0
+
+    shading_values = {
+        "displacement_scale": DEFAULT_DISPLACEMENT_SCALE
+        if options.displacement_scale is None else options.displacement_scale,
+        "displacement_mid": DEFAULT_DISPLACEMENT_MID
+        if options.displacement_mid is None else options.displacement_mid
+    }
+    shader_creator.create(shaders, Assignation[ASSIGNATIONS[options.assign]], shading_values, options.objects,
+                          tx_converter, deduplicator, options.reuse_file_nodes)
+    if options.merge_duplicates:
+        from .FileNodeRegistry import FileNodeRegistry
+        FileNodeRegistry.merge_duplicates()
+    _save_scene(scene_path)
+    return len(shaders)
+
+
+def _build(options, folders, worker_index=None):
+    """
+    Create the shaders of shader folders in one scene or in one scene by folder with --split
+    :param options
+    :param folders
+    :param worker_index: index of the worker if the folders are a part of the library
+    :return: number of shaders created
+    """
+    from .ShaderCreator import ShaderCreator
+    from .core.TxConverter import TxConverter
+    from .core.TextureDeduplicator import TextureDeduplicator
+    shader_creator = ShaderCreator()
+    tx_converter = TxConverter(options.tx_command, options.tx_workers, options.tx_check) if options.tx else None
+    deduplicator = TextureDeduplicator() if options.dedupe else None
+    nb_shaders = 0
+    try:
+        if options.split:
+            for folder in folders:
+                nb_shaders += _build_scene(options, [folder], _get_scene_path(options, folder), shader_creator,
+                                           tx_converter, deduplicator)
+        else:
+            nb_shaders = _build_scene(options, folders, _get_scene_path(options, worker_index=worker_index),
+                                      shader_creator, tx_converter, deduplicator)
+    finally:
+        shader_creator.get_material_index().stop()
+    return nb_shaders
+
+
+def _run_workers(options, args, folders):
+    """
+    Spread the shader folders across several mayapy processes
+    :param options
+    :param args: command line arguments
+    :param folders
+    :return: exit code
+    """
+    nb_workers = min(options.workers, len(folders))
+    processes = []
+    folders_files = []
+    try:
+        for worker_index in range(nb_workers):
+            with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as folders_file:
+                json.dump(folders[worker_index::nb_workers], folders_file)
+            folders_files.append(folders_file.name)
+            command = [sys.executable, "-m", __spec__.name] + args + \
+                      ["--folders-file", folders_file.name, "--worker-index", str(worker_index)]
+            processes.append(subprocess.Popen(command))
+        exit_code = 0
+        for process in processes:
+            if process.wait() != 0:
+                exit_code = 1
+        return exit_code
+    finally:
+        for folders_file in folders_files:
+            os.remove(folders_file)
+
+
+def main(args=None):
+    """
+    Entry point of the batch
+    :param args: command line arguments
+    :return: exit code
+    """
+    args = sys.argv[1:] if args is None else list(args)
+    options = _parse_args(args)
+    # Messages of the creation (shaders replaced, conversions failed)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Part of the library given by the main process
+    if options.folders_file is not None:
+        with open(options.folders_file) as folders_file:
+            folders = json.load(folders_file)
+        worker_index = None if options.split else options.worker_index
+        _initialize_maya()
+        print("Shaders created : %d" % _build(options, folders, worker_index))
+        return 0
+
+    folders = _find_shader_folders(options.library, options.depth)
+    print("Shader folders found : %d" % len(folders))
+    if len(folders) == 0:
+        return 0
+    # Maya is only initialized by the processes that build the shaders
+    if options.workers > 1 and len(folders) > 1:
+        return _run_workers(options, args, folders)
+    _initialize_maya()
+    print("Shaders created : %d" % _build(options, folders))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Benchmark suite of the scan, the matching, the version resolution and the node creation on synthetic libraries of
+several sizes. Maya is replaced by a stand-in so it runs with any Python interpreter. Run from the folder
+containing the shader_maker package :
+    python -m shader_maker.benchmarks.bench_library [--sizes 100 1000 5000] [--output results.json] [--tx]
+With --tx the conversion to .tx is timed with a stand-in of maketx. The results are written as JSON to track the regressions between releases
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shlex
+import shutil
+import sys
+import tempfile
+import time
+
+from shader_maker.benchmarks import maya_stand_in
+from shader_maker.benchmarks.library_generator import generate_library
+
+maya_stand_in.install()
+
+from shader_maker.core.LibraryScanner import LibraryScanner
+from shader_maker.core.ScanCache import ScanCache
+from shader_maker.core.Shader import Shader, SHADER_FIELDS_CLASSIFIER, FILE_EXTENSION_SUPPORTED, \
+    DEFAULT_DISPLACEMENT_SCALE, DEFAULT_DISPLACEMENT_MID
+from shader_maker.core.TextureIndex import TextureIndex
+from shader_maker.core.TxConverter import TxConverter
+from shader_maker.ShadingNetworkBuilder import ShadingNetworkBuilder
+
+########################################################################################################################
+
+LIBRARY_SIZES = [100, 1000, 5000]
+
+DEFAULT_OUTPUT = "bench_library.json"
+
+REPEAT = 3
+
+TX_STAND_IN_COMMAND = shlex.quote(sys.executable) + " -m shader_maker.benchmarks.tx_stand_in {input} -o {output}"
+
+
+########################################################################################################################
+
+
+def best_time(func, *args):
+    """
+    Get the best time of many runs of a function
+    :param func
+    :param args
+    :return: best time in seconds and result of the last run
+    """
+    best = None
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best, result
+
+
+def scan(scanner, library):
+    """
+    Find the shader folders of a library
+    :param scanner: LibraryScanner
+    :param library
+    :return: list of directory and scan
+    """
+    return scanner.scan_library(library)
+
+
+def classify(scans):
+    """
+    Classify the textures of the shader folders
+    :param scans: list of directory and scan
+    :return: number of shaders found
+    """
+    return sum(len(SHADER_FIELDS_CLASSIFIER.classify(scan["textures"])) for _, scan in scans)
+
+
+def load_shaders(scans):
+    """
+    Create the shaders of the shader folders
+    :param scans: list of directory and scan
+    :return: shaders
+    """
+    shaders = []
+    for directory, scan in scans:
+        for shader, nb in Shader(os.path.basename(directory)).load(directory, scan["matches"], scan["tiles"]):
+            if nb > 0:
+                shaders.append(shader)
+    return shaders
+
+
+def build_index(updates):
+    """
+    Index the new versions of the textures
+    :param updates: folder of the new versions
+    :return: TextureIndex
+    """
+    texture_index = TextureIndex(updates, FILE_EXTENSION_SUPPORTED)
+    texture_index.build()
+    return texture_index
+
+
+def resolve_versions(texture_index, texture_paths):
+    """
+    Find the new version of textures
+    :param texture_index: TextureIndex
+    :param texture_paths
+    :return: number of new versions found
+    """
+    return sum(1 for texture_path in texture_paths if texture_index.find(texture_path) is not None)
+
+
+def convert_textures(converter, texture_paths):
+    """
+    Convert textures to .tx
+    :param converter: TxConverter
+    :param texture_paths
+    :return: number of .tx
+    """
+    return sum(1 for tx_path in converter.convert(texture_paths).values() if tx_path is not None)
+
+
+def build_networks(shaders):
+    """
+    Build the shading networks of shaders in the stand-in scene
+    :param shaders
+    :return: number of nodes created
+    """
+    maya_stand_in.reset()
+    shading_values = {
+        "displacement_scale": DEFAULT_DISPLACEMENT_SCALE,
+        "displacement_mid": DEFAULT_DISPLACEMENT_MID
+    }
+    builder = ShadingNetworkBuilder()
+    for shader in shaders:
+        shading_group = builder.create_shading_group(shader.get_title() + "_sg")
+        arnold_node, displacement_node = shader.add_shading_nodes(builder, shading_values)
+        builder.connect(arnold_node, "outColor", shading_group, "surfaceShader")
+        if displacement_node is not None:
+            builder.connect(displacement_node, "displacement", shading_group, "displacementShader")
+    builder.do_it()
+    return len(builder.get_created_nodes())
+
+
+def bench_library(nb_assets, tx=False):
+    """
+    Run all the phases on a library
+    :param nb_assets: number of assets of the library
+    :param tx: whether the conversion to .tx is timed
+    :return: dict of the results
+    """
+    root = tempfile.mkdtemp(prefix="shader_maker_bench_")
+    try:
+        library = generate_library(root, nb_assets)
+        phases = {}
+
+        duration, scans = best_time(scan, LibraryScanner(SHADER_FIELDS_CLASSIFIER), library["library"])
+        phases["scan"] = {"seconds": duration, "shader_folders": len(scans),
+                          "textures": sum(len(scan["textures"]) for _, scan in scans)}
+
+        cache = ScanCache(SHADER_FIELDS_CLASSIFIER.get_signature(), root + "/scan_cache.json")
+        cached_scanner = LibraryScanner(SHADER_FIELDS_CLASSIFIER, cache)
+        scan(cached_scanner, library["library"])
+        duration, _ = best_time(scan, cached_scanner, library["library"])
+        phases["scan_cached"] = {"seconds": duration}
+
+        duration, nb_shaders = best_time(classify, scans)
+        phases["classification"] = {"seconds": duration, "shaders": nb_shaders}
+
+        duration, shaders = best_time(load_shaders, scans)
+        phases["shader_load"] = {"seconds": duration, "shaders": len(shaders)}
+
+        duration, texture_index = best_time(build_index, library["updates"])
+        phases["index_build"] = {"seconds": duration}
+
+        duration, nb_found = best_time(resolve_versions, texture_index, library["texture_paths"])
+        phases["version_resolution"] = {"seconds": duration, "textures": len(library["texture_paths"]),
+                                        "new_versions": nb_found}
+
+        if tx:
+            converter = TxConverter(TX_STAND_IN_COMMAND, cache_path=root + "/tx_cache.json")
+            # Only the first run converts the textures
+            start = time.perf_counter()
+            nb_tx = convert_textures(converter, library["texture_paths"])
+            phases["tx_conversion"] = {"seconds": time.perf_counter() - start, "tx": nb_tx}
+            duration, _ = best_time(convert_textures, converter, library["texture_paths"])
+            phases["tx_conversion_cached"] = {"seconds": duration}
+
+        duration, nb_nodes = best_time(build_networks, shaders)
+        phases["network_build"] = {"seconds": duration, "nodes": nb_nodes,
+                                   "maya_calls": sum(maya_stand_in.CALLS.values())}
+
+        return {"assets": nb_assets, "shader_folders": len(library["shader_folders"]), "phases": phases}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run(sizes, output, tx=False):
+    """
+    Run the benchmark on libraries of several sizes and write the results
+    :param sizes: numbers of assets of the libraries
+    :param output: path of the JSON file of the results
+    :param tx: whether the conversion to .tx is timed
+    :return: results
+    """
+    results = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": REPEAT,
+        "libraries": []
+    }
+    for nb_assets in sizes:
+        library_results = bench_library(nb_assets, tx)
+        results["libraries"].append(library_results)
+        print("%6d assets : %s" % (nb_assets, " | ".join(
+            "%s %.1f ms" % (phase, values["seconds"] * 1000) for phase, values in library_results["phases"].items())))
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print("Results written in " + output)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark of Shader Maker on synthetic libraries")
+    parser.add_argument("--sizes", type=int, nargs="+", default=LIBRARY_SIZES, help="numbers of assets")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file of the results")
+    parser.add_argument("--tx", action="store_true", help="time the conversion to .tx with a stand-in of maketx")
+    options = parser.parse_args()
+    run(options.sizes, options.output, options.tx)
+    sys.exit(0)
@@ -0,0 +1,135 @@
+"""
+Benchmark of the loading of a shader folder : legacy regex matching against the single-pass classifier.
+Run from the folder containing the shader_maker package :
+    python -m shader_maker.benchmarks.bench_shader_load
+"""
+import os
+import re
+import shutil
+import tempfile
+import time
+import random
+
+from shader_maker.core.ShaderFieldClassifier import ShaderFieldClassifier
+
+########################################################################################################################
+
+FILE_EXTENSION_SUPPORTED = ["exr", "jpg", "jpeg", "tif", "png", "tx"]
+FILE_EXTENSION_SUPPORTED_REGEX = "|".join(FILE_EXTENSION_SUPPORTED)
+
+# Regexes used by Shader.load before the classifier
+LEGACY_SHADER_FIELDS_REGEX = {
+    "base_color": r"(.*)(?:basecolor|albedo|diffuse).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "normal": r"((?:(?!combine).)*)(?:normal)(?:(?!combine).)*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "displacement": r"(.*)(?:height|displacement|disp).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "roughness": r"(.*)(?:roughness).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "metalness": r"(.*)(?:metalness).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "emissive": r"(.*)(?:emissive).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "sss": r"(.*)(?:sssamount).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")"
+}
+
+CHANNEL_NAMES = ["BaseColor", "Albedo", "Normal", "Normal_Combine", "Height", "Displacement", "Roughness",
+                 "Metalness", "Emissive", "SSSAmount", "AO", "Opacity"]
+
+FOLDER_SIZES = [200, 2000]
+REPEAT = 3
+
+
+########################################################################################################################
+
+
+def generate_folder(folder_path, nb_files, seed=0):
+    """
+    Generate a folder of empty texture files of many shaders
+    :param folder_path
+    :param nb_files
+    :param seed
+    :return:
+    """
+    rand = random.Random(seed)
+    index = 0
+    while index < nb_files:
+        asset = "asset%04d_%s" % (index, rand.choice(["wood", "metal", "rock_long_descriptive_name"]))
+        for channel in CHANNEL_NAMES:
+            for tile in range(1001, 1001 + rand.randint(1, 4)):
+                if index >= nb_files:
+                    return
+                ext = rand.choice(FILE_EXTENSION_SUPPORTED + ["jpg.bak"])
+                open(os.path.join(folder_path, "%s_%s.%d.%s" % (asset, channel, tile, ext)), "w").close()
+                index += 1
+
+
+def legacy_load(folder_path):
+    """
+    Listing and matching of Shader.load before the classifier
+    :param folder_path
+    :return: field_file_match
+    """
+    files_name_list = [f for f in os.listdir(folder_path) if
+                       os.path.isfile(os.path.join(folder_path, f)) and re.match(
+                           r".*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")", f, re.IGNORECASE)]
+    files_name_list.sort(key=str)
+    files_name_list.reverse()
+    field_file_match = {}
+    for keyword, regexp in LEGACY_SHADER_FIELDS_REGEX.items():
+        for file_name in files_name_list:
+            match = re.match(regexp, file_name.lower(), re.IGNORECASE)
+            if match:
+                prefix = match.groups()[0]
+                if prefix not in field_file_match:
+                    field_file_match[prefix] = {keyword: []}
+                elif keyword not in field_file_match[prefix]:
+                    field_file_match[prefix][keyword] = []
+                field_file_match[prefix][keyword].append(file_name)
+    return field_file_match
+
+
+def classifier_load(classifier, folder_path):
+    """
+    Listing and matching of Shader.load with the classifier
+    :param classifier
+    :param folder_path
+    :return: field_file_match
+    """
+    return classifier.classify(classifier.list_texture_files(folder_path))
+
+
+def best_time(func, *args):
+    """
+    Get the best time of many runs of a function
+    :param func
+    :param args
+    :return: best time in seconds and result
+    """
+    best = None
+    result = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args)
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best, result
+
+
+def run():
+    """
+    Run the benchmark on synthetic folders
+    :return:
+    """
+    classifier = ShaderFieldClassifier(FILE_EXTENSION_SUPPORTED)
+    for nb_files in FOLDER_SIZES:
+        folder_path = tempfile.mkdtemp(prefix="shader_maker_bench_")
+        try:
+            generate_folder(folder_path, nb_files)
+            legacy_time, legacy_result = best_time(legacy_load, folder_path)
+            new_time, new_result = best_time(classifier_load, classifier, folder_path)
+            if legacy_result != new_result:
+                raise RuntimeError("Classifier result differs from the legacy result")
+            print("%5d files : legacy %8.2f ms | classifier %8.2f ms | x%.1f" %
+                  (nb_files, legacy_time * 1000, new_time * 1000, legacy_time / new_time))
+        finally:
+            shutil.rmtree(folder_path)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,100 @@
+"""
+Generator of synthetic texture libraries for the benchmarks. The libraries look like the production ones : asset
+folders in categories, UDIM tile sets, mixed extensions, versioned subfolders, decoy "combine" normals and files
+that are not textures
+"""
+import os
+import random
+
+########################################################################################################################
+
+CATEGORIES = ["props", "characters", "environments", "vehicles", "sets"]
+
+# Channels of a shader and whether they are decoys that must not be matched
+CHANNELS = [("BaseColor", False), ("Normal", False), ("Normal_Combine", True), ("Height", False),
+            ("Roughness", False), ("Metalness", False), ("Emissive", False), ("SSSAmount", False),
+            ("AO", False), ("Opacity", False)]
+
+EXTENSIONS = ["exr", "tif", "png", "jpg", "tx"]
+
+OTHER_FILES = ["notes.txt", "preview.jpg.bak", "Thumbs.db"]
+
+
+########################################################################################################################
+
+
+def _create_file(file_path):
+    """
+    Create an empty file
+    :param file_path
+    :return:
+    """
+    open(file_path, "w").close()
+
+
+def _generate_textures(folder_path, asset, rand, max_tiles):
+    """
+    Generate the texture files of a shader in a folder
+    :param folder_path
+    :param asset: name of the asset
+    :param rand: random generator
+    :param max_tiles: max number of UDIM tiles of a channel
+    :return: texture paths
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    texture_paths = []
+    nb_tiles = rand.randint(1, max_tiles)
+    for channel, _ in CHANNELS:
+        if rand.random() < 0.2:
+            continue
+        ext = rand.choice(EXTENSIONS)
+        for tile in range(1001, 1001 + nb_tiles):
+            file_path = "%s/%s_%s.%d.%s" % (folder_path, asset, channel, tile, ext)
+            _create_file(file_path)
+            texture_paths.append(file_path)
+    for other_file in OTHER_FILES:
+        if rand.random() < 0.3:
+            _create_file(folder_path + "/" + other_file)
+    return texture_paths
+
+
+def generate_library(root, nb_assets, seed=0, max_tiles=4, max_versions=3, update_ratio=0.3):
+    """
+    Generate a texture library and a folder of new versions of some of its textures
+    :param root: folder in which the library is generated
+    :param nb_assets: number of assets
+    :param seed
+    :param max_tiles: max number of UDIM tiles of a channel
+    :param max_versions: max number of versioned subfolders of an asset
+    :param update_ratio: ratio of the assets with new versions
+    :return: dict with the library folder, the updates folder, the shader folders and the texture paths
+    """
+    rand = random.Random(seed)
+    library = root + "/library"
+    updates = root + "/updates"
+    shader_folders = []
+    texture_paths = []
+    for index in range(nb_assets):
+        category = CATEGORIES[index % len(CATEGORIES)]
+        asset = "%s%05d" % (category[:-1], index)
+        asset_folder = "%s/%s/%s" % (library, category, asset)
+        # Half of the assets have versioned subfolders, the scene uses the textures of the last version
+        if rand.random() < 0.5:
+            nb_versions = rand.randint(1, max_versions)
+            for version in range(1, nb_versions + 1):
+                shader_folder = "%s/v%03d" % (asset_folder, version)
+                paths = _generate_textures(shader_folder, asset, rand, max_tiles)
+                shader_folders.append(shader_folder)
+            texture_paths.extend(paths)
+        else:
+            texture_paths.extend(_generate_textures(asset_folder, asset, rand, max_tiles))
+            shader_folders.append(asset_folder)
+        if rand.random() < update_ratio:
+            _generate_textures("%s/%s/%s" % (updates, category, asset), asset, rand, max_tiles)
+    os.makedirs(updates, exist_ok=True)
+    return {
+        "library": library,
+        "updates": updates,
+        "shader_folders": shader_folders,
+        "texture_paths": texture_paths
+    }
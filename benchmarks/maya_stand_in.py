@@ -0,0 +1,136 @@
+"""
+Stand-in of maya.cmds and PyMEL to run the benchmarks of the node creation without Maya. The commands only
+record the nodes in memory, so the timings measure the work of the tool and the number of Maya calls it does
+"""
+import sys
+import types
+from collections import Counter
+
+########################################################################################################################
+
+# Number of calls of each command
+CALLS = Counter()
+
+
+########################################################################################################################
+
+
+class _Scene:
+    """
+    Nodes of the stand-in scene
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.nodes = {}
+        self.attributes = {}
+        self.connections = []
+        self.__next_indexes = {}
+
+    def create(self, node_type, name):
+        """
+        Create a node with a unique name
+        :param node_type
+        :param name
+        :return: name of the node
+        """
+        name = name if name is not None else node_type
+        unique_name = name
+        index = self.__next_indexes.get(name, 1)
+        while unique_name in self.nodes:
+            unique_name = "%s%d" % (name, index)
+            index += 1
+        self.__next_indexes[name] = index
+        self.nodes[unique_name] = node_type
+        return unique_name
+
+
+SCENE = _Scene()
+
+
+def _command(func):
+    """
+    Count the calls of a command
+    :param func
+    :return: command
+    """
+    def command(*args, **kwargs):
+        CALLS[func.__name__] += 1
+        return func(*args, **kwargs)
+    command.__name__ = func.__name__
+    return command
+
+
+@_command
+def shadingNode(node_type, name=None, **kwargs):
+    return SCENE.create(node_type, name)
+
+
+@_command
+def sets(*args, **kwargs):
+    if kwargs.get("edit", False):
+        return None
+    return SCENE.create("shadingEngine", kwargs.get("name"))
+
+
+@_command
+def sphere(*args, **kwargs):
+    return [SCENE.create("transform", "nurbsSphere1"), SCENE.create("makeNurbSphere", "makeNurbSphere1")]
+
+
+@_command
+def setAttr(plug, *values, **kwargs):
+    SCENE.attributes[plug] = values
+
+
+@_command
+def connectAttr(source, destination, **kwargs):
+    SCENE.connections.append((source, destination))
+
+
+@_command
+def objExists(name):
+    return name.split(".")[0] in SCENE.nodes
+
+
+@_command
+def delete(*nodes, **kwargs):
+    for node in nodes[0] if len(nodes) == 1 and isinstance(nodes[0], list) else nodes:
+        SCENE.nodes.pop(node, None)
+
+
+@_command
+def undoInfo(*args, **kwargs):
+    return None
+
+
+def reset():
+    """
+    Clear the stand-in scene and the counts of calls
+    :return:
+    """
+    global SCENE
+    SCENE = _Scene()
+    CALLS.clear()
+
+
+def install():
+    """
+    Register the stand-in as maya.cmds and pymel.core if Maya can't be imported
+    :return: whether the stand-in is installed
+    """
+    try:
+        import maya.cmds
+        return False
+    except ImportError:
+        pass
+    this_module = sys.modules[__name__]
+    maya = types.ModuleType("maya")
+    maya.cmds = this_module
+    pymel = types.ModuleType("pymel")
+    pymel_core = types.ModuleType("pymel.core")
+    pymel_core.PyNode = str
+    pymel.core = pymel_core
+    sys.modules.update({"maya": maya, "maya.cmds": this_module, "pymel": pymel, "pymel.core": pymel_core})
+    return True
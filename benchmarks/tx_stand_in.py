@@ -0,0 +1,16 @@
+"""
+Stand-in of maketx to run the .tx conversion without Arnold. It copies the texture to the output :
+    python -m shader_maker.benchmarks.tx_stand_in <input> -o <output>
+Given to the converter with SHADER_MAKER_TX_COMMAND or --tx-command
+"""
+import argparse
+import shutil
+import sys
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stand-in of maketx")
+    parser.add_argument("input")
+    parser.add_argument("-o", "--output", required=True)
+    options = parser.parse_args()
+    shutil.copyfile(options.input, options.output)
+    sys.exit(0)
@@ -0,0 +1,141 @@
+import os
+
+from .Profiler import PROFILER
+
+
+class DirectoryPoller:
+    """
+    Modification times of the directories of a tree to find the directories whose entries changed (file or folder
+    added, removed or renamed) without listing them all again
+    """
+    def __init__(self, root, max_depth):
+        """
+        Constructor
+        :param root: base directory
+        :param max_depth: depth of the deepest directories watched from the root
+        """
+        self.__root = root.rstrip("/\\") if len(root) > 1 else root
+        self.__max_depth = max_depth
+        # Directory to its depth and its modification time
+        self.__directories = {}
+
+    def get_root(self):
+        """
+        Getter of the root
+        :return: root
+        """
+        return self.__root
+
+    def get_directories(self):
+        """
+        Getter of the directories watched
+        :return: directories
+        """
+        return list(self.__directories.keys())
+
+    def get_depth(self, directory):
+        """
+        Getter of the depth of a directory watched
+        :param directory
+        :return: depth from the root or None if the directory is not watched
+        """
+        entry = self.__directories.get(directory)
+        return entry[0] if entry is not None else None
+
+    def __add_tree(self, directory, depth, added):
+        """
+        Add a directory and its subdirectories to the directories watched
+        :param directory
+        :param depth: depth of the directory from the root
+        :param added: list filled with the directories added
+        :return:
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+        self.__directories[directory] = (depth, mtime)
+        added.append(directory)
+        if depth < self.__max_depth:
+            for sub_directory in DirectoryPoller.__list_sub_directories(directory):
+                self.__add_tree(sub_directory, depth + 1, added)
+
+    @staticmethod
+    def __list_sub_directories(directory):
+        """
+        List the subdirectories of a directory
+        :param directory
+        :return: paths
+        """
+        PROFILER.count("directories_listed")
+        try:
+            with os.scandir(directory) as entries:
+                return [directory + "/" + entry.name for entry in entries if entry.is_dir()]
+        except OSError:
+            return []
+
+    def __remove_tree(self, directory, removed):
+        """
+        Remove a directory and its subdirectories from the directories watched
+        :param directory
+        :param removed: list filled with the directories removed
+        :return:
+        """
+        prefix = directory + "/"
+        for watched in [watched for watched in self.__directories
+                        if watched == directory or watched.startswith(prefix)]:
+            del self.__directories[watched]
+            removed.append(watched)
+
+    def snapshot(self):
+        """
+        Record the modification time of all the directories of the tree
+        :return: directories watched
+        """
+        self.__directories.clear()
+        added = []
+        self.__add_tree(self.__root, 0, added)
+        return added
+
+    def refresh(self, directories):
+        """
+        Compare directories with their recorded modification time, the changed ones are listed again to watch their
+        new subdirectories
+        :param directories: directories to check
+        :return: changed, added and removed directories
+        """
+        changed = []
+        added = []
+        removed = []
+        for directory in directories:
+            entry = self.__directories.get(directory)
+            if entry is None:
+                continue
+            depth, mtime = entry
+            try:
+                new_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                self.__remove_tree(directory, removed)
+                continue
+            if new_mtime == mtime:
+                continue
+            self.__directories[directory] = (depth, new_mtime)
+            changed.append(directory)
+            if depth < self.__max_depth:
+                sub_directories = set(DirectoryPoller.__list_sub_directories(directory))
+                prefix = directory + "/"
+                for watched in [watched for watched, watched_entry in self.__directories.items()
+                                if watched_entry[0] == depth + 1 and watched.startswith(prefix)]:
+                    if watched not in sub_directories:
+                        self.__remove_tree(watched, removed)
+                for sub_directory in sorted(sub_directories):
+                    if sub_directory not in self.__directories:
+                        self.__add_tree(sub_directory, depth + 1, added)
+        return changed, added, removed
+
+    def poll(self):
+        """
+        Compare all the directories with their recorded modification time
+        :return: changed, added and removed directories
+        """
+        return self.refresh(list(self.__directories.keys()))
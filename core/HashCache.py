@@ -0,0 +1,122 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+########################################################################################################################
+
+DEFAULT_HASH_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".shader_maker", "hash_cache.json")
+
+DEFAULT_MAX_ENTRIES = 50000
+
+_CACHE_VERSION = 1
+
+
+########################################################################################################################
+
+
+class HashCache:
+    """
+    Persistent cache of the hashes of the contents of files validated by the size and the modification time of each
+    file
+    """
+    def __init__(self, algorithm, cache_path=DEFAULT_HASH_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Constructor
+        :param algorithm: hash algorithm, the cache is discarded if it changes
+        :param cache_path: file of the cache
+        :param max_entries: max number of files kept (least recently used are evicted)
+        """
+        self.__algorithm = algorithm
+        self.__cache_path = cache_path
+        self.__max_entries = max_entries
+        # File path to its size, modification time and hash
+        self.__entries = OrderedDict()
+        self.__dirty = False
+        # Files are hashed on many threads
+        self.__lock = threading.Lock()
+        self.__load()
+
+    @staticmethod
+    def __key(path):
+        """
+        Get the key of a path
+        :param path
+        :return: key
+        """
+        return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
+
+    def __load(self):
+        """
+        Load the cache file, it is discarded if the algorithm changed
+        :return:
+        """
+        if not os.path.isfile(self.__cache_path):
+            return
+        try:
+            with open(self.__cache_path, "r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != _CACHE_VERSION or data.get("algorithm") != self.__algorithm:
+            return
+        for key, entry in data.get("entries", []):
+            self.__entries[key] = entry
+
+    def save(self):
+        """
+        Save the cache file if it changed
+        :return:
+        """
+        with self.__lock:
+            if not self.__dirty:
+                return
+            data = {
+                "version": _CACHE_VERSION,
+                "algorithm": self.__algorithm,
+                "entries": list(self.__entries.items())
+            }
+            self.__dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.__cache_path), exist_ok=True)
+            tmp_path = self.__cache_path + ".tmp"
+            with open(tmp_path, "w") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(tmp_path, self.__cache_path)
+        except OSError:
+            pass
+
+    def get(self, path, stat):
+        """
+        Get the hash of a file if the file didn't change since it has been cached
+        :param path
+        :param stat: current stat of the file
+        :return: hex digest or None
+        """
+        key = HashCache.__key(path)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                del self.__entries[key]
+                self.__dirty = True
+                return None
+            self.__entries.move_to_end(key)
+            return entry["hash"]
+
+    def set(self, path, stat, digest):
+        """
+        Store the hash of a file
+        :param path
+        :param stat: stat of the file hashed
+        :param digest: hex digest
+        :return:
+        """
+        key = HashCache.__key(path)
+        with self.__lock:
+            self.__entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest}
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+            self.__dirty = True
@@ -0,0 +1,151 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .Profiler import PROFILER
+
+########################################################################################################################
+
+DEFAULT_MAX_DEPTH = 4
+
+# Scans are limited by the latency of the file server, not by the CPU
+DEFAULT_MAX_WORKERS = 16
+
+
+########################################################################################################################
+
+
+class LibraryScanner:
+    """
+    Scan the directories of a texture library
+    """
+    def __init__(self, classifier, cache=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Constructor
+        :param classifier: ShaderFieldClassifier
+        :param cache: ScanCache
+        :param max_workers: number of directories listed concurrently
+        """
+        self.__classifier = classifier
+        self.__cache = cache
+        self.__max_workers = max_workers
+
+    def get_cache(self):
+        """
+        Getter of the cache
+        :return: cache
+        """
+        return self.__cache
+
+    def scan_directory(self, directory):
+        """
+        Get the subdirectories, the texture files and their classification of a directory
+        :param directory
+        :return: dict with directories, textures (with the UDIM textures collapsed), tiles of the UDIM textures and
+        matches or None if the directory can't be read
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        if self.__cache is not None:
+            scan = self.__cache.get(directory, mtime)
+            if scan is not None:
+                PROFILER.count("scan_cache_hits")
+                return scan
+
+        directories = []
+        textures = []
+        nb_entries = 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    nb_entries += 1
+                    if entry.is_dir():
+                        directories.append(entry.name)
+                    elif self.__classifier.is_texture(entry.name) and entry.is_file():
+                        textures.append(entry.name)
+        except OSError:
+            return None
+        textures.sort(key=str)
+        textures.reverse()
+        # The tiles of the UDIM textures are classified once
+        textures, tiles = self.__classifier.collapse_udims(textures)
+        PROFILER.count("directories_listed")
+        PROFILER.count("files_listed", nb_entries)
+        PROFILER.count("files_classified", len(textures))
+        scan = {
+            "directories": directories,
+            "textures": textures,
+            "tiles": tiles,
+            "matches": self.__classifier.classify(textures)
+        }
+        if self.__cache is not None:
+            self.__cache.set(directory, mtime, scan)
+        return scan
+
+    def __scan_tree_node(self, executor, directory, depth, max_depth, stop_event):
+        """
+        Scan a directory and submit the scans of its subdirectories if it is not a shader folder
+        :param executor
+        :param directory
+        :param depth: depth of the directory from the root
+        :param max_depth
+        :param stop_event: event set when the scan is abandoned
+        :return: directory, scan and futures of the subdirectories or None
+        """
+        if stop_event.is_set():
+            return None
+        scan = self.scan_directory(directory)
+        if scan is None:
+            return None
+        children = []
+        if len(scan["textures"]) == 0 and depth < max_depth:
+            for name in scan["directories"]:
+                if stop_event.is_set():
+                    break
+                try:
+                    children.append(executor.submit(self.__scan_tree_node, executor, directory + "/" + name,
+                                                    depth + 1, max_depth, stop_event))
+                except RuntimeError:
+                    # The executor has been shut down
+                    break
+        return directory, scan, children
+
+    def iter_shader_directories(self, root, max_depth=DEFAULT_MAX_DEPTH, is_cancelled=None):
+        """
+        Find the shader folders (folders containing textures) of a library. The directories are listed concurrently
+        but the shader folders are yielded in the order of a sequential depth-first scan
+        :param root: base directory of the library
+        :param max_depth: max depth of the shader folders from the root
+        :param is_cancelled: function returning whether the scan has to stop
+        :return: generator of directory and scan
+        """
+        stop_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+        try:
+            stack = [executor.submit(self.__scan_tree_node, executor, root, 0, max_depth, stop_event)]
+            while len(stack) > 0:
+                if is_cancelled is not None and is_cancelled():
+                    return
+                result = stack.pop().result()
+                if result is None:
+                    continue
+                directory, scan, children = result
+                if len(scan["textures"]) > 0:
+                    yield directory, scan
+                stack.extend(reversed(children))
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=False)
+            if self.__cache is not None:
+                self.__cache.save()
+
+    def scan_library(self, root, max_depth=DEFAULT_MAX_DEPTH):
+        """
+        Get all the shader folders of a library
+        :param root: base directory of the library
+        :param max_depth: max depth of the shader folders from the root
+        :return: list of directory and scan
+        """
+        return list(self.iter_shader_directories(root, max_depth))
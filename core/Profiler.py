@@ -0,0 +1,140 @@
+import cProfile
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Profiler:
+    """
+    Timings of the phases of the tool and counters of the work done. The timings can be written as JSON lines and
+    the main thread can be captured with cProfile
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__lock = threading.Lock()
+        # Phase name to count, total and last duration
+        self.__phases = OrderedDict()
+        self.__counters = OrderedDict()
+        self.__json_lines_path = None
+        self.__profile = None
+
+    def set_json_lines_path(self, json_lines_path):
+        """
+        Setter of the file in which a JSON line is appended at the end of each phase
+        :param json_lines_path: path or None to not write the phases
+        :return:
+        """
+        self.__json_lines_path = json_lines_path
+
+    def reset(self):
+        """
+        Forget the timings and the counters
+        :return:
+        """
+        with self.__lock:
+            self.__phases.clear()
+            self.__counters.clear()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a phase
+        :param name
+        :return: context manager
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__add_phase(name, time.perf_counter() - start)
+
+    def __add_phase(self, name, duration):
+        """
+        Record the duration of a phase
+        :param name
+        :param duration: seconds
+        :return:
+        """
+        with self.__lock:
+            if name not in self.__phases:
+                self.__phases[name] = {"count": 0, "total": 0.0, "last": 0.0}
+            phase = self.__phases[name]
+            phase["count"] += 1
+            phase["total"] += duration
+            phase["last"] = duration
+            if self.__json_lines_path is not None:
+                line = {"time": time.time(), "phase": name, "seconds": duration, "counters": dict(self.__counters)}
+                try:
+                    with open(self.__json_lines_path, "a") as file:
+                        file.write(json.dumps(line) + "\n")
+                except OSError:
+                    self.__json_lines_path = None
+
+    def count(self, name, value=1):
+        """
+        Increment a counter
+        :param name
+        :param value
+        :return:
+        """
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def get_phases(self):
+        """
+        Getter of the phases
+        :return: dict of phase name to count, total and last duration
+        """
+        with self.__lock:
+            return OrderedDict((name, dict(phase)) for name, phase in self.__phases.items())
+
+    def get_counters(self):
+        """
+        Getter of the counters
+        :return: dict of counter name to value
+        """
+        with self.__lock:
+            return OrderedDict(self.__counters)
+
+    def get_summary(self):
+        """
+        Get a line with the last duration of each phase and the counters
+        :return: summary
+        """
+        with self.__lock:
+            items = ["%s %.0f ms" % (name, phase["last"] * 1000) for name, phase in self.__phases.items()]
+            items.extend("%s %d" % (name, value) for name, value in self.__counters.items())
+        return " | ".join(items)
+
+    def start_profile(self):
+        """
+        Start a cProfile capture of the thread calling it
+        :return:
+        """
+        if self.__profile is None:
+            self.__profile = cProfile.Profile()
+            self.__profile.enable()
+
+    def stop_profile(self, path):
+        """
+        Stop the cProfile capture and write its stats
+        :param path: file of the stats (readable with pstats)
+        :return:
+        """
+        if self.__profile is None:
+            return
+        self.__profile.disable()
+        self.__profile.dump_stats(path)
+        self.__profile = None
+
+
+########################################################################################################################
+
+# Profiler shared by all the parts of the tool
+PROFILER = Profiler()
+
+########################################################################################################################
@@ -0,0 +1,137 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+########################################################################################################################
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".shader_maker", "scan_cache.json")
+
+DEFAULT_MAX_ENTRIES = 20000
+
+_CACHE_VERSION = 1
+
+
+########################################################################################################################
+
+
+class ScanCache:
+    """
+    Persistent cache of the scan results of directories validated by the modification time of the directory
+    """
+    def __init__(self, signature, cache_path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Constructor
+        :param signature: signature of the scan settings, the cache is discarded if it changes
+        :param cache_path: file of the cache
+        :param max_entries: max number of directories kept (least recently used are evicted)
+        """
+        self.__signature = signature
+        self.__cache_path = cache_path
+        self.__max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__dirty = False
+        # Scans can run on many threads
+        self.__lock = threading.Lock()
+        self.__load()
+
+    @staticmethod
+    def __key(path):
+        """
+        Get the key of a path
+        :param path
+        :return: key
+        """
+        return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
+
+    def __load(self):
+        """
+        Load the cache file
+        :return:
+        """
+        if not os.path.isfile(self.__cache_path):
+            return
+        try:
+            with open(self.__cache_path, "r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != _CACHE_VERSION or data.get("signature") != self.__signature:
+            return
+        for key, entry in data.get("entries", []):
+            self.__entries[key] = entry
+
+    def save(self):
+        """
+        Save the cache file if it changed
+        :return:
+        """
+        with self.__lock:
+            if not self.__dirty:
+                return
+            data = {
+                "version": _CACHE_VERSION,
+                "signature": self.__signature,
+                "entries": list(self.__entries.items())
+            }
+            self.__dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.__cache_path), exist_ok=True)
+            tmp_path = self.__cache_path + ".tmp"
+            with open(tmp_path, "w") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(tmp_path, self.__cache_path)
+        except OSError:
+            pass
+
+    def get(self, path, mtime):
+        """
+        Get the scan result of a directory if it didn't change since it has been cached
+        :param path
+        :param mtime: current modification time of the directory
+        :return: scan result or None
+        """
+        key = ScanCache.__key(path)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry["mtime"] != mtime:
+                del self.__entries[key]
+                self.__dirty = True
+                return None
+            self.__entries.move_to_end(key)
+            return entry["data"]
+
+    def set(self, path, mtime, data):
+        """
+        Store the scan result of a directory
+        :param path
+        :param mtime: modification time of the directory
+        :param data: scan result (must be json serializable)
+        :return:
+        """
+        key = ScanCache.__key(path)
+        with self.__lock:
+            self.__entries[key] = {"mtime": mtime, "data": data}
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+            self.__dirty = True
+
+    def invalidate(self, path=None):
+        """
+        Remove a directory and its subdirectories from the cache, or everything if no path is given
+        :param path
+        :return:
+        """
+        with self.__lock:
+            if path is None:
+                self.__entries.clear()
+            else:
+                key = ScanCache.__key(path)
+                key_dir = key.rstrip("/") + "/"
+                for cached_key in list(self.__entries.keys()):
+                    if cached_key == key or cached_key.startswith(key_dir):
+                        del self.__entries[cached_key]
+            self.__dirty = True
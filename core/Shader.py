@@ -0,0 +1,372 @@
+import os
+
+from .ShaderFieldClassifier import ShaderFieldClassifier
+from .Profiler import PROFILER
+
+########################################################################################################################
+
+FILE_EXTENSION_SUPPORTED = ["exr", "jpg", "jpeg", "tif", "png", "tx"]
+
+FILE_EXTENSION_SUPPORTED_REGEX = "|".join(FILE_EXTENSION_SUPPORTED)
+
+DEFAULT_DISPLACEMENT_SCALE = 0.02
+DEFAULT_DISPLACEMENT_MID = 0
+
+SHADER_FIELDS_REGEX = {
+    "base_color": r"(.*)(?:basecolor|albedo|diffuse).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "normal": r"((?:(?!combine).)*)(?:normal)(?:(?!combine).)*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "displacement": r"(.*)(?:height|displacement|disp).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "roughness": r"(.*)(?:roughness).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "metalness": r"(.*)(?:metalness).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "emissive": r"(.*)(?:emissive).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")",
+    "sss": r"(.*)(?:sssamount).*\.(?:" + FILE_EXTENSION_SUPPORTED_REGEX + ")"
+}
+
+# Classify the files in one pass instead of matching each regex on each file
+SHADER_FIELDS_CLASSIFIER = ShaderFieldClassifier(FILE_EXTENSION_SUPPORTED)
+
+
+########################################################################################################################
+
+
+class ShaderField:
+    """
+    A Texture field in the shader
+    """
+    def __init__(self, rule):
+        """
+        :param rule: regexp that valid the ShaderField
+        """
+        self.__regexp = rule
+        self.__file_name = ""
+        self.__tiles = []
+        self.__enabled = True
+
+    def get_file_name(self):
+        """
+        Getter of the filename
+        :return: filename
+        """
+        return self.__file_name
+
+    def set_file_name(self, file_name):
+        """
+        Setter of the filename
+        :param file_name
+        :return:
+        """
+        self.__file_name = file_name
+
+    def get_tiles(self):
+        """
+        Getter of the UDIM tiles of the file
+        :return: tiles (empty if the file is not an UDIM texture)
+        """
+        return self.__tiles
+
+    def set_tiles(self, tiles):
+        """
+        Setter of the UDIM tiles of the file
+        :param tiles
+        :return:
+        """
+        self.__tiles = tiles
+
+    def get_regexp(self):
+        """
+        Getter of the regexp
+        :return: regexp
+        """
+        return self.__regexp
+
+    def is_found(self):
+        """
+        Getter of whether the ShaderField has been found or not
+        :return: boolean
+        """
+        return len(self.__file_name) > 0
+
+    def is_enabled(self):
+        """
+        Getter of whether the ShaderField is enabled or not
+        :return: boolean
+        """
+        return self.__enabled
+
+    def set_enabled(self, enabled):
+        """
+        Setter of the enabled field
+        :param enabled
+        :return:
+        """
+        self.__enabled = enabled
+
+    def toggle_enabled(self):
+        """
+        Toggle the enabled field
+        :return:
+        """
+        self.__enabled = not self.__enabled
+
+
+class Shader:
+    def __init__(self, title):
+        """
+        Constructor
+        :param title:
+        """
+        self.__shader_fields = {}
+        for keyword, rule in SHADER_FIELDS_REGEX.items():
+            self.__shader_fields[keyword] = ShaderField(rule)
+        self.__title = title
+        self.__dir_path = ""
+        self.__image_label = None
+
+    def get_title(self):
+        """
+        Getter of the title
+        :return: title
+        """
+        return self.__title
+
+    def set_field_enabled(self, keyword, enabled):
+        """
+        Setter of the enable field of a keyword
+        :param keyword
+        :param enabled
+        :return:
+        """
+        self.__shader_fields[keyword].set_enabled(enabled)
+
+    def load(self, folder_path, field_file_match=None, tiles=None):
+        """
+        Load the field according to the folder
+        :param folder_path:
+        :param field_file_match: classification of the files of the folder if already known
+        :param tiles: tiles of the UDIM textures of the folder if already known
+        :return:
+        """
+        with PROFILER.phase("shader_load"):
+            return self.__load_fields(folder_path, field_file_match, tiles)
+
+    def __load_fields(self, folder_path, field_file_match, tiles):
+        """
+        Load the field according to the folder
+        :param folder_path:
+        :param field_file_match: classification of the files of the folder if already known
+        :param tiles: tiles of the UDIM textures of the folder if already known
+        :return:
+        """
+        if field_file_match is None:
+            # Get all the texture files of the folder with the tiles of the UDIM textures collapsed
+            files_name_list, tiles = SHADER_FIELDS_CLASSIFIER.collapse_udims(
+                SHADER_FIELDS_CLASSIFIER.list_texture_files(folder_path))
+            # Sort and store objects according to their prefix to detect if many shaders are in the folder
+            field_file_match = SHADER_FIELDS_CLASSIFIER.classify(files_name_list)
+        if tiles is None:
+            tiles = {}
+
+        nb_file_field_match = len(field_file_match)
+        # If many shaders, create as much shaders
+        if nb_file_field_match > 1:
+            shaders = []
+            for prefix, field_datas in field_file_match.items():
+                prefix_to_title = prefix[:-1] if prefix[-1] == "_" else prefix
+                shader = Shader(prefix_to_title)
+                shader.__dir_path = folder_path
+                for keyword, file_names in field_datas.items():
+                    shader.__shader_fields[keyword].set_file_name(folder_path + "/" + file_names[0])
+                    shader.__shader_fields[keyword].set_tiles(tiles.get(file_names[0], []))
+                shaders.append((shader, len(field_datas)))
+            return shaders
+        # If only one shader keep the current one
+        elif nb_file_field_match == 1:
+            self.__dir_path = os.path.dirname(folder_path)
+            prefix = list(field_file_match.keys())[0]
+            prefix = prefix[:-1] if prefix[-1] == "_" else prefix
+            self.__title = prefix if self.__title[0].isdigit() else self.__title
+            shader_val = list(field_file_match.values())[0]
+            for keyword, file_names in shader_val.items():
+                self.__shader_fields[keyword].set_file_name(folder_path + "/" + file_names[0])
+                self.__shader_fields[keyword].set_tiles(tiles.get(file_names[0], []))
+            return [(self, len(shader_val))]
+        return []
+
+    @staticmethod
+    def iter_shader_folders(folder_path, scanner, max_depth, is_cancelled=None):
+        """
+        Iterate lazily over the shader folders of a folder and of its subfolders with their shaders
+        :param folder_path
+        :param scanner: LibraryScanner
+        :param max_depth: max depth of the shader folders
+        :param is_cancelled: function returning whether the iteration has to stop
+        :return: generator of shader folder and shaders
+        """
+        for dir_path, scan in scanner.iter_shader_directories(folder_path, max_depth, is_cancelled):
+            shaders = [shader for shader, nb in Shader(os.path.basename(dir_path)).load(
+                dir_path, scan["matches"], scan["tiles"]) if nb > 0]
+            yield dir_path, shaders
+
+    @staticmethod
+    def iter_shaders(folder_path, scanner, max_depth, is_cancelled=None):
+        """
+        Iterate lazily over the shaders of a folder and of its subfolders
+        :param folder_path
+        :param scanner: LibraryScanner
+        :param max_depth: max depth of the shader folders
+        :param is_cancelled: function returning whether the iteration has to stop
+        :return: generator of shaders
+        """
+        for _, shaders in Shader.iter_shader_folders(folder_path, scanner, max_depth, is_cancelled):
+            for shader in shaders:
+                yield shader
+
+    def get_field(self, keyword):
+        """
+        Getter of a field of the shader
+        :param keyword
+        :return: shader_field
+        """
+        return self.__shader_fields[keyword]
+
+    def get_fields(self):
+        """
+        Getter of the fields of the shader
+        :return: shader_fields
+        """
+        return list(self.__shader_fields.values())
+
+    def __generate_base_color(self, builder, in_tex, out_tex):
+        """
+        Generate the base color
+        :param builder: ShadingNetworkBuilder
+        :param in_tex: input texture
+        :param out_tex: output texture
+        :return:
+        """
+        field = self.__shader_fields["base_color"]
+        if field.is_found() and field.is_enabled():
+            base_color_file_name = field.get_file_name()
+            base_color = builder.create_file_node("Base Color", base_color_file_name, in_tex)
+            builder.connect(base_color, "outColor", out_tex, "baseColor")
+            builder.connect(base_color, "outColor", out_tex, "subsurfaceColor")
+
+    def __generate_roughness(self, builder, in_tex, out_tex):
+        """
+        Generate the roughness
+        :param builder: ShadingNetworkBuilder
+        :param in_tex: input texture
+        :param out_tex: output texture
+        :return:
+        """
+        field = self.__shader_fields["roughness"]
+        if field.is_found() and field.is_enabled():
+            roughness_file_name = field.get_file_name()
+            roughness = builder.create_file_node("Roughness", roughness_file_name, in_tex)
+            remap_value = builder.create_node("remapValue", "remapValue", "asUtility")
+            builder.connect(roughness, "outColorR", remap_value, "inputValue")
+            builder.connect(remap_value, "outValue", out_tex, "specularRoughness")
+
+    def __generate_normal(self, builder, in_tex, out_tex):
+        """
+        Generate the normal
+        :param builder: ShadingNetworkBuilder
+        :param in_tex: input texture
+        :param out_tex: output texture
+        :return:
+        """
+        field = self.__shader_fields["normal"]
+        if field.is_found() and field.is_enabled():
+            normal_file_name = field.get_file_name()
+            normal = builder.create_file_node("Normal", normal_file_name, in_tex)
+            normal_map = builder.create_node("aiNormalMap", "aiNormalMap", "asUtility")
+            builder.connect(normal, "outColor", normal_map, "input")
+            builder.connect(normal_map, "outValue", out_tex, "normalCamera")
+
+    def __generate_metalness(self, builder, in_tex, out_tex):
+        """
+        Generate the metalness
+        :param builder: ShadingNetworkBuilder
+        :param in_tex: input texture
+        :param out_tex: output texture
+        :return:
+        """
+        field = self.__shader_fields["metalness"]
+        if field.is_found() and field.is_enabled():
+            metalness_file_name = field.get_file_name()
+            metalness = builder.create_file_node("Metalness", metalness_file_name, in_tex)
+            builder.connect(metalness, "outColorR", out_tex, "metalness")
+
+    def __generate_displacement(self, builder, in_tex, displacement_scale, displacement_mid):
+        """
+        Generate the displacement
+        :param builder: ShadingNetworkBuilder
+        :param in_tex: input texture
+        :param displacement_scale
+        :param displacement_mid
+        :return: displacement node
+        """
+        displacement_node = None
+        field = self.__shader_fields["displacement"]
+        if field.is_found() and field.is_enabled():
+            height_file_name = field.get_file_name()
+            height = builder.create_file_node("Displacement", height_file_name, in_tex)
+            displacement_node = builder.create_node("displacementShader", "displacementShader", "asUtility")
+            builder.set_attr(displacement_node, "scale", displacement_scale)
+            builder.set_attr(displacement_node, "aiDisplacementZeroValue", displacement_mid)
+            builder.connect(height, "outColorR", displacement_node, "displacement")
+        return displacement_node
+
+    def __generate_sss_amount(self, builder, in_tex, out_tex):
+        """
+        Generate the sss
+        :param builder: ShadingNetworkBuilder
+        :param in_tex: input texture
+        :param out_tex: output texture
+        :return:
+        """
+        field = self.__shader_fields["sss"]
+        if field.is_found() and field.is_enabled():
+            sss_amount_file_name = field.get_file_name()
+            sss_amount = builder.create_file_node("SSS Amount", sss_amount_file_name, in_tex)
+            remap_value = builder.create_node("remapValue", "remapValue", "asUtility")
+            builder.connect(sss_amount, "outColorR", remap_value, "inputValue")
+            builder.connect(remap_value, "outValue", out_tex, "subsurface")
+
+    def __generate_emissive(self, builder, in_tex, out_tex):
+        """
+        Generate the emissive
+        :param builder: ShadingNetworkBuilder
+        :param in_tex: input texture
+        :param out_tex: output texture
+        :return:
+        """
+        field = self.__shader_fields["emissive"]
+        if field.is_found() and field.is_enabled():
+            emissive_file_name = field.get_file_name()
+            emissive = builder.create_file_node("Emissive", emissive_file_name, in_tex)
+            remap_color = builder.create_node("remapColor", "remapColor", "asUtility")
+            builder.connect(emissive, "outColor", remap_color, "color")
+            builder.connect(remap_color, "outColor", out_tex, "emissionColor")
+
+    def add_shading_nodes(self, builder, values):
+        """
+        Record all the shader graph in a builder
+        :param builder: ShadingNetworkBuilder
+        :param values: shader values
+        :return: handles of the arnold node and of the displacement node (None if no displacement)
+        """
+        place_texture = builder.create_place_texture()
+
+        arnold_node = builder.create_node("aiStandardSurface", self.__title, "asShader")
+
+        self.__generate_base_color(builder, place_texture, arnold_node)
+        self.__generate_roughness(builder, place_texture, arnold_node)
+        self.__generate_metalness(builder, place_texture, arnold_node)
+        self.__generate_normal(builder, place_texture, arnold_node)
+        displacement_node = self.__generate_displacement(builder, place_texture, values["displacement_scale"],
+                                                         values["displacement_mid"])
+        self.__generate_sss_amount(builder, place_texture, arnold_node)
+        self.__generate_emissive(builder, place_texture, arnold_node)
+
+        return arnold_node, displacement_node
@@ -0,0 +1,217 @@
+import os
+import re
+
+########################################################################################################################
+
+# Keywords that identify the field of a texture in its file name
+SHADER_FIELDS_KEYWORDS = {
+    "base_color": ["basecolor", "albedo", "diffuse"],
+    "normal": ["normal"],
+    "displacement": ["height", "displacement", "disp"],
+    "roughness": ["roughness"],
+    "metalness": ["metalness"],
+    "emissive": ["emissive"],
+    "sss": ["sssamount"]
+}
+
+# Keywords that prevent a texture to be detected as a field if they appear before the extension
+SHADER_FIELDS_EXCLUSIONS = {
+    "normal": ["combine"]
+}
+
+# Token replacing the tile number of the UDIM textures
+UDIM_TOKEN = "<UDIM>"
+
+# Tile number just before the extension
+UDIM_REGEX = re.compile(r"^(.*)([._])(1[0-9]{3})(\.[^.]+)$")
+
+
+########################################################################################################################
+
+
+class ShaderFieldClassifier:
+    """
+    Classify texture file names into shader fields in a single pass.
+    Give the same result as matching every SHADER_FIELDS_REGEX on every file name
+    """
+    def __init__(self, extensions, fields_keywords=None, fields_exclusions=None):
+        """
+        Constructor
+        :param extensions: texture extensions supported
+        :param fields_keywords: keywords of each field
+        :param fields_exclusions: exclusion keywords of each field
+        """
+        if fields_keywords is None:
+            fields_keywords = SHADER_FIELDS_KEYWORDS
+        if fields_exclusions is None:
+            fields_exclusions = SHADER_FIELDS_EXCLUSIONS
+        self.__fields = list(fields_keywords.keys())
+        self.__extension_regex = re.compile(
+            r"\.(?:" + "|".join(re.escape(ext.lower()) for ext in extensions) + ")")
+
+        # All the words to find with the field they belong to and whether they exclude the field
+        words = []
+        for field, keywords in fields_keywords.items():
+            for keyword in keywords:
+                words.append((keyword.lower(), field, False))
+        for field, keywords in fields_exclusions.items():
+            for keyword in keywords:
+                words.append((keyword.lower(), field, True))
+
+        # Only the longest token is captured at a position so register every word that is a prefix of it
+        tokens = sorted({word for word, _, _ in words}, key=len, reverse=True)
+        self.__token_words = {}
+        for token in tokens:
+            self.__token_words[token] = \
+                [(field, len(word), is_exclusion) for word, field, is_exclusion in words if token.startswith(word)]
+
+        # The lookahead finds overlapping tokens at every position in one scan
+        self.__token_regex = re.compile(
+            r"(?=(" + self.__extension_regex.pattern + "|" + "|".join(re.escape(t) for t in tokens) + "))")
+
+    def get_signature(self):
+        """
+        Getter of a signature of the classification rules (to validate cached classifications)
+        :return: signature
+        """
+        return self.__token_regex.pattern + "|" + repr(sorted(self.__token_words.items())) + "|" + UDIM_TOKEN
+
+    def is_texture(self, file_name):
+        """
+        Whether the file name has a supported texture extension
+        :param file_name
+        :return: boolean
+        """
+        return self.__extension_regex.search(file_name.lower()) is not None
+
+    def list_texture_files(self, folder_path):
+        """
+        Get the texture files of a folder sorted in reverse order
+        :param folder_path
+        :return: file names
+        """
+        files_name_list = []
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if self.is_texture(entry.name) and entry.is_file():
+                    files_name_list.append(entry.name)
+        files_name_list.sort(key=str)
+        files_name_list.reverse()
+        return files_name_list
+
+    @staticmethod
+    def collapse_udims(files_name_list):
+        """
+        Replace the tiles of each UDIM texture by a single file name with the UDIM token. Tiles separated by a dot
+        are always UDIM tiles, tiles separated by an underscore only if the 1001 tile exists (to not take a
+        resolution as a tile)
+        :param files_name_list: file names sorted in reverse order
+        :return: file names sorted in reverse order and dict of UDIM file name to its sorted tiles
+        """
+        tiles = {}
+        separators = {}
+        collapsed_names = {}
+        for file_name in files_name_list:
+            match = UDIM_REGEX.match(file_name)
+            if match is None:
+                continue
+            prefix, separator, tile, extension = match.groups()
+            tile = int(tile)
+            if tile < 1001:
+                continue
+            udim_file_name = prefix + separator + UDIM_TOKEN + extension
+            tiles.setdefault(udim_file_name, []).append(tile)
+            separators[udim_file_name] = separator
+            collapsed_names[file_name] = udim_file_name
+        for udim_file_name, separator in separators.items():
+            if separator == "_" and 1001 not in tiles[udim_file_name]:
+                del tiles[udim_file_name]
+            else:
+                tiles[udim_file_name].sort()
+
+        result = set()
+        for file_name in files_name_list:
+            udim_file_name = collapsed_names.get(file_name)
+            result.add(udim_file_name if udim_file_name in tiles else file_name)
+        result = sorted(result, key=str)
+        result.reverse()
+        return result, tiles
+
+    def classify_file(self, file_name):
+        """
+        Get the fields that a file name matches with the prefix found for each
+        :param file_name
+        :return: dict of field to prefix
+        """
+        name = file_name.lower()
+        extension_positions = []
+        keyword_positions = []
+        exclusion_positions = {}
+        for match in self.__token_regex.finditer(name):
+            token = match.group(1)
+            position = match.start()
+            if token[0] == ".":
+                extension_positions.append(position)
+                continue
+            for field, length, is_exclusion in self.__token_words[token]:
+                if is_exclusion:
+                    exclusion_positions.setdefault(field, []).append(position)
+                else:
+                    keyword_positions.append((position, field, length))
+
+        fields_found = {}
+        if len(extension_positions) == 0:
+            return fields_found
+        last_extension_position = extension_positions[-1]
+        # The prefix is greedy so the last valid keyword wins
+        for position, field, length in reversed(keyword_positions):
+            if field in fields_found:
+                continue
+            end = position + length
+            if field in exclusion_positions:
+                valid = ShaderFieldClassifier.__is_valid_with_exclusions(
+                    position, end, extension_positions, exclusion_positions[field])
+            else:
+                valid = end <= last_extension_position
+            if valid:
+                fields_found[field] = name[:position]
+        return fields_found
+
+    @staticmethod
+    def __is_valid_with_exclusions(start, end, extension_positions, exclusions):
+        """
+        Whether a keyword is valid when no exclusion can appear neither in the prefix
+        nor between the keyword and the extension
+        :param start: start of the keyword
+        :param end: end of the keyword
+        :param extension_positions
+        :param exclusions: positions of the exclusions
+        :return: boolean
+        """
+        limit = None
+        for exclusion in exclusions:
+            if exclusion < start:
+                return False
+            if exclusion >= end and (limit is None or exclusion < limit):
+                limit = exclusion
+        for extension_position in extension_positions:
+            if extension_position >= end and (limit is None or extension_position <= limit):
+                return True
+        return False
+
+    def classify(self, files_name_list):
+        """
+        Sort the files according to their prefix and their field
+        :param files_name_list
+        :return: dict of prefix to dict of field to file names
+        """
+        field_matches = {field: [] for field in self.__fields}
+        for file_name in files_name_list:
+            for field, prefix in self.classify_file(file_name).items():
+                field_matches[field].append((prefix, file_name))
+
+        field_file_match = {}
+        for field, matches in field_matches.items():
+            for prefix, file_name in matches:
+                field_file_match.setdefault(prefix, {}).setdefault(field, []).append(file_name)
+        return field_file_match
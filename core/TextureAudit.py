@@ -0,0 +1,153 @@
+import csv
+import glob
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .UpdatePlan import UpdatePlan, SKIP_UP_TO_DATE
+from .Profiler import PROFILER
+
+########################################################################################################################
+
+# Status of a texture of the scene
+STATUS_OUTDATED = "outdated"
+STATUS_MISSING = "missing"
+STATUS_UP_TO_DATE = "up_to_date"
+STATUS_UNRESOLVED = "unresolved"
+
+STATUSES = [STATUS_OUTDATED, STATUS_MISSING, STATUS_UP_TO_DATE, STATUS_UNRESOLVED]
+
+REPORT_COLUMNS = ["scene", "node", "node_type", "file_path", "status", "new_file_path", "reason"]
+
+# Existence checks are limited by the file server, not by the CPU
+DEFAULT_MAX_WORKERS = 16
+
+_UDIM_TOKEN_REGEX = re.compile(r"<udim>", re.IGNORECASE)
+
+
+########################################################################################################################
+
+
+class TextureAudit:
+    """
+    Status of all the textures of a scene against a folder of new versions : outdated, missing, up to date or
+    unresolved (not versioned, not in the folder, older version in the folder). The versions are resolved with one
+    texture index and the files are checked in parallel, each path once for all the scenes
+    """
+    def __init__(self, root):
+        """
+        Constructor
+        :param root: folder of the new versions
+        """
+        self.__root = root
+        self.__entries = []
+
+    @staticmethod
+    def file_exists(file_path):
+        """
+        Whether a texture exists, an UDIM texture exists if one of its tiles exists
+        :param file_path
+        :return: boolean
+        """
+        if _UDIM_TOKEN_REGEX.search(file_path) is None:
+            return os.path.isfile(file_path)
+        pattern = _UDIM_TOKEN_REGEX.sub("[0-9][0-9][0-9][0-9]", glob.escape(file_path))
+        return len(glob.glob(pattern)) > 0
+
+    @staticmethod
+    def check_files(file_paths, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Check the existence of files in parallel
+        :param file_paths
+        :param max_workers: number of files checked at the same time
+        :return: dict of file path to existence
+        """
+        file_paths = list(set(file_paths))
+        if len(file_paths) == 0:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+            return dict(zip(file_paths, executor.map(TextureAudit.file_exists, file_paths)))
+
+    @staticmethod
+    def build(texture_index, textures_by_scene, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Audit the textures of scenes
+        :param texture_index: TextureIndex of the folder of the new versions
+        :param textures_by_scene: dict of scene path to list of node, node type and current path
+        :param max_workers: number of files checked at the same time
+        :return: TextureAudit
+        """
+        audit = TextureAudit(texture_index.get_root())
+        textures = [(scene, node, node_type, file_path)
+                    for scene, scene_textures in textures_by_scene.items()
+                    for node, node_type, file_path in scene_textures]
+        with PROFILER.phase("audit"):
+            exists = TextureAudit.check_files([file_path for _, _, _, file_path in textures], max_workers)
+            resolved = {}
+            for scene, node, node_type, file_path in textures:
+                if file_path not in resolved:
+                    resolved[file_path] = UpdatePlan.resolve(texture_index, file_path)
+                new_file_path, reason = resolved[file_path]
+                if not exists[file_path]:
+                    status = STATUS_MISSING
+                elif new_file_path is not None:
+                    status = STATUS_OUTDATED
+                elif reason == SKIP_UP_TO_DATE:
+                    status = STATUS_UP_TO_DATE
+                else:
+                    status = STATUS_UNRESOLVED
+                audit.__entries.append({
+                    "scene": scene,
+                    "node": node,
+                    "node_type": node_type,
+                    "file_path": file_path,
+                    "status": status,
+                    "new_file_path": new_file_path,
+                    "reason": reason
+                })
+        PROFILER.count("textures_audited", len(textures))
+        return audit
+
+    def get_root(self):
+        """
+        Getter of the folder of the new versions
+        :return: root
+        """
+        return self.__root
+
+    def get_entries(self):
+        """
+        Getter of the entries
+        :return: list of dict with scene, node, node_type, file_path, status, new_file_path and reason
+        """
+        return self.__entries
+
+    def get_counts(self):
+        """
+        Get the number of textures of each status
+        :return: dict of status to count
+        """
+        counts = {status: 0 for status in STATUSES}
+        for entry in self.__entries:
+            counts[entry["status"]] += 1
+        return counts
+
+    def write_report(self, path):
+        """
+        Write the report in a CSV file (.csv) or else in a JSON file
+        :param path
+        :return:
+        """
+        if os.path.splitext(path)[1].lower() == ".csv":
+            with open(path, "w", newline="") as report_file:
+                writer = csv.DictWriter(report_file, fieldnames=REPORT_COLUMNS)
+                writer.writeheader()
+                writer.writerows(self.__entries)
+        else:
+            with open(path, "w") as report_file:
+                json.dump({
+                    "root": self.__root,
+                    "counts": self.get_counts(),
+                    "entries": self.__entries
+                }, report_file, indent=2)
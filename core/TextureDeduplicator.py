@@ -0,0 +1,134 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .HashCache import HashCache
+from .Profiler import PROFILER
+
+########################################################################################################################
+
+# Hashes are limited by the reads of the file server, not by the CPU
+DEFAULT_MAX_WORKERS = 8
+
+_HASH_ALGORITHM = "sha1"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+########################################################################################################################
+
+
+class TextureDeduplicator:
+    """
+    Find the textures with the same content in different files and make the shaders point at one of them, so the
+    copies of a texture share a file node and an entry of the texture cache of the renderer. Only the files of the
+    same size are hashed and the hashes are cached by size and modification time
+    """
+    def __init__(self, cache=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Constructor
+        :param cache: HashCache of the hashes (cache in ~/.shader_maker if None)
+        :param max_workers: number of files hashed concurrently
+        """
+        self.__cache = cache if cache is not None else HashCache(_HASH_ALGORITHM)
+        self.__max_workers = max_workers
+
+    def __get_hash(self, file_path, stat):
+        """
+        Get the hash of the content of a file from the cache or by reading it
+        :param file_path
+        :param stat
+        :return: hex digest or None if the file can't be read
+        """
+        digest = self.__cache.get(file_path, stat)
+        if digest is not None:
+            PROFILER.count("hash_cache_hits")
+            return digest
+        hash_object = hashlib.new(_HASH_ALGORITHM)
+        try:
+            with open(file_path, "rb") as file:
+                for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+                    hash_object.update(chunk)
+        except OSError:
+            return None
+        PROFILER.count("textures_hashed")
+        digest = hash_object.hexdigest()
+        self.__cache.set(file_path, stat, digest)
+        return digest
+
+    def get_contents(self, file_paths):
+        """
+        Get the content of files, identified by the size for the files of unique size or else by the hash
+        :param file_paths
+        :return: dict of file path to content key (None if the file doesn't exist)
+        """
+        stats = {}
+        paths_by_size = {}
+        for file_path in set(file_paths):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stats[file_path] = None
+                continue
+            stats[file_path] = stat
+            paths_by_size.setdefault(stat.st_size, []).append(file_path)
+
+        contents = {file_path: None for file_path, stat in stats.items() if stat is None}
+        to_hash = []
+        for size, paths in paths_by_size.items():
+            if len(paths) == 1:
+                contents[paths[0]] = "size:%d" % size
+            else:
+                to_hash.extend(paths)
+        if len(to_hash) > 0:
+            with ThreadPoolExecutor(max_workers=min(self.__max_workers, len(to_hash))) as executor:
+                digests = executor.map(lambda path: self.__get_hash(path, stats[path]), to_hash)
+                for file_path, digest in zip(to_hash, digests):
+                    contents[file_path] = "%d:%s" % (stats[file_path].st_size, digest) if digest is not None else None
+        self.__cache.save()
+        return contents
+
+    @staticmethod
+    def __get_field_files(field):
+        """
+        Get the files of a field (the tiles of an UDIM texture)
+        :param field
+        :return: list of tile (None if not an UDIM texture) and file path
+        """
+        file_name = field.get_file_name()
+        if len(field.get_tiles()) == 0:
+            return [(None, file_name)]
+        return [(tile, file_name.replace("<UDIM>", str(tile))) for tile in field.get_tiles()]
+
+    def deduplicate_shaders(self, shaders):
+        """
+        Find the textures of shaders with the same content to make them point at the same files, the shaders are not
+        modified. UDIM textures are shared only if all their tiles are identical
+        :param shaders
+        :return: dict of texture path of a field to the path of the identical texture shared
+        """
+        with PROFILER.phase("dedupe"):
+            fields_files = []
+            for shader in shaders:
+                for field in shader.get_fields():
+                    if field.is_found() and field.is_enabled():
+                        fields_files.append((field, TextureDeduplicator.__get_field_files(field)))
+            contents = self.get_contents([file_path for _, files in fields_files for _, file_path in files])
+
+            # The first path in alphabetical order is kept for each content
+            canonical_paths = {}
+            keys = []
+            for field, files in fields_files:
+                key = tuple((tile, contents[file_path]) for tile, file_path in files)
+                if any(content is None for _, content in key):
+                    key = None
+                elif key not in canonical_paths or field.get_file_name() < canonical_paths[key]:
+                    canonical_paths[key] = field.get_file_name()
+                keys.append(key)
+
+            shared_file_names = {}
+            for (field, _), key in zip(fields_files, keys):
+                if key is not None and canonical_paths[key] != field.get_file_name():
+                    shared_file_names[field.get_file_name()] = canonical_paths[key]
+            PROFILER.count("textures_deduplicated", len(shared_file_names))
+            return shared_file_names
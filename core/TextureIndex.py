@@ -0,0 +1,244 @@
+import os
+import re
+from bisect import bisect_left
+
+from .Profiler import PROFILER
+
+########################################################################################################################
+
+# Version token of a file name (_v012, .v3, -V02) followed by a separator or the end of the name
+FILE_VERSION_REGEX = re.compile(r"[._-][vV]([0-9]+)(?=[._-]|$)")
+
+# Versioned folder (v003)
+FOLDER_VERSION_REGEX = re.compile(r"^[vV]([0-9]+)$")
+
+# Recursivity depth of the index
+DEFAULT_DEPTH = 4
+
+
+########################################################################################################################
+
+
+class TextureIndex:
+    """
+    In-memory index of the texture files of a directory tree to find the versions of textures without walking the
+    tree again for each texture. The versions come from the version tokens of the file names (v012, _v3) or else
+    from the versioned folders (v003) and are sorted for each texture
+    """
+    def __init__(self, root, extensions, depth=DEFAULT_DEPTH):
+        """
+        Constructor
+        :param root: base directory of the new versions
+        :param extensions: texture extensions supported
+        :param depth: recursivity depth
+        """
+        self.__root = root
+        self.__depth = depth
+        extension_regex = "|".join(extensions)
+        self.__base_regex = re.compile(r"(.*)(?:<UDIM>|[0-9]{4})\.(?:" + extension_regex + ")")
+        self.__extension_regex = re.compile(r"\.(?:" + extension_regex + ")")
+        # Texture name without version to the first file found for each version
+        self.__files_by_version = {}
+        # Texture name without version to its sorted versions and their files
+        self.__versions = {}
+        self.__files = {}
+
+    def get_root(self):
+        """
+        Getter of the root
+        :return: root
+        """
+        return self.__root
+
+    def build(self, is_cancelled=None):
+        """
+        Walk the directory tree once and index all the files by the base names they can match
+        :param is_cancelled: function returning whether the walk has to stop
+        :return:
+        """
+        self.__files_by_version.clear()
+        self.__versions.clear()
+        self.__files.clear()
+        if os.path.isdir(self.__root):
+            with PROFILER.phase("us_index"):
+                # The root can be a versioned folder or be in one, as the paths of the scene
+                self.__walk(self.__root, self.__depth, TextureIndex.__get_folder_version(self.__root), is_cancelled)
+                self.__sort_versions()
+
+    def __walk(self, directory, depth, folder_version, is_cancelled):
+        """
+        Index the files of a directory before its subdirectories so the first file found for a version is the
+        least deep
+        :param directory
+        :param depth: recursivity depth
+        :param folder_version: version of the nearest versioned folder or None
+        :param is_cancelled: function returning whether the walk has to stop
+        :return:
+        """
+        if is_cancelled is not None and is_cancelled():
+            return
+        sub_directories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    PROFILER.count("files_listed")
+                    if entry.is_file():
+                        self.__index_file(directory, entry.name, folder_version)
+                    elif entry.is_dir():
+                        sub_directories.append(entry.name)
+        except OSError:
+            return
+        if depth > 1:
+            for name in sub_directories:
+                match = FOLDER_VERSION_REGEX.match(name)
+                sub_folder_version = int(match.group(1)) if match is not None else folder_version
+                self.__walk(directory + "/" + name, depth - 1, sub_folder_version, is_cancelled)
+
+    def __index_file(self, directory, file_name, folder_version):
+        """
+        Index a file under every base name followed by up to 4 digits and an extension
+        :param directory
+        :param file_name
+        :param folder_version: version of the nearest versioned folder or None
+        :return:
+        """
+        for match in self.__extension_regex.finditer(file_name):
+            extension_start = match.start()
+            file_path = directory + "/" + file_name[:match.end()]
+            version = TextureIndex.__get_file_name_version(file_name[:extension_start], folder_version)
+            nb_digits = 0
+            while nb_digits < 4 and extension_start - nb_digits > 0 and \
+                    file_name[extension_start - nb_digits - 1] in "0123456789":
+                nb_digits += 1
+            for i in range(nb_digits + 1):
+                files = self.__files_by_version.setdefault(
+                    TextureIndex.get_unversioned_name(file_name[:extension_start - i]), {})
+                # The least deep file is kept for a version
+                if version not in files:
+                    files[version] = file_path
+
+    def __sort_versions(self):
+        """
+        Sort the versions of each texture
+        :return:
+        """
+        for name, files in self.__files_by_version.items():
+            versions = sorted(files.keys())
+            self.__versions[name] = versions
+            self.__files[name] = [files[version] for version in versions]
+        self.__files_by_version.clear()
+
+    @staticmethod
+    def get_unversioned_name(name):
+        """
+        Get a name without its version tokens
+        :param name
+        :return: name
+        """
+        return FILE_VERSION_REGEX.sub("", name)
+
+    @staticmethod
+    def __get_file_name_version(name, folder_version):
+        """
+        Get the version of a file from the last version token of its name or else from its folder
+        :param name: file name without extension
+        :param folder_version: version of the nearest versioned folder or None
+        :return: version (0 if not versioned)
+        """
+        versions = FILE_VERSION_REGEX.findall(name)
+        if len(versions) > 0:
+            return int(versions[-1])
+        return folder_version if folder_version is not None else 0
+
+    @staticmethod
+    def __get_folder_version(directory):
+        """
+        Get the version of the nearest versioned folder of a directory (itself included)
+        :param directory
+        :return: version or None
+        """
+        for folder in reversed(directory.replace("\\", "/").split("/")):
+            match = FOLDER_VERSION_REGEX.match(folder)
+            if match is not None:
+                return int(match.group(1))
+        return None
+
+    @staticmethod
+    def get_version(file_path):
+        """
+        Get the version of a texture from its name or else from the nearest versioned folder of its path
+        :param file_path
+        :return: version (0 if not versioned)
+        """
+        file_name = os.path.basename(file_path)
+        folder_version = TextureIndex.__get_folder_version(os.path.dirname(file_path))
+        return TextureIndex.__get_file_name_version(os.path.splitext(file_name)[0], folder_version)
+
+    def get_base_name(self, file_name):
+        """
+        Get the base name of a texture file (without the UDIM and the extension)
+        :param file_name
+        :return: base name or None if the file name is not valid as a texture
+        """
+        match = self.__base_regex.search(file_name)
+        if match is None:
+            return None
+        return match.groups()[0]
+
+    def __get_indexed_name(self, file_path):
+        """
+        Get the name without version under which the versions of a texture are indexed
+        :param file_path: path of any version of the texture
+        :return: name or None if the texture is not in the index
+        """
+        base_name = self.get_base_name(os.path.basename(file_path))
+        if base_name is None:
+            return None
+        name = TextureIndex.get_unversioned_name(base_name)
+        return name if name in self.__versions else None
+
+    def get_versions(self, file_path):
+        """
+        Get the versions of a texture found in the index
+        :param file_path: path of any version of the texture
+        :return: sorted versions
+        """
+        name = self.__get_indexed_name(file_path)
+        return list(self.__versions[name]) if name is not None else []
+
+    def get_candidates(self, base_name):
+        """
+        Get the files of all the versions of a base name from the newest
+        :param base_name
+        :return: file paths
+        """
+        return list(reversed(self.__files.get(TextureIndex.get_unversioned_name(base_name), [])))
+
+    def find(self, file_path, version=None):
+        """
+        Get the last or a given version of a texture
+        :param file_path: path of any version of the texture
+        :param version: version wanted or None for the last one
+        :return: filepath or None
+        """
+        name = self.__get_indexed_name(file_path)
+        if name is None:
+            return None
+        if version is None:
+            return self.__files[name][-1]
+        versions = self.__versions[name]
+        index = bisect_left(versions, version)
+        if index < len(versions) and versions[index] == version:
+            return self.__files[name][index]
+        return None
+
+    def find_update(self, file_path):
+        """
+        Get the last version of a texture if it is not older than the current one
+        :param file_path: current path of the texture
+        :return: filepath or None
+        """
+        name = self.__get_indexed_name(file_path)
+        if name is None or self.__versions[name][-1] < TextureIndex.get_version(file_path):
+            return None
+        return self.__files[name][-1]
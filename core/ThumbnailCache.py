@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from .Profiler import PROFILER
+
+########################################################################################################################
+
+DEFAULT_THUMBNAIL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".shader_maker", "thumbnails")
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# Size of the longest side of the thumbnails
+THUMBNAIL_SIZE = 64
+
+_THUMBNAIL_EXTENSION = ".png"
+
+
+########################################################################################################################
+
+
+class ThumbnailCache:
+    """
+    On disk cache of the thumbnails of textures keyed by the path, the size and the modification time of the texture,
+    so a texture modified gets a new thumbnail. The least recently used thumbnails are evicted
+    """
+    def __init__(self, cache_dir=DEFAULT_THUMBNAIL_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, size=THUMBNAIL_SIZE):
+        """
+        Constructor
+        :param cache_dir: folder of the thumbnails
+        :param max_bytes: max size of the thumbnails kept
+        :param size: size of the longest side of the thumbnails
+        """
+        self.__cache_dir = cache_dir
+        self.__max_bytes = max_bytes
+        self.__size = size
+        # Thumbnail file name to its size from the least recently used, listed on first use
+        self.__entries = None
+        self.__total_bytes = 0
+        # Thumbnails are read and written by many threads
+        self.__lock = threading.Lock()
+
+    def get_size(self):
+        """
+        Getter of the size of the thumbnails
+        :return: size
+        """
+        return self.__size
+
+    def __load_entries(self):
+        """
+        List the thumbnails of the cache folder from the least recently used
+        :return:
+        """
+        self.__entries = OrderedDict()
+        self.__total_bytes = 0
+        entries = []
+        try:
+            with os.scandir(self.__cache_dir) as dir_entries:
+                for entry in dir_entries:
+                    if entry.name.endswith(_THUMBNAIL_EXTENSION) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError:
+            return
+        for _, name, size in sorted(entries):
+            self.__entries[name] = size
+            self.__total_bytes += size
+
+    def get_key(self, file_path):
+        """
+        Get the key of the thumbnail of a texture
+        :param file_path
+        :return: key or None if the texture doesn't exist
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = "%s|%d|%d|%d" % (os.path.normcase(os.path.normpath(file_path)).replace("\\", "/"),
+                               stat.st_size, stat.st_mtime_ns, self.__size)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Get a thumbnail
+        :param key
+        :return: PNG data or None if not cached
+        """
+        name = key + _THUMBNAIL_EXTENSION
+        path = os.path.join(self.__cache_dir, name)
+        with self.__lock:
+            if self.__entries is None:
+                self.__load_entries()
+            if name not in self.__entries:
+                return None
+            self.__entries.move_to_end(name)
+        try:
+            with open(path, "rb") as thumbnail_file:
+                data = thumbnail_file.read()
+            # The modification time keeps the order of use between sessions
+            os.utime(path)
+        except OSError:
+            with self.__lock:
+                self.__total_bytes -= self.__entries.pop(name, 0)
+            return None
+        PROFILER.count("thumbnails_cached")
+        return data
+
+    def set(self, key, data):
+        """
+        Store a thumbnail and evict the least recently used ones above the max size
+        :param key
+        :param data: PNG data
+        :return:
+        """
+        name = key + _THUMBNAIL_EXTENSION
+        path = os.path.join(self.__cache_dir, name)
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            tmp_path = "%s.%d.tmp" % (path, threading.get_ident())
+            with open(tmp_path, "wb") as thumbnail_file:
+                thumbnail_file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        evicted = []
+        with self.__lock:
+            if self.__entries is None:
+                self.__load_entries()
+            self.__total_bytes += len(data) - self.__entries.pop(name, 0)
+            self.__entries[name] = len(data)
+            while self.__total_bytes > self.__max_bytes and len(self.__entries) > 1:
+                evicted_name, evicted_size = self.__entries.popitem(last=False)
+                self.__total_bytes -= evicted_size
+                evicted.append(evicted_name)
+        for evicted_name in evicted:
+            try:
+                os.remove(os.path.join(self.__cache_dir, evicted_name))
+            except OSError:
+                pass
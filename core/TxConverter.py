@@ -0,0 +1,310 @@
+import hashlib
+import json
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .Profiler import PROFILER
+
+########################################################################################################################
+
+# Command of the converter, {input} and {output} are replaced by the paths of the texture and of the .tx (the
+# converter is run only for the textures whose .tx is not up to date)
+DEFAULT_TX_COMMAND = "maketx -v --oiio {input} -o {output}"
+
+# Environment variable of the command of the converter
+TX_COMMAND_ENV_VAR = "SHADER_MAKER_TX_COMMAND"
+
+TX_EXTENSION = ".tx"
+
+# Ways to decide that a .tx is up to date with its texture
+CHECK_SIZE = "size"
+CHECK_MTIME = "mtime"
+CHECK_HASH = "hash"
+CHECK_MODES = [CHECK_SIZE, CHECK_MTIME, CHECK_HASH]
+
+DEFAULT_TX_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".shader_maker", "tx_cache.json")
+
+DEFAULT_MAX_ENTRIES = 50000
+
+_CACHE_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_LOGGER = logging.getLogger(__name__)
+
+
+########################################################################################################################
+
+
+class TxConverter:
+    """
+    Convert textures to .tx with an external converter (maketx by default). The conversions run in parallel, each
+    one in its own converter process, and the textures whose .tx is up to date are skipped
+    """
+    def __init__(self, command=None, workers=None, check=CHECK_MTIME, cache_path=DEFAULT_TX_CACHE_PATH,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Constructor
+        :param command: command of the converter with {input} and {output} (environment variable or maketx if None)
+        :param workers: number of conversions at the same time (number of cpus if None)
+        :param check: size, mtime or hash, what has to be unchanged in a texture to keep its .tx
+        :param cache_path: file of the states of the textures converted
+        :param max_entries: max number of textures kept in the cache (least recently used are evicted)
+        """
+        if command is None:
+            command = os.environ.get(TX_COMMAND_ENV_VAR, DEFAULT_TX_COMMAND)
+        if check not in CHECK_MODES:
+            raise ValueError("Unknown check of the .tx : " + str(check))
+        self.__command = command
+        self.__workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.__check = check
+        self.__cache_path = cache_path
+        self.__max_entries = max_entries
+        # Texture path to the states of the texture and of its .tx when converted
+        self.__entries = OrderedDict()
+        self.__dirty = False
+        self.__lock = threading.Lock()
+        self.__load()
+
+    def get_command(self):
+        """
+        Getter of the command of the converter
+        :return: command
+        """
+        return self.__command
+
+    @staticmethod
+    def get_tx_path(file_path):
+        """
+        Get the path of the .tx of a texture
+        :param file_path
+        :return: path
+        """
+        return os.path.splitext(file_path)[0] + TX_EXTENSION
+
+    @staticmethod
+    def __key(path):
+        """
+        Get the key of a path
+        :param path
+        :return: key
+        """
+        return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
+
+    def __load(self):
+        """
+        Load the cache file, it is discarded if the command changed
+        :return:
+        """
+        if self.__cache_path is None or not os.path.isfile(self.__cache_path):
+            return
+        try:
+            with open(self.__cache_path, "r") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != _CACHE_VERSION or data.get("command") != self.__command:
+            return
+        for key, entry in data.get("entries", []):
+            self.__entries[key] = entry
+
+    def save(self):
+        """
+        Save the cache file if it changed
+        :return:
+        """
+        if self.__cache_path is None:
+            return
+        with self.__lock:
+            if not self.__dirty:
+                return
+            data = {
+                "version": _CACHE_VERSION,
+                "command": self.__command,
+                "entries": list(self.__entries.items())
+            }
+            self.__dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.__cache_path), exist_ok=True)
+            tmp_path = self.__cache_path + ".tmp"
+            with open(tmp_path, "w") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(tmp_path, self.__cache_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def __get_hash(file_path):
+        """
+        Get the hash of the content of a file
+        :param file_path
+        :return: hex digest
+        """
+        digest = hashlib.sha1()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def is_up_to_date(self, file_path):
+        """
+        Whether the .tx of a texture doesn't have to be converted again. The .tx must be unchanged since its
+        conversion and the texture unchanged according to the check. A .tx converted by another tool is kept if it
+        is newer than the texture
+        :param file_path
+        :return: boolean
+        """
+        tx_path = TxConverter.get_tx_path(file_path)
+        try:
+            stat = os.stat(file_path)
+            tx_stat = os.stat(tx_path)
+        except OSError:
+            return False
+        key = TxConverter.__key(file_path)
+        with self.__lock:
+            entry = self.__entries.get(key)
+        if entry is None:
+            return tx_stat.st_mtime >= stat.st_mtime
+        if entry["tx_size"] != tx_stat.st_size or entry["tx_mtime"] != tx_stat.st_mtime:
+            return False
+        if entry["size"] != stat.st_size:
+            return False
+        if self.__check == CHECK_SIZE or entry["mtime"] == stat.st_mtime:
+            return True
+        if self.__check == CHECK_MTIME:
+            return False
+        # The content is compared only when the texture has been touched
+        PROFILER.count("tx_hashed")
+        if entry.get("hash") != TxConverter.__get_hash(file_path):
+            return False
+        with self.__lock:
+            entry["mtime"] = stat.st_mtime
+            self.__dirty = True
+        return True
+
+    def __store(self, file_path):
+        """
+        Store the states of a texture and of its .tx after its conversion
+        :param file_path
+        :return:
+        """
+        stat = os.stat(file_path)
+        tx_stat = os.stat(TxConverter.get_tx_path(file_path))
+        entry = {"size": stat.st_size, "mtime": stat.st_mtime, "tx_size": tx_stat.st_size, "tx_mtime": tx_stat.st_mtime}
+        if self.__check == CHECK_HASH:
+            entry["hash"] = TxConverter.__get_hash(file_path)
+        key = TxConverter.__key(file_path)
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+            self.__dirty = True
+
+    def __get_arguments(self, input_path, output_path):
+        """
+        Get the arguments of the converter process
+        :param input_path
+        :param output_path
+        :return: arguments
+        """
+        return [argument.format(input=input_path, output=output_path)
+                for argument in shlex.split(self.__command, posix=os.name != "nt")]
+
+    def __convert_file(self, file_path):
+        """
+        Convert a texture in a temporary file replacing its .tx once complete. The temporary file is in a unique
+        folder so the same texture can be converted by several processes at the same time
+        :param file_path
+        :return: path of the .tx or None if the conversion failed
+        """
+        tx_path = TxConverter.get_tx_path(file_path)
+        tmp_directory = None
+        try:
+            # In the folder of the texture so the .tx is replaced without a copy
+            tmp_directory = tempfile.mkdtemp(prefix=".converting_", dir=os.path.dirname(file_path) or None)
+            tmp_path = os.path.join(tmp_directory, os.path.basename(tx_path))
+            result = subprocess.run(self.__get_arguments(file_path, tmp_path),
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            if result.returncode != 0 or not os.path.isfile(tmp_path):
+                _LOGGER.warning("Conversion to .tx failed : %s\n%s", file_path, result.stderr.decode(errors="replace"))
+                return None
+            os.replace(tmp_path, tx_path)
+            self.__store(file_path)
+        except OSError as e:
+            _LOGGER.warning("Conversion to .tx failed : %s\n%s", file_path, e)
+            return None
+        finally:
+            if tmp_directory is not None:
+                shutil.rmtree(tmp_directory, ignore_errors=True)
+        PROFILER.count("tx_converted")
+        return tx_path
+
+    def convert(self, file_paths, is_cancelled=None):
+        """
+        Convert the textures whose .tx is not up to date
+        :param file_paths
+        :param is_cancelled: function returning whether the conversions not started have to be skipped
+        :return: dict of texture path to path of its .tx (None if the conversion failed)
+        """
+        tx_paths = {}
+        to_convert = []
+        with PROFILER.phase("tx_conversion"):
+            for file_path in file_paths:
+                if file_path in tx_paths or file_path in to_convert:
+                    continue
+                if os.path.splitext(file_path)[1].lower() == TX_EXTENSION:
+                    tx_paths[file_path] = file_path
+                elif self.is_up_to_date(file_path):
+                    PROFILER.count("tx_skipped")
+                    tx_paths[file_path] = TxConverter.get_tx_path(file_path)
+                else:
+                    to_convert.append(file_path)
+
+            def convert_file(path):
+                if is_cancelled is not None and is_cancelled():
+                    return None
+                return self.__convert_file(path)
+
+            if len(to_convert) > 0:
+                with ThreadPoolExecutor(max_workers=min(self.__workers, len(to_convert))) as executor:
+                    for file_path, tx_path in zip(to_convert, executor.map(convert_file, to_convert)):
+                        tx_paths[file_path] = tx_path
+        self.save()
+        return tx_paths
+
+    def convert_shaders(self, shaders, file_names=None, is_cancelled=None):
+        """
+        Convert the textures of shaders, the shaders are not modified. A field keeps its texture if one of its files
+        can't be converted
+        :param shaders
+        :param file_names: dict of texture path of a field to the path to convert instead (shared texture)
+        :param is_cancelled: function returning whether the conversions not started have to be skipped
+        :return: dict of texture path of a field to the path of its .tx
+        """
+        file_names = file_names if file_names is not None else {}
+        fields_files = {}
+        for shader in shaders:
+            for field in shader.get_fields():
+                if not field.is_found() or not field.is_enabled() or field.get_file_name() in fields_files:
+                    continue
+                file_name = file_names.get(field.get_file_name(), field.get_file_name())
+                if len(field.get_tiles()) > 0:
+                    files = [file_name.replace("<UDIM>", str(tile)) for tile in field.get_tiles()]
+                else:
+                    files = [file_name]
+                fields_files[field.get_file_name()] = (file_name, files)
+
+        tx_paths = self.convert([file for _, files in fields_files.values() for file in files], is_cancelled)
+        tx_file_names = {}
+        for field_file_name, (file_name, files) in fields_files.items():
+            if all(tx_paths.get(file) is not None for file in files):
+                tx_file_names[field_file_name] = TxConverter.get_tx_path(file_name)
+        return tx_file_names
@@ -0,0 +1,115 @@
+import json
+import os
+
+########################################################################################################################
+
+# Reasons why a texture is not updated
+SKIP_INVALID_NAME = "invalid_name"
+SKIP_NOT_FOUND = "not_found"
+SKIP_OLDER_VERSION = "older_version"
+SKIP_UP_TO_DATE = "up_to_date"
+
+
+########################################################################################################################
+
+
+class UpdatePlan:
+    """
+    New path of each file node of the update part or the reason why it is not updated. It is computed once from the
+    texture index, displayed, exported as a dry run report and applied as is
+    """
+    def __init__(self, root):
+        """
+        Constructor
+        :param root: folder of the new versions
+        """
+        self.__root = root
+        self.__entries = []
+
+    @staticmethod
+    def resolve(texture_index, file_path):
+        """
+        Get the new version of a texture or the reason why there is none
+        :param texture_index: TextureIndex
+        :param file_path: current path of the texture
+        :return: new file path (or None) and skip reason (or None)
+        """
+        if texture_index.get_base_name(os.path.basename(file_path)) is None:
+            return None, SKIP_INVALID_NAME
+        if texture_index.find(file_path) is None:
+            return None, SKIP_NOT_FOUND
+        new_file_path = texture_index.find_update(file_path)
+        if new_file_path is None:
+            return None, SKIP_OLDER_VERSION
+        if new_file_path == file_path:
+            return None, SKIP_UP_TO_DATE
+        return new_file_path, None
+
+    @staticmethod
+    def build(texture_index, textures):
+        """
+        Compute the plan of textures
+        :param texture_index: TextureIndex
+        :param textures: list of file node and current path
+        :return: UpdatePlan
+        """
+        plan = UpdatePlan(texture_index.get_root())
+        new_file_paths = {}
+        for node, file_path in textures:
+            if file_path not in new_file_paths:
+                new_file_paths[file_path] = UpdatePlan.resolve(texture_index, file_path)
+            new_file_path, reason = new_file_paths[file_path]
+            plan.__entries.append({
+                "node": node,
+                "file_path": file_path,
+                "new_file_path": new_file_path,
+                "reason": reason
+            })
+        return plan
+
+    def get_root(self):
+        """
+        Getter of the folder of the new versions
+        :return: root
+        """
+        return self.__root
+
+    def get_entries(self):
+        """
+        Getter of the entries
+        :return: list of dict with node, file_path, new_file_path and reason
+        """
+        return self.__entries
+
+    def get_updates(self):
+        """
+        Get the file nodes to update
+        :return: list of node, current path and new path
+        """
+        return [(entry["node"], entry["file_path"], entry["new_file_path"])
+                for entry in self.__entries if entry["reason"] is None]
+
+    def get_report(self):
+        """
+        Get the dry run report of the plan
+        :return: dict
+        """
+        skipped = {}
+        for entry in self.__entries:
+            if entry["reason"] is not None:
+                skipped[entry["reason"]] = skipped.get(entry["reason"], 0) + 1
+        return {
+            "root": self.__root,
+            "nb_updates": len(self.get_updates()),
+            "nb_skipped": skipped,
+            "entries": self.__entries
+        }
+
+    def write_report(self, path):
+        """
+        Write the dry run report in a JSON file
+        :param path
+        :return:
+        """
+        with open(path, "w") as report_file:
+            json.dump(self.get_report(), report_file, indent=2)
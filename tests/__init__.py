@@ -0,0 +1,4 @@
+"""
+Tests of the core without Maya. Run from the folder containing the shader_maker package :
+    python -m pytest shader_maker/tests
+"""
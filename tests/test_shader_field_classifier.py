@@ -0,0 +1,97 @@
+import re
+import unittest
+
+from shader_maker.core.Shader import SHADER_FIELDS_REGEX, FILE_EXTENSION_SUPPORTED
+from shader_maker.core.ShaderFieldClassifier import ShaderFieldClassifier, UDIM_TOKEN
+
+# File names of the tricky cases of the legacy regexes
+FILE_NAMES = [
+    "wood_BaseColor.1001.exr",
+    "wood_Albedo.png",
+    "wood_diffuse_v002.tif",
+    "wood_Normal.1001.exr",
+    "wood_Normal_combine.png",
+    "combine_wood_Normal.png",
+    "wood_NormalCombined.exr",
+    "wood_Height.exr",
+    "wood_Displacement.1001.tx",
+    "wood_disp.jpeg",
+    "wood_Roughness.jpg",
+    "wood_Metalness.exr",
+    "wood_Emissive.exr",
+    "wood_SSSAmount.exr",
+    "rock_basecolor_roughness.exr",
+    "rock_BaseColor.exr.bak",
+    "rock_BaseColor.png.exr",
+    "rock_normal.txt",
+    "metal_Displacement_Height.tif",
+    "readme.txt",
+    "BASECOLOR.PNG",
+]
+
+
+########################################################################################################################
+
+
+def _classify_legacy(files_name_list):
+    """
+    Sort the files according to their prefix and their field by matching every regex on every file name
+    :param files_name_list
+    :return: dict of prefix to dict of field to file names
+    """
+    field_file_match = {}
+    for field, regex in SHADER_FIELDS_REGEX.items():
+        for file_name in files_name_list:
+            match = re.match(regex, file_name.lower(), re.IGNORECASE)
+            if match:
+                field_file_match.setdefault(match.groups()[0], {}).setdefault(field, []).append(file_name)
+    return field_file_match
+
+
+class ShaderFieldClassifierTest(unittest.TestCase):
+    """
+    Classification of the file names and collapse of the UDIM tiles
+    """
+    def setUp(self):
+        self.__classifier = ShaderFieldClassifier(FILE_EXTENSION_SUPPORTED)
+
+    def test_classify_file_as_legacy_regexes(self):
+        for file_name in FILE_NAMES:
+            expected = {}
+            for field, regex in SHADER_FIELDS_REGEX.items():
+                match = re.match(regex, file_name.lower(), re.IGNORECASE)
+                if match:
+                    expected[field] = match.groups()[0]
+            self.assertEqual(self.__classifier.classify_file(file_name), expected, file_name)
+
+    def test_classify_as_legacy_regexes(self):
+        files_name_list = sorted(FILE_NAMES, key=str, reverse=True)
+        self.assertEqual(self.__classifier.classify(files_name_list), _classify_legacy(files_name_list))
+
+    def test_is_texture(self):
+        self.assertTrue(self.__classifier.is_texture("wood_BaseColor.1001.EXR"))
+        self.assertFalse(self.__classifier.is_texture("readme.md"))
+
+    def test_collapse_udims_dot(self):
+        files_name_list = ["wood_Roughness.1002.exr", "wood_Roughness.1001.exr", "wood_BaseColor.1012.exr",
+                           "wood_BaseColor.1003.exr", "wood_Albedo.png"]
+        result, tiles = ShaderFieldClassifier.collapse_udims(files_name_list)
+        self.assertEqual(result, ["wood_Roughness." + UDIM_TOKEN + ".exr", "wood_BaseColor." + UDIM_TOKEN + ".exr",
+                                  "wood_Albedo.png"])
+        self.assertEqual(tiles, {"wood_Roughness." + UDIM_TOKEN + ".exr": [1001, 1002],
+                                 "wood_BaseColor." + UDIM_TOKEN + ".exr": [1003, 1012]})
+
+    def test_collapse_udims_underscore(self):
+        # A resolution is not a tile, tiles separated by an underscore need the 1001 tile
+        files_name_list = ["wood_Roughness_1002.exr", "wood_Roughness_1001.exr", "wood_BaseColor_2048.exr"]
+        result, tiles = ShaderFieldClassifier.collapse_udims(files_name_list)
+        self.assertEqual(result, ["wood_Roughness_" + UDIM_TOKEN + ".exr", "wood_BaseColor_2048.exr"])
+        self.assertEqual(tiles, {"wood_Roughness_" + UDIM_TOKEN + ".exr": [1001, 1002]})
+
+    def test_collapse_udims_without_tiles(self):
+        files_name_list = ["wood_Roughness.exr", "wood_Normal.0999.exr"]
+        self.assertEqual(ShaderFieldClassifier.collapse_udims(files_name_list), (files_name_list, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from shader_maker.core.Shader import FILE_EXTENSION_SUPPORTED
+from shader_maker.core.TextureAudit import TextureAudit, STATUS_OUTDATED, STATUS_MISSING, STATUS_UP_TO_DATE, \
+    STATUS_UNRESOLVED
+from shader_maker.core.TextureIndex import TextureIndex
+
+
+class TextureAuditTest(unittest.TestCase):
+    """
+    Status of the textures of several scenes and reports
+    """
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp().replace("\\", "/")
+        for file_name in ["lib/wood_BaseColor_v002.1001.exr", "lib/rock_BaseColor_v001.1001.exr",
+                          "scene/wood_BaseColor_v001.1001.exr", "scene/sky.exr"]:
+            file_path = os.path.join(self.__directory, file_name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            open(file_path, "w").close()
+        self.__texture_index = TextureIndex(self.__directory + "/lib", FILE_EXTENSION_SUPPORTED)
+        self.__texture_index.build()
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def __build(self):
+        """
+        Audit two scenes with a node of the same name
+        :return: TextureAudit
+        """
+        scene = self.__directory + "/scene/"
+        return TextureAudit.build(self.__texture_index, {
+            "/shots/a.ma": [("file1", "file", scene + "wood_BaseColor_v001.1001.exr"),
+                            ("file2", "file", scene + "sky.exr")],
+            "/shots/b.ma": [("file1", "file", self.__directory + "/lib/rock_BaseColor_v001.1001.exr"),
+                            ("image1", "aiImage", scene + "wood_BaseColor_v001.<UDIM>.exr"),
+                            ("file2", "file", scene + "missing_BaseColor_v001.1001.exr")]
+        }, max_workers=2)
+
+    def test_statuses(self):
+        audit = self.__build()
+        statuses = [(entry["scene"], entry["node"], entry["status"]) for entry in audit.get_entries()]
+        self.assertEqual(statuses, [("/shots/a.ma", "file1", STATUS_OUTDATED),
+                                    ("/shots/a.ma", "file2", STATUS_UNRESOLVED),
+                                    ("/shots/b.ma", "file1", STATUS_UP_TO_DATE),
+                                    ("/shots/b.ma", "image1", STATUS_OUTDATED),
+                                    ("/shots/b.ma", "file2", STATUS_MISSING)])
+        self.assertEqual(audit.get_entries()[0]["new_file_path"],
+                         self.__directory + "/lib/wood_BaseColor_v002.1001.exr")
+        self.assertEqual(audit.get_counts(), {STATUS_OUTDATED: 2, STATUS_MISSING: 1, STATUS_UP_TO_DATE: 1,
+                                              STATUS_UNRESOLVED: 1})
+
+    def test_reports(self):
+        audit = self.__build()
+        csv_path = self.__directory + "/report.csv"
+        audit.write_report(csv_path)
+        with open(csv_path, newline="") as report_file:
+            rows = list(csv.DictReader(report_file))
+        self.assertEqual([(row["scene"], row["node"]) for row in rows],
+                         [(entry["scene"], entry["node"]) for entry in audit.get_entries()])
+        json_path = self.__directory + "/report.json"
+        audit.write_report(json_path)
+        with open(json_path) as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report["entries"], audit.get_entries())
+        self.assertEqual(report["root"], self.__directory + "/lib")
+
+
+if __name__ == "__main__":
+    unittest.main()
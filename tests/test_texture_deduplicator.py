@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from shader_maker.core.HashCache import HashCache
+from shader_maker.core.TextureDeduplicator import TextureDeduplicator
+
+
+class TextureDeduplicatorTest(unittest.TestCase):
+    """
+    Contents of the textures and cache of their hashes
+    """
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp()
+        self.__cache_path = os.path.join(self.__directory, "hash_cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def __create_texture(self, file_name, content):
+        """
+        Create a texture in the temporary directory
+        :param file_name
+        :param content
+        :return: file path
+        """
+        file_path = os.path.join(self.__directory, file_name)
+        with open(file_path, "wb") as file:
+            file.write(content)
+        return file_path
+
+    def test_get_contents(self):
+        first = self.__create_texture("a_BaseColor.exr", b"same")
+        copy = self.__create_texture("b_BaseColor.exr", b"same")
+        other = self.__create_texture("c_BaseColor.exr", b"diff")
+        unique = self.__create_texture("d_BaseColor.exr", b"unique size")
+        missing = os.path.join(self.__directory, "e_BaseColor.exr")
+        contents = TextureDeduplicator(HashCache("sha1", self.__cache_path)).get_contents(
+            [first, copy, other, unique, missing])
+        self.assertEqual(contents[first], contents[copy])
+        self.assertNotEqual(contents[first], contents[other])
+        self.assertIsNotNone(contents[unique])
+        self.assertIsNone(contents[missing])
+
+    def test_hash_cache(self):
+        file_path = self.__create_texture("a_BaseColor.exr", b"same")
+        self.__create_texture("b_BaseColor.exr", b"same")
+        TextureDeduplicator(HashCache("sha1", self.__cache_path)).get_contents(
+            [file_path, os.path.join(self.__directory, "b_BaseColor.exr")])
+        cache = HashCache("sha1", self.__cache_path)
+        digest = cache.get(file_path, os.stat(file_path))
+        self.assertIsNotNone(digest)
+        # The hash is not valid anymore once the file changed
+        self.__create_texture("a_BaseColor.exr", b"changed")
+        self.assertIsNone(cache.get(file_path, os.stat(file_path)))
+        # Nor with another algorithm
+        self.assertIsNone(HashCache("md5", self.__cache_path).get(file_path, os.stat(file_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
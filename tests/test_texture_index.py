@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from shader_maker.core.Shader import FILE_EXTENSION_SUPPORTED
+from shader_maker.core.TextureIndex import TextureIndex
+
+
+class TextureIndexTest(unittest.TestCase):
+    """
+    Versions found by the texture index
+    """
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def __create_file(self, *path):
+        """
+        Create an empty file in the temporary directory
+        :param path: components of the path
+        :return: file path
+        """
+        file_path = os.path.join(self.__directory, *path).replace("\\", "/")
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        open(file_path, "w").close()
+        return file_path
+
+    def __build(self, *root):
+        """
+        Build the index of a folder of the temporary directory
+        :param root: components of the folder
+        :return: TextureIndex
+        """
+        texture_index = TextureIndex(os.path.join(self.__directory, *root).replace("\\", "/"),
+                                     FILE_EXTENSION_SUPPORTED)
+        texture_index.build()
+        return texture_index
+
+    def test_find_versioned_files(self):
+        self.__create_file("lib", "tex_BaseColor_v001.1001.exr")
+        last = self.__create_file("lib", "tex_BaseColor_v003.1001.exr")
+        self.__create_file("lib", "tex_Roughness_v002.1001.exr")
+        texture_index = self.__build("lib")
+        scene_path = "/scene/tex_BaseColor_v002.1001.exr"
+        self.assertEqual(texture_index.find(scene_path), last)
+        self.assertEqual(texture_index.get_versions(scene_path), [1, 3])
+        self.assertEqual(texture_index.find_update(scene_path), last)
+        self.assertIsNone(texture_index.find_update("/scene/tex_BaseColor_v004.1001.exr"))
+
+    def test_find_versioned_folders(self):
+        self.__create_file("lib", "v001", "tex_BaseColor.1001.exr")
+        last = self.__create_file("lib", "v002", "tex_BaseColor.1001.exr")
+        texture_index = self.__build("lib")
+        self.assertEqual(texture_index.find("/scene/tex_BaseColor.1001.exr"), last)
+        self.assertEqual(texture_index.find("/scene/tex_BaseColor.1001.exr", 1),
+                         os.path.join(self.__directory, "lib", "v001", "tex_BaseColor.1001.exr").replace("\\", "/"))
+        self.assertEqual(texture_index.find_update("/scene/v001/tex_BaseColor.1001.exr"), last)
+        self.assertIsNone(texture_index.find_update("/scene/v003/tex_BaseColor.1001.exr"))
+
+    def test_find_update_versioned_root(self):
+        last = self.__create_file("lib", "v005", "tex_BaseColor.1001.exr")
+        texture_index = self.__build("lib", "v005")
+        self.assertEqual(texture_index.get_versions("/scene/tex_BaseColor.1001.exr"), [5])
+        self.assertEqual(texture_index.find("/scene/v004/tex_BaseColor.1001.exr"), last)
+        self.assertEqual(texture_index.find_update("/scene/v004/tex_BaseColor.1001.exr"), last)
+        self.assertIsNone(texture_index.find_update("/scene/v006/tex_BaseColor.1001.exr"))
+
+    def test_find_unknown_texture(self):
+        self.__create_file("lib", "tex_BaseColor_v001.1001.exr")
+        texture_index = self.__build("lib")
+        self.assertIsNone(texture_index.find("/scene/tex_Normal_v001.1001.exr"))
+        self.assertIsNone(texture_index.find_update("/scene/tex_Normal_v001.1001.exr"))
+        self.assertEqual(texture_index.get_versions("/scene/tex_Normal_v001.1001.exr"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
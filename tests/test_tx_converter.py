@@ -0,0 +1,103 @@
+import os
+import shlex
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from shader_maker.benchmarks import tx_stand_in
+from shader_maker.core.TxConverter import TxConverter
+
+# Stand-in of maketx copying the texture, run as a script so it doesn't depend on the current directory
+TX_STAND_IN_COMMAND = shlex.quote(sys.executable) + " " + shlex.quote(tx_stand_in.__file__) + " {input} -o {output}"
+
+# Converter failing on every texture
+FAILING_COMMAND = shlex.quote(sys.executable) + " -c \"import sys; sys.exit(1)\" {input} {output}"
+
+
+########################################################################################################################
+
+
+class TxConverterTest(unittest.TestCase):
+    """
+    Conversion of the textures and skip of the .tx up to date
+    """
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp()
+        self.__cache_path = os.path.join(self.__directory, "tx_cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def __create_texture(self, file_name, content=b"texture"):
+        """
+        Create a texture in the temporary directory
+        :param file_name
+        :param content
+        :return: file path
+        """
+        file_path = os.path.join(self.__directory, file_name)
+        with open(file_path, "wb") as file:
+            file.write(content)
+        return file_path
+
+    def test_convert(self):
+        file_path = self.__create_texture("wood_BaseColor.1001.exr")
+        tx_path = TxConverter.get_tx_path(file_path)
+        converter = TxConverter(TX_STAND_IN_COMMAND, workers=2, cache_path=self.__cache_path)
+        self.assertEqual(converter.convert([file_path, file_path]), {file_path: tx_path})
+        with open(tx_path, "rb") as tx_file:
+            self.assertEqual(tx_file.read(), b"texture")
+        self.assertTrue(os.path.isfile(self.__cache_path))
+        self.assertEqual(sorted(os.listdir(self.__directory)),
+                         sorted([os.path.basename(file_path), os.path.basename(tx_path), "tx_cache.json"]))
+
+    def test_skip_up_to_date(self):
+        file_path = self.__create_texture("wood_BaseColor.1001.exr")
+        tx_path = TxConverter.get_tx_path(file_path)
+        TxConverter(TX_STAND_IN_COMMAND, cache_path=self.__cache_path).convert([file_path])
+        tx_mtime = os.stat(tx_path).st_mtime_ns
+        # The .tx is up to date so the converter is not run
+        converter = TxConverter(TX_STAND_IN_COMMAND, cache_path=self.__cache_path)
+        self.assertTrue(converter.is_up_to_date(file_path))
+        self.assertEqual(converter.convert([file_path]), {file_path: tx_path})
+        self.assertEqual(os.stat(tx_path).st_mtime_ns, tx_mtime)
+
+    def test_convert_modified_texture(self):
+        file_path = self.__create_texture("wood_BaseColor.1001.exr")
+        converter = TxConverter(TX_STAND_IN_COMMAND, cache_path=self.__cache_path)
+        converter.convert([file_path])
+        self.__create_texture("wood_BaseColor.1001.exr", b"modified texture")
+        self.assertFalse(converter.is_up_to_date(file_path))
+        tx_path = converter.convert([file_path])[file_path]
+        with open(tx_path, "rb") as tx_file:
+            self.assertEqual(tx_file.read(), b"modified texture")
+
+    def test_concurrent_conversions(self):
+        file_path = self.__create_texture("wood_BaseColor.1001.exr")
+        tx_path = TxConverter.get_tx_path(file_path)
+        # Converters of different processes each use their own temporary file
+        converters = [TxConverter(TX_STAND_IN_COMMAND, cache_path=os.path.join(self.__directory, "%d.json" % i))
+                      for i in range(4)]
+        with ThreadPoolExecutor(max_workers=len(converters)) as executor:
+            results = list(executor.map(lambda converter: converter.convert([file_path]), converters))
+        self.assertEqual(results, [{file_path: tx_path}] * len(converters))
+        self.assertEqual(sorted(name for name in os.listdir(self.__directory) if not name.endswith(".json")),
+                         sorted([os.path.basename(file_path), os.path.basename(tx_path)]))
+
+    def test_keep_tx(self):
+        tx_path = self.__create_texture("wood_BaseColor.1001.tx")
+        converter = TxConverter(FAILING_COMMAND, cache_path=self.__cache_path)
+        self.assertEqual(converter.convert([tx_path]), {tx_path: tx_path})
+
+    def test_failed_conversion(self):
+        file_path = self.__create_texture("wood_BaseColor.1001.exr")
+        converter = TxConverter(FAILING_COMMAND, cache_path=self.__cache_path)
+        self.assertEqual(converter.convert([file_path]), {file_path: None})
+        # Neither a .tx nor a temporary file is left
+        self.assertEqual(os.listdir(self.__directory), [os.path.basename(file_path)])
+
+
+if __name__ == "__main__":
+    unittest.main()